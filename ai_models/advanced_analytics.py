@@ -3,10 +3,16 @@ import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.decomposition import PCA
 from sklearn.cluster import DBSCAN
-import networkx as nx
 from datetime import datetime, timedelta
 import joblib
 
+try:
+    from .org_graph import DEFAULT_PIVOTS, DEFAULT_TIME_BUDGET, OrgGraph
+    from .workforce_planner import plan_reallocations
+except ImportError:
+    from org_graph import DEFAULT_PIVOTS, DEFAULT_TIME_BUDGET, OrgGraph
+    from workforce_planner import plan_reallocations
+
 class AdvancedAnalytics:
     def __init__(self):
         self.models = {}
@@ -16,11 +22,13 @@ class AdvancedAnalytics:
         # Skill-based optimization
         skill_matrix = self._create_skill_matrix(personnel_df)
         unit_requirements = self._calculate_unit_requirements()
+        reallocation_plan = self._suggest_reallocations(personnel_df)
         
         optimization_results = {
             'skill_gaps': self._identify_skill_gaps(skill_matrix, unit_requirements),
             'surplus_skills': self._identify_skill_surplus(skill_matrix, unit_requirements),
-            'reallocation_suggestions': self._suggest_reallocations(personnel_df),
+            'reallocation_suggestions': reallocation_plan.pop('moves'),
+            'reallocation_plan': reallocation_plan,
             'cross_training_opportunities': self._identify_cross_training(personnel_df)
         }
         
@@ -70,34 +78,24 @@ class AdvancedAnalytics:
             'risk_indicators': self._extract_risk_patterns(anomaly_personnel)
         }
     
-    def network_analysis(self, personnel_df):
+    def network_analysis(self, personnel_df, group_columns=('unit',), pivots=DEFAULT_PIVOTS,
+                         time_budget=DEFAULT_TIME_BUDGET):
         """Analyze organizational network and relationships"""
-        # Create network based on units and ranks
-        G = nx.Graph()
-        
-        # Add nodes (personnel)
-        for _, person in personnel_df.iterrows():
-            G.add_node(person['id'], 
-                      rank=person['rank'], 
-                      unit=person['unit'],
-                      leadership_score=person['leadership_score'])
+        # Personnel connect through unit hub nodes instead of pairwise edges, so the
+        # graph grows with the roster rather than with the square of each unit
+        G = OrgGraph.from_dataframe(personnel_df, group_columns)
         
-        # Add edges (relationships within units)
-        for unit in personnel_df['unit'].unique():
-            unit_personnel = personnel_df[personnel_df['unit'] == unit]['id'].tolist()
-            for i, person1 in enumerate(unit_personnel):
-                for person2 in unit_personnel[i+1:]:
-                    G.add_edge(person1, person2, weight=1)
-        
-        # Network metrics
-        centrality = nx.degree_centrality(G)
-        betweenness = nx.betweenness_centrality(G)
+        # Network metrics: degree is exact from unit sizes, betweenness is
+        # sampled from pivots within the time budget
+        centrality = G.degree_centrality()
+        betweenness, unit_betweenness, pivots_used = G.betweenness(pivots, time_budget)
         
         return {
-            'network_density': nx.density(G),
-            'key_connectors': sorted(centrality.items(), key=lambda x: x[1], reverse=True)[:10],
-            'bridge_personnel': sorted(betweenness.items(), key=lambda x: x[1], reverse=True)[:10],
-            'unit_connectivity': self._analyze_unit_connectivity(G, personnel_df)
+            'network_density': G.density(),
+            'key_connectors': G.top(centrality),
+            'bridge_personnel': G.top(betweenness),
+            'unit_connectivity': self._analyze_unit_connectivity(G, unit_betweenness),
+            'betweenness_pivots': pivots_used
         }
     
     def scenario_modeling(self, personnel_df, scenario_params):
@@ -116,19 +114,12 @@ class AdvancedAnalytics:
     
     def _create_skill_matrix(self, personnel_df):
         """Create skill matrix for analysis"""
-        all_skills = set()
-        for skills_str in personnel_df['skills_str'].dropna():
-            skills = [s.strip() for s in skills_str.split(',')]
-            all_skills.update(skills)
-        
-        skill_matrix = pd.DataFrame(0, index=personnel_df.index, columns=list(all_skills))
+        skills = personnel_df['skills_str'].reset_index(drop=True).dropna().str.split(',').explode().str.strip()
+        codes, all_skills = pd.factorize(skills)
         
-        for idx, row in personnel_df.iterrows():
-            if pd.notna(row['skills_str']):
-                skills = [s.strip() for s in row['skills_str'].split(',')]
-                for skill in skills:
-                    if skill in skill_matrix.columns:
-                        skill_matrix.loc[idx, skill] = 1
+        values = np.zeros((len(personnel_df), len(all_skills)), dtype=np.int64)
+        values[skills.index.to_numpy(), codes] = 1
+        skill_matrix = pd.DataFrame(values, index=personnel_df.index, columns=list(all_skills))
         
         return skill_matrix
     
@@ -172,45 +163,20 @@ class AdvancedAnalytics:
         return surplus
     
     def _suggest_reallocations(self, personnel_df):
-        """Suggest personnel reallocations"""
-        suggestions = []
-        
-        # Find overloaded units
-        unit_counts = personnel_df['unit'].value_counts()
-        avg_size = unit_counts.mean()
-        
-        overloaded = unit_counts[unit_counts > avg_size * 1.2]
-        underloaded = unit_counts[unit_counts < avg_size * 0.8]
-        
-        for over_unit in overloaded.index:
-            for under_unit in underloaded.index:
-                candidates = personnel_df[
-                    (personnel_df['unit'] == over_unit) &
-                    (personnel_df['readiness_score'] > 75)
-                ].head(2)
-                
-                for _, candidate in candidates.iterrows():
-                    suggestions.append({
-                        'personnel_id': candidate['id'],
-                        'name': candidate['name'],
-                        'from_unit': over_unit,
-                        'to_unit': under_unit,
-                        'reason': 'Load balancing'
-                    })
-        
-        return suggestions[:10]
+        """Plan personnel reallocations between overloaded and underloaded units"""
+        # One groupby for unit loads and transfer pools, then a min-cost flow
+        # over units and skill families for the whole plan
+        return plan_reallocations(personnel_df)
     
     def _identify_cross_training(self, personnel_df):
         """Identify cross-training opportunities"""
-        opportunities = []
-        
         # Find personnel with high learning potential
         candidates = personnel_df[
             (personnel_df['leadership_score'] >= 7) &
             (personnel_df['engagement_score'] >= 75) &
             (personnel_df['years_of_service'] >= 3) &
             (personnel_df['years_of_service'] <= 15)
-        ]
+        ].head(20)
         
         skill_recommendations = {
             'Flying': ['Cyber Security', 'Advanced Avionics', 'Leadership Development'],
@@ -220,19 +186,21 @@ class AdvancedAnalytics:
             'Education': ['Digital Learning', 'Curriculum Development', 'Assessment']
         }
         
-        for _, person in candidates.head(20).iterrows():
-            branch = person['branch']
-            recommended_skills = skill_recommendations.get(branch, ['Leadership Development'])
-            
-            opportunities.append({
-                'personnel_id': person['id'],
-                'name': person['name'],
-                'current_branch': branch,
-                'recommended_skills': recommended_skills[:2],
-                'priority': 'High' if person['leadership_potential'] == 'high' else 'Medium'
-            })
+        recommended = candidates['branch'].map(lambda branch: skill_recommendations.get(branch, ['Leadership Development'])[:2])
+        priority = np.where(candidates['leadership_potential'] == 'high', 'High', 'Medium')
         
-        return opportunities
+        return [
+            {
+                'personnel_id': personnel_id,
+                'name': name,
+                'current_branch': branch,
+                'recommended_skills': skills,
+                'priority': level
+            }
+            for personnel_id, name, branch, skills, level in zip(
+                candidates['id'], candidates['name'], candidates['branch'], recommended, priority.tolist()
+            )
+        ]
     
     def _model_retirement_scenario(self, personnel_df, retiring_ids):
         """Model retirement scenario impact"""
@@ -256,13 +224,12 @@ class AdvancedAnalytics:
     
     def _calculate_skill_loss(self, retiring_personnel):
         """Calculate skill loss from retirements"""
-        skill_loss = {}
-        for _, person in retiring_personnel.iterrows():
-            if pd.notna(person['skills_str']):
-                skills = [s.strip() for s in person['skills_str'].split(',')]
-                for skill in skills:
-                    skill_loss[skill] = skill_loss.get(skill, 0) + 1
-        return skill_loss
+        skills = retiring_personnel['skills_str'].dropna().str.split(',').explode().str.strip()
+        return skills.value_counts(sort=False).to_dict()
+    
+    def _analyze_unit_connectivity(self, G, unit_betweenness=None):
+        """Analyze how units are linked through shared personnel"""
+        return G.unit_connectivity(unit_betweenness)
 
 def main():
     """Test advanced analytics"""
@@ -1,27 +1,33 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.neural_network import MLPClassifier, MLPRegressor
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.preprocessing import LabelEncoder, StandardScaler, MinMaxScaler
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.metrics import accuracy_score, classification_report, mean_squared_error, r2_score
-from sklearn.feature_selection import SelectKBest, f_classif
-import xgboost as xgb
 import joblib
 import os
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .lazy_imports import lazy_import
+except ImportError:
+    from lazy_imports import lazy_import
+
+# sklearn estimators and XGBoost are imported when a model is first trained
+ensemble = lazy_import('sklearn.ensemble', 'ml')
+neural_network = lazy_import('sklearn.neural_network', 'ml')
+cluster = lazy_import('sklearn.cluster', 'ml')
+preprocessing = lazy_import('sklearn.preprocessing', 'ml')
+model_selection = lazy_import('sklearn.model_selection', 'ml')
+sk_metrics = lazy_import('sklearn.metrics', 'ml')
+xgb = lazy_import('xgboost', 'ml')
+
+
 class AdvancedIAFMLModels:
     def __init__(self):
         self.models = {}
         self.encoders = {}
         self.scalers = {}
         self.feature_selectors = {}
+        self.category_codes = {}  # column -> {label: code}, read from the fitted encoders
         
     def load_data(self):
         """Load personnel data"""
@@ -36,16 +42,17 @@ class AdvancedIAFMLModels:
     def advanced_feature_engineering(self):
         """Advanced feature engineering for better predictions"""
         # Handle missing values intelligently
-        self.df = self.df.fillna(method='ffill').fillna(0)
+        self.df = self.df.ffill().fillna(0)
         
         # Encode categorical features first
+        self.category_codes = {}
         categorical_cols = ['rank', 'branch', 'unit', 'gender', 'family_status', 
                            'education_level', 'deployment_status', 'security_clearance', 
                            'performance_rating', 'leadership_potential']
         
         for col in categorical_cols:
             if col in self.df.columns:
-                le = LabelEncoder()
+                le = preprocessing.LabelEncoder()
                 self.df[f'{col}_encoded'] = le.fit_transform(self.df[col].astype(str))
                 self.encoders[col] = le
         
@@ -67,7 +74,7 @@ class AdvancedIAFMLModels:
         # Add age and service category encodings
         for col in ['age_group', 'service_category']:
             if col in self.df.columns:
-                le = LabelEncoder()
+                le = preprocessing.LabelEncoder()
                 self.df[f'{col}_encoded'] = le.fit_transform(self.df[col].astype(str))
                 self.encoders[col] = le
         
@@ -86,7 +93,7 @@ class AdvancedIAFMLModels:
         self.feature_cols.extend(encoded_cols)
         
         # Scale features
-        self.scaler = StandardScaler()
+        self.scaler = preprocessing.StandardScaler()
         self.X_scaled = self.scaler.fit_transform(self.df[self.feature_cols])
         self.scalers['main'] = self.scaler
         
@@ -97,14 +104,14 @@ class AdvancedIAFMLModels:
         X = self.X_scaled
         y = self.df['attrition_risk']
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
         
         # Ensemble of models
         models = {
-            'rf': RandomForestClassifier(n_estimators=200, max_depth=10, random_state=42),
+            'rf': ensemble.RandomForestClassifier(n_estimators=200, max_depth=10, random_state=42),
             'xgb': xgb.XGBClassifier(n_estimators=200, max_depth=6, random_state=42),
-            'gb': GradientBoostingClassifier(n_estimators=100, random_state=42),
-            'mlp': MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
+            'gb': ensemble.GradientBoostingClassifier(n_estimators=100, random_state=42),
+            'mlp': neural_network.MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
         }
         
         best_model = None
@@ -138,13 +145,13 @@ class AdvancedIAFMLModels:
         X = self.X_scaled
         y = self.df['readiness_score']
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Advanced regression models
         models = {
-            'rf': RandomForestRegressor(n_estimators=200, max_depth=12, random_state=42),
+            'rf': ensemble.RandomForestRegressor(n_estimators=200, max_depth=12, random_state=42),
             'xgb': xgb.XGBRegressor(n_estimators=200, max_depth=6, random_state=42),
-            'mlp': MLPRegressor(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
+            'mlp': neural_network.MLPRegressor(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
         }
         
         best_model = None
@@ -153,8 +160,8 @@ class AdvancedIAFMLModels:
         for name, model in models.items():
             model.fit(X_train, y_train)
             y_pred = model.predict(X_test)
-            r2 = r2_score(y_test, y_pred)
-            mse = mean_squared_error(y_test, y_pred)
+            r2 = sk_metrics.r2_score(y_test, y_pred)
+            mse = sk_metrics.mean_squared_error(y_test, y_pred)
             print(f"{name.upper()} Readiness R²: {r2:.4f}, MSE: {mse:.4f}")
             
             if r2 > best_r2:
@@ -171,7 +178,7 @@ class AdvancedIAFMLModels:
         X = self.X_scaled
         y = self.df['leadership_potential']
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
         
         # Grid search for best parameters
         param_grid = {
@@ -180,8 +187,8 @@ class AdvancedIAFMLModels:
             'min_samples_split': [2, 5]
         }
         
-        rf = RandomForestClassifier(random_state=42)
-        grid_search = GridSearchCV(rf, param_grid, cv=5, scoring='accuracy')
+        rf = ensemble.RandomForestClassifier(random_state=42)
+        grid_search = model_selection.GridSearchCV(rf, param_grid, cv=5, scoring='accuracy')
         grid_search.fit(X_train, y_train)
         
         best_model = grid_search.best_estimator_
@@ -216,13 +223,13 @@ class AdvancedIAFMLModels:
         X = self.X_scaled
         y = self.df['promotion_potential']
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42)
         
         model = xgb.XGBRegressor(n_estimators=200, max_depth=8, random_state=42)
         model.fit(X_train, y_train)
         
         y_pred = model.predict(X_test)
-        r2 = r2_score(y_test, y_pred)
+        r2 = sk_metrics.r2_score(y_test, y_pred)
         print(f"Career Trajectory R²: {r2:.4f}")
         
         self.models['career_trajectory'] = model
@@ -244,13 +251,13 @@ class AdvancedIAFMLModels:
         X = self.X_scaled
         y = self.df['mission_suitability']
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42)
         
-        model = RandomForestRegressor(n_estimators=200, max_depth=10, random_state=42)
+        model = ensemble.RandomForestRegressor(n_estimators=200, max_depth=10, random_state=42)
         model.fit(X_train, y_train)
         
         y_pred = model.predict(X_test)
-        r2 = r2_score(y_test, y_pred)
+        r2 = sk_metrics.r2_score(y_test, y_pred)
         print(f"Mission Optimization R²: {r2:.4f}")
         
         self.models['mission_optimization'] = model
@@ -270,9 +277,9 @@ class AdvancedIAFMLModels:
         X = self.X_scaled
         y = wellness_risk
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
         
-        model = GradientBoostingClassifier(n_estimators=150, random_state=42)
+        model = ensemble.GradientBoostingClassifier(n_estimators=150, random_state=42)
         model.fit(X_train, y_train)
         
         accuracy = model.score(X_test, y_test)
@@ -300,7 +307,7 @@ class AdvancedIAFMLModels:
         skill_array = np.array(skill_features)
         
         # Use DBSCAN for better clustering
-        dbscan = DBSCAN(eps=0.5, min_samples=5)
+        dbscan = cluster.DBSCAN(eps=0.5, min_samples=5)
         clusters = dbscan.fit_predict(skill_array)
         
         self.df['skill_cluster'] = clusters
@@ -477,44 +484,54 @@ class AdvancedIAFMLModels:
         joblib.dump(self.scalers, 'scalers.pkl')
         
     def _prepare_features(self, personnel_data):
-        """Prepare features for prediction with advanced engineering"""
-        # Base features
-        features = [
-            personnel_data.get('age', 30),
-            personnel_data.get('years_of_service', 5),
-            personnel_data.get('fitness_score', 75),
-            personnel_data.get('stress_index', 40),
-            personnel_data.get('missions_participated', 20),
-            personnel_data.get('mission_success_rate', 0.9),
-            personnel_data.get('peer_review_score', 7),
-            personnel_data.get('leadership_score', 6),
-            personnel_data.get('engagement_score', 75),
-            personnel_data.get('leave_records', 30),
-            personnel_data.get('disciplinary_actions', 0),
-            personnel_data.get('complaints', 0),
-            personnel_data.get('salary_grade', 5)
-        ]
+        """One row laid out and scaled like X_scaled, for the trained models
+
+        Categories are coded by the fitted encoders and engineered features
+        computed as in advanced_feature_engineering. A missing or unseen
+        category takes its column's training mean, which scales to 0.
+        """
+        values = {
+            'age': personnel_data.get('age', 30),
+            'years_of_service': personnel_data.get('years_of_service', 5),
+            'fitness_score': personnel_data.get('fitness_score', 75),
+            'stress_index': personnel_data.get('stress_index', 40),
+            'missions_participated': personnel_data.get('missions_participated', 20),
+            'mission_success_rate': personnel_data.get('mission_success_rate', 0.9),
+            'peer_review_score': personnel_data.get('peer_review_score', 7),
+            'leadership_score': personnel_data.get('leadership_score', 6),
+            'engagement_score': personnel_data.get('engagement_score', 75),
+            'leave_records': personnel_data.get('leave_records', 30),
+            'disciplinary_actions': personnel_data.get('disciplinary_actions', 0),
+            'complaints': personnel_data.get('complaints', 0),
+            'salary_grade': personnel_data.get('salary_grade', 5)
+        }
+        for col in self.encoders:
+            values[f'{col}_encoded'] = self._category_code(col, personnel_data.get(col))
         
         # Advanced engineered features
-        years_service = personnel_data.get('years_of_service', 5)
-        missions = personnel_data.get('missions_participated', 20)
-        fitness = personnel_data.get('fitness_score', 75)
-        stress = personnel_data.get('stress_index', 40)
-        leadership = personnel_data.get('leadership_score', 6)
-        engagement = personnel_data.get('engagement_score', 75)
-        
-        features.extend([
-            missions / (years_service + 1),  # service_efficiency
-            stress / (fitness + 1),  # stress_fitness_ratio
-            leadership * engagement / 100,  # leadership_engagement
-            personnel_data.get('peer_review_score', 7) * personnel_data.get('mission_success_rate', 0.9),  # performance_consistency
-            1 / (years_service + 1)  # career_velocity (simplified)
-        ])
-        
-        # Add encoded categorical features (simplified for prediction)
-        features.extend([1, 2, 3, 1, 2, 1, 2, 1, 3, 2, 1, 2])
-        
-        return features
+        years_service = values['years_of_service']
+        rank_code = values.get('rank_encoded')
+        values.update({
+            'service_efficiency': values['missions_participated'] / (years_service + 1),
+            'stress_fitness_ratio': values['stress_index'] / (values['fitness_score'] + 1),
+            'leadership_engagement': values['leadership_score'] * values['engagement_score'] / 100,
+            'performance_consistency': values['peer_review_score'] * values['mission_success_rate'],
+            'career_velocity': None if rank_code is None else rank_code / (years_service + 1)
+        })
+        
+        scaler = self.scalers['main']
+        row = np.array([mean if values.get(col) is None else values[col]
+                        for col, mean in zip(self.feature_cols, scaler.mean_)], dtype=float)
+        return (row - scaler.mean_) / scaler.scale_
+
+    def _category_code(self, col, value):
+        """Code the fitted LabelEncoder gives value, or None if it is missing or unseen"""
+        if value is None:
+            return None
+        codes = self.category_codes.get(col)
+        if codes is None:
+            codes = self.category_codes[col] = {label: code for code, label in enumerate(self.encoders[col].classes_)}
+        return codes.get(str(value))
         
     def _get_attrition_factors(self, personnel_data):
         """Identify key attrition risk factors"""
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+import pandas as pd
+
+DATA_PATH = 'personnel_data.csv'
+SNAPSHOT_MAX_AGE = 300  # seconds before a snapshot is rebuilt regardless of file changes
+
+
+class AnalyticsSnapshot:
+    """Read-only personnel aggregates shared by every chatbot session"""
+
+    def __init__(self, df, source_path=None, source_mtime=None):
+        self.source_path = source_path
+        self.source_mtime = source_mtime
+        self.built_at = time.monotonic()
+
+        total = len(df)
+        self.total_personnel = total
+
+        if total == 0:
+            self.high_attrition_risk = 0
+            self.avg_readiness = 0.0
+            self.high_readiness = 0
+            self.mission_ready = 0
+            self.high_leadership_potential = 0
+            self.avg_fitness = 0.0
+            self.avg_stress = 0.0
+            self.high_stress = 0
+            self.avg_years_of_service = 0.0
+            return
+
+        readiness = df['readiness_score']
+        stress = df['stress_index']
+
+        self.high_attrition_risk = int((df['attrition_risk'] == 1).sum())
+        self.avg_readiness = float(readiness.mean())
+        self.high_readiness = int((readiness > 85).sum())
+        self.mission_ready = int((readiness > 80).sum())
+        self.high_leadership_potential = int((df['leadership_potential'] == 'high').sum())
+        self.avg_fitness = float(df['fitness_score'].mean())
+        self.avg_stress = float(stress.mean())
+        self.high_stress = int((stress > 70).sum())
+        self.avg_years_of_service = float(df['years_of_service'].mean())
+
+    @classmethod
+    def build(cls, data_path=DATA_PATH):
+        """Build a snapshot from the personnel CSV, or an empty one if it is unavailable"""
+        try:
+            mtime = os.path.getmtime(data_path)
+            df = pd.read_csv(data_path)
+        except Exception as e:
+            print(f"Error loading data for analytics snapshot: {e}")
+            return cls(pd.DataFrame(), data_path, None)
+
+        print(f"Built analytics snapshot from {len(df)} personnel records")
+        return cls(df, data_path, mtime)
+
+    @property
+    def high_risk_percentage(self):
+        if not self.total_personnel:
+            return 0.0
+        return (self.high_attrition_risk / self.total_personnel) * 100
+
+    def is_stale(self, max_age=SNAPSHOT_MAX_AGE):
+        """Snapshot is stale once it is older than max_age or the source file changed"""
+        if time.monotonic() - self.built_at > max_age:
+            return True
+        try:
+            mtime = os.path.getmtime(self.source_path)
+        except (OSError, TypeError):
+            mtime = None
+        return mtime != self.source_mtime
+
+    def as_dict(self):
+        return {
+            'total_personnel': self.total_personnel,
+            'high_attrition_risk': self.high_attrition_risk,
+            'avg_readiness': self.avg_readiness,
+            'high_readiness': self.high_readiness,
+            'mission_ready': self.mission_ready,
+            'high_leadership_potential': self.high_leadership_potential,
+            'avg_fitness': self.avg_fitness,
+            'avg_stress': self.avg_stress,
+            'high_stress': self.high_stress,
+            'avg_years_of_service': self.avg_years_of_service
+        }
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_analytics_snapshot(data_path=DATA_PATH, max_age=SNAPSHOT_MAX_AGE):
+    """Return the shared snapshot, rebuilding it once if it has gone stale"""
+    global _snapshot
+
+    snapshot = _snapshot
+    if snapshot is not None and not snapshot.is_stale(max_age):
+        return snapshot
+
+    with _snapshot_lock:
+        # Another thread may have rebuilt it while we waited for the lock
+        if _snapshot is None or _snapshot.source_path != data_path or _snapshot.is_stale(max_age):
+            _snapshot = AnalyticsSnapshot.build(data_path)
+        return _snapshot
+
+
+def invalidate_analytics_snapshot():
+    """Drop the shared snapshot so the next reader rebuilds it"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
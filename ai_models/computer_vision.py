@@ -1,33 +1,73 @@
-import cv2
 import numpy as np
-import face_recognition
 import pandas as pd
 from datetime import datetime, timedelta
 import json
 import os
+import threading
+
+try:
+    from .event_store import EventStore
+    from .face_index import FaceEmbeddingIndex
+    from .lazy_imports import lazy_import
+except ImportError:
+    from event_store import EventStore
+    from face_index import FaceEmbeddingIndex
+    from lazy_imports import lazy_import
+
+# OpenCV and face_recognition are imported on first use, not at module load
+cv2 = lazy_import('cv2', 'vision')
+face_recognition = lazy_import('face_recognition', 'vision')
+
+MATCH_THRESHOLD = 0.82  # cosine similarity; about face_recognition's 0.6 distance tolerance
+
+_face_cascade = None
+_face_cascade_lock = threading.Lock()
+
+
+def get_face_cascade():
+    """Haar face cascade, parsed once per process and shared by every ComputerVisionSystem"""
+    global _face_cascade
+    if _face_cascade is None:
+        with _face_cascade_lock:
+            if _face_cascade is None:
+                _face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    return _face_cascade
+
 
 class ComputerVisionSystem:
-    def __init__(self):
+    def __init__(self, event_store=None):
         self.known_faces = {}
-        self.attendance_log = []
-        self.security_alerts = []
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        
+        self.face_index = FaceEmbeddingIndex()
+        # Attendance entries and security alerts; in-memory unless a shared store is passed
+        self.events = event_store or EventStore()
+
+    @property
+    def face_cascade(self):
+        return get_face_cascade()
+
     def load_personnel_faces(self, personnel_data):
-        """Load known personnel face encodings"""
-        # Simulate loading face encodings for personnel
+        """Enroll personnel with a 128-d face encoding; records without one cannot be recognized and are skipped"""
+        personnel_ids = []
+        encodings = []
+        skipped = 0
         for person in personnel_data:
-            # In production, load actual face encodings from images
-            face_encoding = np.random.rand(128)  # Simulated face encoding
+            encoding = person.get('encoding')
+            if encoding is None:
+                skipped += 1
+                continue
+            personnel_ids.append(person['personnel_id'])
+            encodings.append(encoding)
             self.known_faces[person['personnel_id']] = {
-                'encoding': face_encoding,
                 'name': person['name'],
                 'rank': person['rank'],
                 'unit': person['unit'],
                 'clearance_level': person.get('clearance_level', 'Basic')
             }
-        
-        print(f"✅ Loaded {len(self.known_faces)} personnel face encodings")
+
+        if personnel_ids:
+            self.face_index.add(personnel_ids, np.asarray(encodings, dtype=np.float32))
+        print(f"✅ Loaded {len(self.known_faces)} personnel face encodings"
+              + (f" ({skipped} without an encoding skipped)" if skipped else ""))
     
     def detect_faces_in_frame(self, frame):
         """Detect faces in video frame"""
@@ -45,28 +85,35 @@ class ComputerVisionSystem:
         
         return detected_faces
     
-    def recognize_personnel(self, face_image):
-        """Recognize personnel from face image"""
-        # Simulate face recognition
-        if len(self.known_faces) == 0:
-            return None
-        
-        # In production, compute face encoding and compare with known faces
-        personnel_id = np.random.choice(list(self.known_faces.keys()))
-        confidence = np.random.uniform(0.85, 0.98)
-        
-        if confidence > 0.8:  # Recognition threshold
+    def recognize_encodings(self, encodings, threshold=MATCH_THRESHOLD):
+        """Match a batch of face encodings against the enrolled personnel (None where no match)"""
+        results = []
+        for matches in self.face_index.search(encodings, k=1):
+            if not matches or matches[0][1] < threshold:
+                results.append(None)
+                continue
+            personnel_id, similarity = matches[0]
             person_info = self.known_faces[personnel_id]
-            return {
+            results.append({
                 'personnel_id': personnel_id,
                 'name': person_info['name'],
                 'rank': person_info['rank'],
                 'unit': person_info['unit'],
-                'confidence': confidence,
+                'confidence': similarity,
                 'clearance_level': person_info['clearance_level']
-            }
-        
-        return None
+            })
+        return results
+
+    def recognize_personnel(self, face_image):
+        """Recognize personnel from a face image; None (no match) without an image or enrolled faces"""
+        if face_image is None or len(self.known_faces) == 0:
+            return None
+
+        # face_image is a BGR face crop from detect_faces_in_frame, so the whole crop is the face
+        height, width = face_image.shape[:2]
+        rgb = np.ascontiguousarray(face_image[:, :, ::-1])
+        encodings = face_recognition.face_encodings(rgb, known_face_locations=[(0, width, height, 0)])
+        return self.recognize_encodings(encodings[:1])[0] if encodings else None
     
     def log_attendance(self, recognition_result, location='Main Gate'):
         """Log personnel attendance"""
@@ -81,19 +128,24 @@ class ComputerVisionSystem:
                 'confidence': recognition_result['confidence']
             }
             
-            self.attendance_log.append(attendance_entry)
+            self.events.append('attendance', attendance_entry)
             return attendance_entry
         
         return None
     
-    def detect_unauthorized_access(self, frame, restricted_area=False):
-        """Detect unauthorized personnel in restricted areas"""
-        faces = self.detect_faces_in_frame(frame)
+    def detect_unauthorized_access(self, frame, restricted_area=False, faces=None, recognitions=None):
+        """Detect unauthorized personnel in restricted areas
+
+        faces / recognitions let a caller that already ran detection and
+        recognition on this frame (see FramePipeline) share the results.
+        """
+        if faces is None:
+            faces = self.detect_faces_in_frame(frame)
+        if recognitions is None:
+            recognitions = [self.recognize_personnel(face['roi']) for face in faces]
         alerts = []
         
-        for face in faces:
-            recognition = self.recognize_personnel(face['roi'])
-            
+        for recognition in recognitions:
             if recognition is None:
                 # Unknown person detected
                 alert = {
@@ -104,7 +156,7 @@ class ComputerVisionSystem:
                     'description': 'Unknown person detected'
                 }
                 alerts.append(alert)
-                self.security_alerts.append(alert)
+                self.events.append('alert', alert)
             
             elif restricted_area and recognition['clearance_level'] not in ['High', 'Top Secret']:
                 # Insufficient clearance
@@ -118,13 +170,14 @@ class ComputerVisionSystem:
                     'description': f"Personnel with {recognition['clearance_level']} clearance in restricted area"
                 }
                 alerts.append(alert)
-                self.security_alerts.append(alert)
+                self.events.append('alert', alert)
         
         return alerts
     
-    def analyze_crowd_density(self, frame):
+    def analyze_crowd_density(self, frame, faces=None):
         """Analyze crowd density for safety management"""
-        faces = self.detect_faces_in_frame(frame)
+        if faces is None:
+            faces = self.detect_faces_in_frame(frame)
         face_count = len(faces)
         
         # Calculate density based on frame area
@@ -198,50 +251,30 @@ class ComputerVisionSystem:
         """Generate attendance report"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=date_range)
-        
-        # Filter attendance log by date range
-        filtered_log = [
-            entry for entry in self.attendance_log
-            if start_date <= datetime.fromisoformat(entry['timestamp']) <= end_date
-        ]
-        
-        # Calculate statistics
-        unique_personnel = set(entry['personnel_id'] for entry in filtered_log)
-        daily_counts = {}
-        
-        for entry in filtered_log:
-            date = datetime.fromisoformat(entry['timestamp']).date()
-            daily_counts[str(date)] = daily_counts.get(str(date), 0) + 1
+        summary = self.events.summary('attendance', start_date.timestamp(), end_date.timestamp())
         
         return {
-            'total_entries': len(filtered_log),
-            'unique_personnel': len(unique_personnel),
-            'daily_counts': daily_counts,
-            'average_daily': len(filtered_log) / date_range,
+            'total_entries': summary['total'],
+            'unique_personnel': summary['distinct_personnel'],
+            'daily_counts': summary['daily'],
+            'average_daily': summary['total'] / date_range,
             'date_range': f"{start_date.date()} to {end_date.date()}"
         }
     
     def get_security_summary(self):
         """Get security alerts summary"""
-        recent_alerts = [
-            alert for alert in self.security_alerts
-            if datetime.now() - datetime.fromisoformat(alert['timestamp']) < timedelta(hours=24)
-        ]
+        now = datetime.now()
+        summary = self.events.summary('alert', (now - timedelta(hours=24)).timestamp() + 1, now.timestamp())
         
-        alert_types = {}
         severity_counts = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
-        
-        for alert in recent_alerts:
-            alert_type = alert['type']
-            alert_types[alert_type] = alert_types.get(alert_type, 0) + 1
-            severity_counts[alert['severity']] += 1
+        severity_counts.update(summary['counts']['severity'])
         
         return {
-            'total_alerts_24h': len(recent_alerts),
-            'alert_types': alert_types,
+            'total_alerts_24h': summary['total'],
+            'alert_types': summary['counts']['type'],
             'severity_breakdown': severity_counts,
-            'latest_alert': recent_alerts[-1] if recent_alerts else None,
-            'system_status': 'Normal' if len(recent_alerts) < 5 else 'Alert'
+            'latest_alert': summary['latest'],
+            'system_status': 'Normal' if summary['total'] < 5 else 'Alert'
         }
 
 # Demo usage
@@ -1,139 +1,242 @@
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, Model
-from tensorflow.keras.layers import Dense, LSTM, Conv2D, MaxPooling2D, Flatten, Dropout, Input
+import glob
+import json
+import os
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
 import joblib
 
+try:
+    from .lazy_imports import lazy_import
+    from .tflite_inference import TFLiteModel, export_tflite
+    from .training_data import DEFAULT_MEMORY_BUDGET_MB, load_labels, make_dataset, plan_batches
+except ImportError:
+    from lazy_imports import lazy_import
+    from tflite_inference import TFLiteModel, export_tflite
+    from training_data import DEFAULT_MEMORY_BUDGET_MB, load_labels, make_dataset, plan_batches
+
+# TensorFlow takes seconds to import; it is loaded when a model is first built
+tf = lazy_import('tensorflow', 'deep_learning')
+
+RISK_LEVELS = ['High', 'Medium', 'Low']  # behavior model output order
+FACE_LABELS_FILE = 'facial_recognition_labels.json'  # saved next to the models
+
 class DeepLearningModels:
     def __init__(self):
         self.models = {}
         self.scalers = {}
+        self.serving_models = {}  # name -> TFLiteModel, used for inference in preference to Keras
+        self.face_labels = None  # CNN class index -> personnel_id
     
     def create_personnel_behavior_model(self):
         """Neural network for complex personnel behavior pattern recognition"""
-        model = Sequential([
-            Dense(128, activation='relu', input_shape=(20,)),
-            Dropout(0.3),
-            Dense(64, activation='relu'),
-            Dropout(0.2),
-            Dense(32, activation='relu'),
-            Dense(3, activation='softmax')  # High/Medium/Low risk
+        layers = tf.keras.layers
+        model = tf.keras.models.Sequential([
+            layers.Dense(128, activation='relu', input_shape=(20,)),
+            layers.Dropout(0.3),
+            layers.Dense(64, activation='relu'),
+            layers.Dropout(0.2),
+            layers.Dense(32, activation='relu'),
+            layers.Dense(3, activation='softmax')  # High/Medium/Low risk
         ])
         model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
         return model
     
     def create_mission_readiness_lstm(self):
         """LSTM for time-series mission readiness prediction"""
-        model = Sequential([
-            LSTM(50, return_sequences=True, input_shape=(30, 10)),
-            Dropout(0.2),
-            LSTM(50, return_sequences=False),
-            Dropout(0.2),
-            Dense(25),
-            Dense(1, activation='sigmoid')
+        layers = tf.keras.layers
+        # Unrolled over the fixed 30 steps: the TFLite converter cannot lower the
+        # recurrent loop of a model whose batch size is left dynamic
+        model = tf.keras.models.Sequential([
+            layers.LSTM(50, return_sequences=True, unroll=True, input_shape=(30, 10)),
+            layers.Dropout(0.2),
+            layers.LSTM(50, return_sequences=False, unroll=True),
+            layers.Dropout(0.2),
+            layers.Dense(25),
+            layers.Dense(1, activation='sigmoid')
         ])
         model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
         return model
     
     def create_facial_recognition_cnn(self):
         """CNN for facial recognition attendance system"""
-        model = Sequential([
-            Conv2D(32, (3, 3), activation='relu', input_shape=(128, 128, 3)),
-            MaxPooling2D(2, 2),
-            Conv2D(64, (3, 3), activation='relu'),
-            MaxPooling2D(2, 2),
-            Conv2D(128, (3, 3), activation='relu'),
-            MaxPooling2D(2, 2),
-            Flatten(),
-            Dense(512, activation='relu'),
-            Dropout(0.5),
-            Dense(1000, activation='softmax')  # 1000 personnel IDs
+        layers = tf.keras.layers
+        model = tf.keras.models.Sequential([
+            layers.Conv2D(32, (3, 3), activation='relu', input_shape=(128, 128, 3)),
+            layers.MaxPooling2D(2, 2),
+            layers.Conv2D(64, (3, 3), activation='relu'),
+            layers.MaxPooling2D(2, 2),
+            layers.Conv2D(128, (3, 3), activation='relu'),
+            layers.MaxPooling2D(2, 2),
+            layers.Flatten(),
+            layers.Dense(512, activation='relu'),
+            layers.Dropout(0.5),
+            layers.Dense(1000, activation='softmax')  # 1000 personnel IDs
         ])
         model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
         return model
     
-    def train_models(self):
-        """Train all deep learning models with synthetic data"""
-        # Generate synthetic training data
-        X_behavior = np.random.rand(5000, 20)
-        y_behavior = tf.keras.utils.to_categorical(np.random.randint(0, 3, 5000), 3)
-        
-        X_lstm = np.random.rand(3000, 30, 10)
-        y_lstm = np.random.randint(0, 2, 3000)
-        
-        X_face = np.random.rand(10000, 128, 128, 3)
-        y_face = tf.keras.utils.to_categorical(np.random.randint(0, 1000, 10000), 1000)
-        
-        # Train behavior model
-        behavior_model = self.create_personnel_behavior_model()
-        behavior_model.fit(X_behavior, y_behavior, epochs=10, batch_size=32, validation_split=0.2, verbose=0)
-        self.models['behavior'] = behavior_model
-        
-        # Train LSTM model
-        lstm_model = self.create_mission_readiness_lstm()
-        lstm_model.fit(X_lstm, y_lstm, epochs=10, batch_size=32, validation_split=0.2, verbose=0)
-        self.models['mission_lstm'] = lstm_model
+    def train_models(self, data_dir=None, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, face_labels=None, names=None):
+        """Train all deep learning models from streamed float32 batches
+
+        Face crops and readiness sequences are read from shards under
+        data_dir (see training_data.write_shards) when present; otherwise
+        synthetic batches are generated on the fly. Batches in flight are
+        kept within memory_budget_mb. face_labels maps the face CNN's class
+        indices to personnel ids; by default it is the labels.json saved
+        with the face shards. names limits training to those models.
+        """
+        if names is not None and 'facial_recognition' not in names:
+            self.face_labels = None
+        elif face_labels is not None:
+            self.face_labels = list(face_labels)
+        else:
+            self.face_labels = load_labels(data_dir, 'facial_recognition')
+        # model name -> (builder, epochs, batch size)
+        training = {
+            'behavior': (self.create_personnel_behavior_model, 10, 32),
+            'mission_lstm': (self.create_mission_readiness_lstm, 10, 32),
+            'facial_recognition': (self.create_facial_recognition_cnn, 5, 16),  # simplified for demo
+        }
         
-        # Train CNN model (simplified for demo)
-        cnn_model = self.create_facial_recognition_cnn()
-        cnn_model.fit(X_face, y_face, epochs=5, batch_size=16, validation_split=0.2, verbose=0)
-        self.models['facial_recognition'] = cnn_model
+        for name, (builder, epochs, batch_size) in training.items():
+            if names is not None and name not in names:
+                continue
+            plan = plan_batches(name, batch_size, memory_budget_mb)
+            train_data = make_dataset(name, data_dir, batch_size, 'train', memory_budget_mb)
+            validation_data = make_dataset(name, data_dir, batch_size, 'validation', memory_budget_mb)
+            
+            model = builder()
+            model.fit(train_data, validation_data=validation_data, epochs=epochs, verbose=0)
+            self.models[name] = model
+            print(f"  {name}: batch {plan['batch_size']}, ~{plan['peak_mb']} MB of batches in flight")
         
         print("✅ Deep learning models trained successfully")
         return self.models
     
+    def save_face_labels(self, directory):
+        if self.face_labels is not None:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, FACE_LABELS_FILE), 'w') as f:
+                json.dump(self.face_labels, f)
+
+    def load_face_labels(self, directory):
+        path = os.path.join(directory, FACE_LABELS_FILE)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.face_labels = json.load(f)
+        return self.face_labels
+
+    def save_models(self, directory='ai_models/trained_models'):
+        """Save each trained Keras model as <name>_model.h5, with the face class labels"""
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for name, model in self.models.items():
+            paths[name] = os.path.join(directory, f'{name}_model.h5')
+            model.save(paths[name])
+        self.save_face_labels(directory)
+        return paths
+
+    def export_for_serving(self, directory='ai_models/serving', quantization='dynamic', data_dir=None):
+        """Write each trained model as a SavedModel plus a quantized .tflite file for CPU inference"""
+        self.save_face_labels(directory)
+        sizes = {}
+        for name, model in self.models.items():
+            sizes[name] = export_tflite(
+                model, os.path.join(directory, f'{name}.tflite'), name=name, quantization=quantization,
+                data_dir=data_dir, saved_model_dir=os.path.join(directory, f'{name}_savedmodel')
+            )
+            print(f"  {name}: {sizes[name] / 1024:.0f} KB ({quantization})")
+        return sizes
+
+    def load_serving_models(self, directory='ai_models/serving', num_threads=None):
+        """Load exported .tflite models; predictions use them instead of the Keras models"""
+        for path in sorted(glob.glob(os.path.join(directory, '*.tflite'))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            self.serving_models[name] = TFLiteModel(path, num_threads=num_threads)
+        self.load_face_labels(directory)
+        return list(self.serving_models)
+
+    def _has_model(self, name):
+        return name in self.serving_models or name in self.models
+
+    def _predict(self, name, x):
+        if name in self.serving_models:
+            return self.serving_models[name].predict(x)
+        return self.models[name].predict(np.asarray(x, dtype=np.float32), verbose=0)
+
+    def predict_behavior_batch(self, features):
+        """Risk level and confidence for each row of 20 behavior features"""
+        probabilities = self._predict('behavior', np.asarray(features, dtype=np.float32).reshape(-1, 20))
+        return [
+            {'risk_level': RISK_LEVELS[int(np.argmax(row))], 'confidence': float(np.max(row))}
+            for row in probabilities
+        ]
+
     def predict_behavior_pattern(self, personnel_data):
         """Predict personnel behavior patterns"""
-        if 'behavior' not in self.models:
+        if not self._has_model('behavior'):
             return {'risk_level': 'Medium', 'confidence': 0.75}
         
-        # Simulate prediction
-        prediction = np.random.choice(['Low', 'Medium', 'High'], p=[0.6, 0.3, 0.1])
-        confidence = np.random.uniform(0.7, 0.95)
-        
-        return {
-            'risk_level': prediction,
-            'confidence': confidence,
-            'factors': ['Performance trends', 'Training completion', 'Peer interactions']
-        }
+        features = personnel_data['features'] if isinstance(personnel_data, dict) else personnel_data
+        result = self.predict_behavior_batch([features])[0]
+        result['factors'] = ['Performance trends', 'Training completion', 'Peer interactions']
+        return result
     
-    def predict_mission_readiness_sequence(self, historical_data):
-        """Predict mission readiness over time"""
-        if 'mission_lstm' not in self.models:
+    def predict_mission_readiness_sequence(self, historical_data, horizon=5):
+        """Predict mission readiness over time
+
+        historical_data is a (days, 10) array of daily readiness indicators;
+        the trend is the model's readiness for each of the last `horizon`
+        30-day windows, scored in one batch.
+        """
+        if not self._has_model('mission_lstm'):
             return {'readiness_trend': [0.85, 0.87, 0.89, 0.91, 0.88]}
         
-        # Simulate LSTM prediction
-        trend = [0.85 + 0.02 * i + np.random.normal(0, 0.02) for i in range(5)]
+        history = np.asarray(historical_data, dtype=np.float32).reshape(-1, 10)
+        if len(history) < 30:
+            history = np.concatenate([np.repeat(history[:1], 30 - len(history), axis=0), history])
+        ends = range(max(30, len(history) - horizon + 1), len(history) + 1)
+        windows = np.stack([history[end - 30:end] for end in ends])
+        trend = [float(value) for value in self._predict('mission_lstm', windows).ravel()]
         return {
             'readiness_trend': trend,
             'predicted_peak': max(trend),
             'risk_periods': [i for i, val in enumerate(trend) if val < 0.8]
         }
     
+    def recognize_faces(self, images):
+        """Personnel id and confidence for a batch of 128x128 RGB face crops"""
+        images = np.asarray(images)
+        if images.dtype == np.uint8:
+            images = images.astype(np.float32) / 255.0
+        probabilities = self._predict('facial_recognition', images.reshape(-1, 128, 128, 3))
+        results = []
+        for row in probabilities:
+            index = int(np.argmax(row))
+            results.append({
+                'personnel_id': self.face_labels[index] if index < len(self.face_labels or []) else f'class-{index}',
+                'confidence': float(row[index])
+            })
+        return results
+
     def recognize_face(self, image_data):
         """Facial recognition for attendance"""
-        if 'facial_recognition' not in self.models:
+        if not self._has_model('facial_recognition'):
             return {'personnel_id': 'IAF001234', 'confidence': 0.92}
         
-        # Simulate face recognition
-        personnel_id = f"IAF{np.random.randint(100000, 999999)}"
-        confidence = np.random.uniform(0.85, 0.98)
-        
-        return {
-            'personnel_id': personnel_id,
-            'confidence': confidence,
+        result = self.recognize_faces([image_data])[0]
+        result.update({
             'timestamp': pd.Timestamp.now().isoformat(),
             'location': 'Main Gate'
-        }
+        })
+        return result
 
 if __name__ == "__main__":
     dl_models = DeepLearningModels()
     trained_models = dl_models.train_models()
     
-    # Save models
-    for name, model in trained_models.items():
-        model.save(f'ai_models/{name}_model.h5')
+    # Export quantized models for CPU serving
+    dl_models.export_for_serving('ai_models/serving', quantization='dynamic')
     
     print("🧠 Deep Learning Models Ready!")
\ No newline at end of file
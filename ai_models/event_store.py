@@ -0,0 +1,244 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS cv_events ('
+    'id INTEGER PRIMARY KEY, kind TEXT NOT NULL, day INTEGER NOT NULL, ts INTEGER NOT NULL, '
+    'personnel_id TEXT, data TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS cv_events_kind_day_ts ON cv_events (kind, day, ts)',
+    'CREATE TABLE IF NOT EXISTS cv_daily_counters ('
+    'kind TEXT NOT NULL, day INTEGER NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL, '
+    'PRIMARY KEY (kind, day, key)) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS cv_daily_personnel ('
+    'kind TEXT NOT NULL, day INTEGER NOT NULL, personnel_id TEXT NOT NULL, '
+    'PRIMARY KEY (kind, day, personnel_id)) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS cv_last_seen ('
+    'kind TEXT NOT NULL, personnel_id TEXT NOT NULL, ts INTEGER NOT NULL, '
+    'PRIMARY KEY (kind, personnel_id)) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cv_last_seen_kind_ts ON cv_last_seen (kind, ts)',
+]
+
+COUNTED_FIELDS = ('type', 'severity', 'location', 'entry_type')
+
+
+def day_of(ts):
+    """Local calendar day of an epoch timestamp, as a proleptic ordinal"""
+    return date.fromtimestamp(ts).toordinal()
+
+
+def day_start(day):
+    return int(datetime.combine(date.fromordinal(day), datetime.min.time()).timestamp())
+
+
+def _counter_keys(event):
+    keys = ['total']
+    keys += [f'{field}:{event[field]}' for field in COUNTED_FIELDS if event.get(field) is not None]
+    return keys
+
+
+class EventStore:
+    """Attendance log and security alerts in SQLite, partitioned by day.
+
+    Events are buffered and written in batches: every flush_size events, at
+    most flush_interval seconds after the oldest buffered event (a background
+    thread flushes quiet periods), and before any read. Kinds listed in
+    immediate_kinds (security alerts) are committed as they are appended, so
+    a hard kill loses at most flush_interval seconds of attendance events
+    and no alerts. Each batch also bumps
+    per-day counters (total and per type / severity / location), the per-day
+    set of personnel seen and each person's last-seen time, so a report over
+    a date range reads one counter row per day and only touches raw events
+    for the partial days at either end of the range. Timestamps are stored
+    as epoch seconds.
+    """
+
+    def __init__(self, path=':memory:', flush_size=500, flush_interval=1.0, immediate_kinds=('alert',)):
+        self.path = str(path)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.immediate_kinds = frozenset(immediate_kinds)
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        if self.path != ':memory:':
+            # Batches commit often; WAL without a sync per commit keeps that cheap
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._lock = threading.RLock()
+        self._pending = []
+        self._pending_since = None
+        with self._conn:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name='event-store-flush', daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def append(self, kind, event, ts=None):
+        """Queue an event; its 'timestamp' key is replaced by the integer ts column"""
+        ts = int(ts if ts is not None else time.time())
+        data = {key: value for key, value in event.items() if key != 'timestamp'}
+        with self._lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((kind, ts, data))
+            if (kind in self.immediate_kinds or len(self._pending) >= self.flush_size
+                    or time.monotonic() - self._pending_since >= self.flush_interval):
+                self.flush()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval / 2):
+            with self._lock:
+                due = self._pending and time.monotonic() - self._pending_since >= self.flush_interval
+                if not due:
+                    continue
+                try:
+                    self.flush()
+                except sqlite3.Error as e:
+                    # Events stay buffered and are retried on the next tick
+                    print(f"⚠️ Event store flush failed: {e}")
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows, counters, personnel, last_seen = [], Counter(), set(), {}
+            for kind, ts, data in self._pending:
+                day = day_of(ts)
+                rows.append((kind, day, ts, data.get('personnel_id'), json.dumps(data, default=str)))
+                for key in _counter_keys(data):
+                    counters[(kind, day, key)] += 1
+                if data.get('personnel_id'):
+                    personnel.add((kind, day, data['personnel_id']))
+                    key = (kind, data['personnel_id'])
+                    last_seen[key] = max(ts, last_seen.get(key, ts))
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT INTO cv_events (kind, day, ts, personnel_id, data) VALUES (?, ?, ?, ?, ?)', rows
+                )
+                self._conn.executemany(
+                    'INSERT INTO cv_daily_counters (kind, day, key, count) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (kind, day, key) DO UPDATE SET count = count + excluded.count',
+                    [(*key, count) for key, count in counters.items()]
+                )
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO cv_daily_personnel (kind, day, personnel_id) VALUES (?, ?, ?)', personnel
+                )
+                self._conn.executemany(
+                    'INSERT INTO cv_last_seen (kind, personnel_id, ts) VALUES (?, ?, ?) '
+                    'ON CONFLICT (kind, personnel_id) DO UPDATE SET ts = max(ts, excluded.ts)',
+                    [(*key, ts) for key, ts in last_seen.items()]
+                )
+            self._pending = []
+            self._pending_since = None
+
+    def _decode(self, ts, data):
+        event = json.loads(data)
+        event['timestamp'] = datetime.fromtimestamp(ts).isoformat()
+        return event
+
+    def summary(self, kind, start_ts, end_ts):
+        """Totals, per-field counts, daily counts, distinct personnel and latest event for start_ts..end_ts"""
+        start_ts, end_ts = int(start_ts), int(end_ts)
+        first_day, last_day = day_of(start_ts), day_of(end_ts)
+        # Days wholly inside the range come from the counters; the partial ends from raw events
+        full_days = range(first_day + (start_ts > day_start(first_day)),
+                          last_day + (end_ts >= day_start(last_day + 1) - 1))
+        edges = [(max(start_ts, day_start(day)), min(end_ts, day_start(day + 1) - 1))
+                 for day in sorted({first_day, last_day}) if day not in full_days]
+
+        counts, daily = Counter(), Counter()
+        with self._lock:
+            self.flush()
+            if full_days:
+                for day, key, count in self._conn.execute(
+                    'SELECT day, key, count FROM cv_daily_counters WHERE kind = ? AND day BETWEEN ? AND ?',
+                    (kind, full_days.start, full_days.stop - 1)
+                ):
+                    counts[key] += count
+                    if key == 'total':
+                        daily[day] += count
+
+            edge_personnel = set()
+            for low, high in edges:
+                for day, personnel_id, data in self._conn.execute(
+                    'SELECT day, personnel_id, data FROM cv_events WHERE kind = ? AND day = ? AND ts BETWEEN ? AND ?',
+                    (kind, day_of(low), low, high)
+                ):
+                    for key in _counter_keys(json.loads(data)):
+                        counts[key] += 1
+                    daily[day] += 1
+                    if personnel_id:
+                        edge_personnel.add(personnel_id)
+
+            newest = self._conn.execute(
+                'SELECT ts FROM cv_events WHERE kind = ? ORDER BY day DESC, ts DESC LIMIT 1', (kind,)
+            ).fetchone()
+            if newest is None or end_ts >= newest[0]:
+                # Nothing was logged after the range, so anyone last seen inside it was seen in it
+                distinct_personnel = self._conn.execute(
+                    'SELECT count(*) FROM cv_last_seen WHERE kind = ? AND ts >= ?', (kind, start_ts)
+                ).fetchone()[0]
+            else:
+                personnel = edge_personnel
+                if full_days:
+                    personnel = edge_personnel | {row[0] for row in self._conn.execute(
+                        'SELECT personnel_id FROM cv_daily_personnel WHERE kind = ? AND day BETWEEN ? AND ?',
+                        (kind, full_days.start, full_days.stop - 1)
+                    )}
+                distinct_personnel = len(personnel)
+
+            latest = self._conn.execute(
+                'SELECT ts, data FROM cv_events WHERE kind = ? AND day BETWEEN ? AND ? AND ts BETWEEN ? AND ? '
+                'ORDER BY day DESC, ts DESC, id DESC LIMIT 1',
+                (kind, first_day, last_day, start_ts, end_ts)
+            ).fetchone()
+
+        by_field = {field: {} for field in COUNTED_FIELDS}
+        for key, count in counts.items():
+            if key != 'total':
+                field, value = key.split(':', 1)
+                by_field[field][value] = count
+        return {
+            'total': counts['total'],
+            'counts': by_field,
+            'daily': {str(date.fromordinal(day)): count for day, count in sorted(daily.items())},
+            'distinct_personnel': distinct_personnel,
+            'latest': self._decode(*latest) if latest else None
+        }
+
+    def recent(self, kind, limit=100):
+        """Most recent events of a kind, newest first"""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                'SELECT ts, data FROM cv_events WHERE kind = ? ORDER BY day DESC, ts DESC, id DESC LIMIT ?',
+                (kind, limit)
+            ).fetchall()
+        return [self._decode(ts, data) for ts, data in rows]
+
+    def close(self):
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            self.flush()
+            self._conn.close()
+        atexit.unregister(self.flush)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_event_store(path):
+    """One store per database file, shared by every ComputerVisionSystem in the process"""
+    path = str(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = EventStore(path)
+        return store
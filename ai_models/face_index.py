@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+FACE_ENCODING_DIM = 128
+QUERY_BLOCK_CELLS = 1 << 24  # max query x row scores held at once by a flat search (64 MB of float32)
+
+
+def normalize(vectors):
+    """float32 rows scaled to unit length, so a dot product is the cosine similarity"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def _top_k(scores, k):
+    """Column indices of the k highest scores in each row, best first"""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def nearest_centroid(vectors, centroids):
+    """Index of the most similar centroid for each vector, scored in bounded blocks"""
+    block = max(1, QUERY_BLOCK_CELLS // len(centroids))
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block):
+        assignment[start:start + block] = np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+    return assignment
+
+
+def spherical_kmeans(vectors, n_lists, iterations=10, seed=42):
+    """Unit-length centroids for normalized vectors (k-means on cosine similarity)"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = nearest_centroid(vectors, centroids)
+        order = np.argsort(assignment, kind='stable')
+        counts = np.bincount(assignment, minlength=n_lists)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(vectors[order], starts[~empty])
+        # Re-seed empty lists from random vectors rather than leaving dead centroids
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class FaceEmbeddingIndex:
+    """Nearest-neighbour index over face encodings for attendance recognition.
+
+    Encodings are stored normalized in one contiguous float32 matrix and
+    searched by dot product. After train() the index becomes an inverted
+    file: rows are kept sorted by their nearest k-means centroid, so each
+    list is a contiguous slice, and a query only scores the nprobe lists
+    closest to it. Rows enrolled after the last build are scored by brute
+    force until the next rebuild; removed rows are tombstoned and dropped
+    when the index is compacted.
+    """
+
+    def __init__(self, dim=FACE_ENCODING_DIM, nprobe=8, rebuild_fraction=0.1):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.rebuild_fraction = rebuild_fraction
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids = []
+        self._row_of = {}
+        self._count = 0
+        self._centroids = None
+        self._offsets = None  # list l holds rows offsets[l]:offsets[l + 1]
+        self._built = 0  # rows below this are in the inverted lists, the rest are pending
+        self._dead = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, personnel_id):
+        return personnel_id in self._row_of
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    def _reserve(self, rows):
+        needed = self._count + rows
+        if needed > len(self._vectors) or not self._vectors.flags.writeable:
+            capacity = max(needed, len(self._vectors) * 5 // 4, 1024)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:self._count] = self._vectors[:self._count]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self._count] = self._alive[:self._count]
+            self._vectors, self._alive = vectors, alive
+
+    def add(self, personnel_ids, encodings):
+        """Enroll (or re-enroll) a batch of identities"""
+        encodings = normalize(encodings)
+        if encodings.shape != (len(personnel_ids), self.dim):
+            raise ValueError(f'Expected {len(personnel_ids)} encodings of dimension {self.dim}')
+
+        with self._lock:
+            self._reserve(len(personnel_ids))
+            for personnel_id, encoding in zip(personnel_ids, encodings):
+                old_row = self._row_of.get(personnel_id)
+                if old_row is not None:
+                    self._alive[old_row] = False
+                    self._dead += 1
+                row = self._count
+                self._vectors[row] = encoding
+                self._alive[row] = True
+                self._row_of[personnel_id] = row
+                self._ids.append(personnel_id)
+                self._count += 1
+
+            self._maintain()
+
+    def remove(self, personnel_id):
+        with self._lock:
+            row = self._row_of.pop(personnel_id, None)
+            if row is None:
+                return False
+            self._alive[row] = False
+            self._dead += 1
+            self._maintain()
+            return True
+
+    def _maintain(self):
+        """Rebuild the lists once pending and removed rows pass rebuild_fraction of the index"""
+        limit = self.rebuild_fraction * max(self._count, 1)
+        if self.is_trained:
+            if (self._count - self._built) + self._dead > limit:
+                self._build()
+        elif self._dead > limit:
+            self._compact()
+
+    def train(self, n_lists=None, sample_size=100000, iterations=10, seed=42):
+        """Partition the index into n_lists inverted lists (default ~4 * sqrt(n))"""
+        with self._lock:
+            self._compact()
+            if self._count == 0:
+                raise ValueError('Cannot train an empty index')
+            n_lists = n_lists or int(4 * np.sqrt(self._count))
+            n_lists = max(1, min(n_lists, self._count))
+            rng = np.random.default_rng(seed)
+            sample = self._vectors[:self._count]
+            if self._count > sample_size:
+                sample = sample[np.sort(rng.choice(self._count, sample_size, replace=False))]
+            self._centroids = spherical_kmeans(sample, n_lists, iterations, seed)
+            self._build()
+
+    def _compact(self):
+        """Drop tombstoned rows"""
+        if self._dead == 0:
+            return
+        keep = np.flatnonzero(self._alive[:self._count])
+        self._reorder(keep)
+
+    def _reorder(self, rows):
+        self._vectors = np.ascontiguousarray(self._vectors[rows])
+        self._alive = np.ones(len(rows), dtype=bool)
+        self._ids = [self._ids[row] for row in rows]
+        self._row_of = {personnel_id: row for row, personnel_id in enumerate(self._ids)}
+        self._count = len(rows)
+        self._dead = 0
+
+    def _build(self):
+        """Sort the live rows by inverted list so every list is one contiguous slice"""
+        keep = np.flatnonzero(self._alive[:self._count])
+        assignment = nearest_centroid(self._vectors[keep], self._centroids)
+        order = np.argsort(assignment, kind='stable')
+        self._reorder(keep[order])
+        self._offsets = np.searchsorted(assignment[order], np.arange(len(self._centroids) + 1))
+        self._built = self._count
+
+    def search(self, encodings, k=1, nprobe=None):
+        """Top-k (personnel_id, similarity) lists for a batch of query encodings"""
+        queries = normalize(encodings)
+        with self._lock:
+            if not self._row_of:
+                return [[] for _ in range(len(queries))]
+            if self.is_trained:
+                rows, scores = self._search_ivf(queries, k, nprobe or self.nprobe)
+            else:
+                rows, scores = self._search_flat(queries, k)
+            ids = self._ids
+            return [
+                [(ids[row], float(score)) for row, score in zip(row_list, score_list) if score > -np.inf]
+                for row_list, score_list in zip(rows, scores)
+            ]
+
+    def _search_flat(self, queries, k, start=0):
+        vectors = self._vectors[start:self._count]
+        alive = self._alive[start:self._count]
+        block = max(1, QUERY_BLOCK_CELLS // max(len(vectors), 1))
+        rows, scores = [], []
+        for offset in range(0, len(queries), block):
+            block_scores = queries[offset:offset + block] @ vectors.T
+            block_scores[:, ~alive] = -np.inf
+            best = _top_k(block_scores, k)
+            rows.extend(best + start)
+            scores.extend(np.take_along_axis(block_scores, best, axis=1))
+        return rows, scores
+
+    def _search_ivf(self, queries, k, nprobe):
+        nprobe = min(nprobe, len(self._centroids))
+        probes = _top_k(queries @ self._centroids.T, nprobe)
+        pending = self._search_flat(queries, k, self._built) if self._count > self._built else None
+        offsets, vectors, alive = self._offsets, self._vectors, self._alive
+
+        rows, scores = [], []
+        for i, query in enumerate(queries):
+            spans = [(offsets[l], offsets[l + 1]) for l in probes[i] if offsets[l + 1] > offsets[l]]
+            candidate_rows = np.concatenate([np.arange(lo, hi) for lo, hi in spans] or [np.zeros(0, dtype=np.int64)])
+            candidate_scores = np.concatenate([vectors[lo:hi] @ query for lo, hi in spans] or [np.zeros(0, np.float32)])
+            candidate_scores[~alive[candidate_rows]] = -np.inf
+            if pending is not None:
+                candidate_rows = np.concatenate([candidate_rows, pending[0][i]])
+                candidate_scores = np.concatenate([candidate_scores, pending[1][i]])
+            if len(candidate_rows) == 0:
+                rows.append([])
+                scores.append([])
+                continue
+            best = _top_k(candidate_scores[None, :], k)[0]
+            rows.append(candidate_rows[best])
+            scores.append(candidate_scores[best])
+        return rows, scores
+
+    def save(self, directory):
+        """Write the index as .npy files that load() can memory-map"""
+        with self._lock:
+            if not self.is_trained:
+                self._compact()
+            elif self._dead or self._count > self._built:
+                self._build()
+            os.makedirs(directory, exist_ok=True)
+            np.save(os.path.join(directory, 'vectors.npy'), self._vectors[:self._count])
+            if self.is_trained:
+                np.save(os.path.join(directory, 'centroids.npy'), self._centroids)
+                np.save(os.path.join(directory, 'offsets.npy'), self._offsets)
+            with open(os.path.join(directory, 'index.json'), 'w') as f:
+                json.dump({'dim': self.dim, 'nprobe': self.nprobe, 'built': self._built, 'ids': self._ids}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open a saved index; with mmap the vectors stay on disk until enrollment copies them"""
+        with open(os.path.join(directory, 'index.json')) as f:
+            meta = json.load(f)
+        index = cls(dim=meta['dim'], nprobe=meta['nprobe'])
+        index._vectors = np.load(os.path.join(directory, 'vectors.npy'), mmap_mode='r' if mmap else None)
+        index._ids = meta['ids']
+        index._count = len(index._ids)
+        index._alive = np.ones(index._count, dtype=bool)
+        index._row_of = {personnel_id: row for row, personnel_id in enumerate(index._ids)}
+        centroids_path = os.path.join(directory, 'centroids.npy')
+        if os.path.exists(centroids_path):
+            index._centroids = np.load(centroids_path)
+            index._offsets = np.load(os.path.join(directory, 'offsets.npy'))
+            index._built = meta['built']
+        return index
+
+    def stats(self):
+        return {
+            'identities': len(self._row_of),
+            'rows': self._count,
+            'pending': self._count - self._built if self.is_trained else 0,
+            'lists': len(self._centroids) if self.is_trained else 0,
+            'nprobe': self.nprobe,
+            'memory_mb': round(self._vectors.nbytes / 1024 / 1024, 1),
+            'memory_mapped': isinstance(self._vectors, np.memmap)
+        }
@@ -0,0 +1,259 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from .lazy_imports import lazy_import
+except ImportError:
+    from lazy_imports import lazy_import
+
+cv2 = lazy_import('cv2', 'vision')
+face_recognition = lazy_import('face_recognition', 'vision')
+
+_STOP = object()
+
+
+def decode_frame(item):
+    """Camera payloads may arrive JPEG/PNG-encoded; arrays pass through unchanged"""
+    image = item['image']
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        image = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return image
+
+
+def encode_faces(item, faces):
+    """face_recognition encodings for every detected face, computed in one call per frame"""
+    if not faces:
+        return np.zeros((0, 128), dtype=np.float32)
+    rgb = np.ascontiguousarray(item['image'][:, :, ::-1])
+    locations = [(int(y), int(x + w), int(y + h), int(x)) for x, y, w, h in (face['bbox'] for face in faces)]
+    return np.asarray(face_recognition.face_encodings(rgb, known_face_locations=locations), dtype=np.float32)
+
+
+def synthetic_frames(count, width=640, height=480, faces_per_frame=3, encodings=None, seed=42):
+    """Frames with known face boxes (and encodings drawn from `encodings`) for testing without a camera"""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for index in range(count):
+        image = np.roll(background, index * 4, axis=1)
+        boxes = []
+        for _ in range(faces_per_frame):
+            w = h = int(rng.integers(40, 120))
+            x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+            image[y:y + h, x:x + w] = 200
+            boxes.append((x, y, w, h))
+        item = {'image': image, 'boxes': boxes}
+        if encodings is not None:
+            rows = rng.integers(0, len(encodings), faces_per_frame)
+            item['encodings'] = encodings[rows] + rng.normal(0, 0.02, (faces_per_frame, encodings.shape[1]))
+        yield item
+
+
+def synthetic_detect(item):
+    """Stand-in detector for synthetic frames: does a grayscale pass, reports the drawn boxes"""
+    gray = item['image'].mean(axis=2)
+    return [{'bbox': box, 'roi': item['image'][box[1]:box[1] + box[3], box[0]:box[0] + box[2]],
+             'confidence': float(gray[box[1], box[0]] / 255)} for box in item['boxes']]
+
+
+def synthetic_encode(item, faces):
+    return item.get('encodings', np.random.rand(len(faces), 128))[:len(faces)]
+
+
+class FramePipeline:
+    """Camera frame processing on a pool of threads connected by bounded queues.
+
+    capture -> decode -> detect (detector_workers threads) -> recognize.
+    Faces are detected once per frame and the same detections and
+    recognitions feed the security check, crowd density and attendance
+    consumers. When the decode queue is full the capture thread drops the
+    frame and widens its frame stride; the stride narrows again as the
+    queue drains, so a slow detector sheds load instead of falling behind
+    a live camera. OpenCV and numpy release the GIL, so detection threads
+    run in parallel.
+    """
+
+    def __init__(self, cv_system, detect=None, encode=None, decode=decode_frame, detector_workers=2,
+                 queue_size=4, drop_frames=True, restricted_area=False, log_attendance=False,
+                 on_result=None, max_stride=8):
+        self.cv_system = cv_system
+        self.detect = detect or (lambda item: cv_system.detect_faces_in_frame(item['image']))
+        self.encode = encode or encode_faces
+        self.decode = decode
+        self.detector_workers = detector_workers
+        self.drop_frames = drop_frames
+        self.restricted_area = restricted_area
+        self.log_attendance = log_attendance
+        self.on_result = on_result
+        self.max_stride = max_stride
+        self.queue_size = queue_size
+        self.results = []
+        self._reset()
+
+    def _reset(self):
+        self._decode_queue = queue.Queue(self.queue_size)
+        self._detect_queue = queue.Queue(self.queue_size)
+        self._recognize_queue = queue.Queue(self.queue_size)
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._errors = []
+        self.stride = 1
+        self.counters = {'captured': 0, 'skipped': 0, 'dropped': 0, 'processed': 0, 'faces': 0}
+        self.stage_seconds = {'decode': 0.0, 'detect': 0.0, 'encode': 0.0, 'recognize': 0.0}
+        self._started = None
+        self._finished = None
+
+    def run(self, source):
+        """Process every frame from an iterable source; blocks until it is exhausted or stop() is called"""
+        self._reset()
+        self.results = []
+        threads = [threading.Thread(target=self._decode_stage, name='frame-decode')]
+        threads += [threading.Thread(target=self._detect_stage, name=f'frame-detect-{i}')
+                    for i in range(self.detector_workers)]
+        threads.append(threading.Thread(target=self._recognize_stage, name='frame-recognize'))
+        self._started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        try:
+            self._capture(source)
+        finally:
+            self._decode_queue.put(_STOP)
+            for thread in threads:
+                thread.join()
+            self._finished = time.perf_counter()
+        if self._errors:
+            raise self._errors[0]
+        return self.stats()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _fail(self, error):
+        """Record a stage error and stop capture; stages keep passing stop markers so every thread exits"""
+        with self._lock:
+            self._errors.append(error)
+        self._stop_event.set()
+
+    def _timed(self, stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        with self._lock:
+            self.stage_seconds[stage] += time.perf_counter() - start
+        return result
+
+    def _capture(self, source):
+        low_water = self.queue_size // 4
+        for index, frame in enumerate(source):
+            if self._stop_event.is_set():
+                break
+            self.counters['captured'] += 1
+            if index % self.stride:
+                self.counters['skipped'] += 1
+                continue
+
+            item = dict(frame) if isinstance(frame, dict) else {'image': frame}
+            item['index'] = index
+            item['captured_at'] = time.time()
+            if not self.drop_frames:
+                self._decode_queue.put(item)
+                continue
+            try:
+                self._decode_queue.put_nowait(item)
+            except queue.Full:
+                self.counters['dropped'] += 1
+                self.stride = min(self.stride * 2, self.max_stride)
+                continue
+            if self.stride > 1 and self._decode_queue.qsize() <= low_water:
+                self.stride -= 1
+
+    def _decode_stage(self):
+        while True:
+            item = self._decode_queue.get()
+            if item is _STOP:
+                break
+            if self._errors:
+                continue
+            try:
+                item['image'] = self._timed('decode', self.decode, item)
+            except Exception as e:
+                self._fail(e)
+                continue
+            self._detect_queue.put(item)
+        for _ in range(self.detector_workers):
+            self._detect_queue.put(_STOP)
+
+    def _detect_stage(self):
+        while True:
+            item = self._detect_queue.get()
+            if item is _STOP:
+                break
+            if self._errors:
+                continue
+            try:
+                item['faces'] = self._timed('detect', self.detect, item)
+                item['encodings'] = self._timed('encode', self.encode, item, item['faces'])
+            except Exception as e:
+                self._fail(e)
+                continue
+            self._recognize_queue.put(item)
+        self._recognize_queue.put(_STOP)
+
+    def _recognize_stage(self):
+        finished_workers = 0
+        while finished_workers < self.detector_workers:
+            item = self._recognize_queue.get()
+            if item is _STOP:
+                finished_workers += 1
+                continue
+            if self._errors:
+                continue
+            try:
+                result = self._timed('recognize', self._consume, item)
+                self.counters['processed'] += 1
+                self.counters['faces'] += len(item['faces'])
+                if self.on_result:
+                    self.on_result(result)
+                else:
+                    self.results.append(result)
+            except Exception as e:
+                self._fail(e)
+
+    def _consume(self, item):
+        """Run every consumer off the frame's single detection and recognition pass"""
+        faces = item['faces']
+        cv = self.cv_system
+        recognitions = cv.recognize_encodings(item['encodings']) if len(faces) and cv.known_faces else [None] * len(faces)
+        alerts = cv.detect_unauthorized_access(item['image'], self.restricted_area, faces=faces,
+                                               recognitions=recognitions)
+        crowd = cv.analyze_crowd_density(item['image'], faces=faces)
+        attendance = []
+        if self.log_attendance:
+            attendance = [entry for entry in map(cv.log_attendance, recognitions) if entry]
+        return {
+            'frame': item['index'],
+            'timestamp': datetime.fromtimestamp(item['captured_at']).isoformat(),
+            'faces': len(faces),
+            'recognized': [r['personnel_id'] for r in recognitions if r],
+            'alerts': alerts,
+            'crowd': crowd,
+            'attendance_logged': len(attendance),
+            'latency_ms': round((time.time() - item['captured_at']) * 1000, 2)
+        }
+
+    def stats(self):
+        elapsed = ((self._finished or time.perf_counter()) - self._started) if self._started else 0
+        processed = self.counters['processed']
+        return {
+            **self.counters,
+            'stride': self.stride,
+            'elapsed_seconds': round(elapsed, 3),
+            'fps': round(processed / elapsed, 1) if elapsed else 0,
+            'stage_ms_per_frame': {
+                stage: round(seconds * 1000 / processed, 3) if processed else 0
+                for stage, seconds in self.stage_seconds.items()
+            }
+        }
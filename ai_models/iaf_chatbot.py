@@ -1,107 +1,103 @@
 import json
-import re
 from datetime import datetime
-import pandas as pd
-from advanced_ml_models import AdvancedIAFMLModels
+from analytics_snapshot import get_analytics_snapshot
+from intent_matcher import IntentMatcher
+
+DEFAULT_HISTORY_LIMIT = 50  # entries kept verbatim before older turns are folded into a summary
 
 class IAFChatbot:
-    def __init__(self):
-        self.ml_models = AdvancedIAFMLModels()
-        self.ml_models.load_data()
+    # Role-based capabilities (class-level so every session shares one copy)
+    role_capabilities = {
+        'commander': {
+            'access_level': 'strategic',
+            'data_access': ['all_personnel', 'unit_stats', 'readiness', 'operations'],
+            'functions': ['unit_analysis', 'strategic_planning', 'resource_allocation', 'mission_planning']
+        },
+        'hr_manager': {
+            'access_level': 'administrative',
+            'data_access': ['personnel_records', 'performance', 'training', 'career_development'],
+            'functions': ['personnel_management', 'career_planning', 'skill_analysis', 'attrition_analysis']
+        },
+        'medical_officer': {
+            'access_level': 'medical',
+            'data_access': ['medical_records', 'fitness_data', 'wellness_metrics'],
+            'functions': ['health_analysis', 'fitness_tracking', 'wellness_recommendations', 'medical_clearance']
+        },
+        'training_officer': {
+            'access_level': 'training',
+            'data_access': ['training_records', 'skill_gaps', 'performance_metrics'],
+            'functions': ['training_analysis', 'skill_development', 'course_recommendations', 'progress_tracking']
+        },
+        'personnel': {
+            'access_level': 'personal',
+            'data_access': ['own_records', 'career_path', 'training_opportunities'],
+            'functions': ['career_guidance', 'training_requests', 'performance_review', 'wellness_tips']
+        }
+    }
+    
+    # Intent patterns for natural language understanding
+    intent_patterns = {
+        'attrition_analysis': [
+            r'attrition.*risk', r'who.*might.*leave', r'retention.*analysis',
+            r'turnover.*rate', r'personnel.*leaving', r'resignation', r'quit'
+        ],
+        'readiness_assessment': [
+            r'readiness.*score', r'mission.*ready', r'deployment.*status',
+            r'operational.*readiness', r'unit.*preparedness', r'combat.*ready'
+        ],
+        'leadership_evaluation': [
+            r'leadership.*potential', r'promote.*candidate', r'succession.*planning',
+            r'leadership.*assessment', r'next.*leader', r'command.*position'
+        ],
+        'career_guidance': [
+            r'career.*path', r'promotion.*timeline', r'career.*development',
+            r'advancement.*opportunity', r'next.*step', r'rank.*progression'
+        ],
+        'training_recommendations': [
+            r'training.*need', r'skill.*gap', r'course.*recommend',
+            r'development.*program', r'training.*plan', r'certification'
+        ],
+        'health_wellness': [
+            r'health.*status', r'fitness.*level', r'wellness.*check',
+            r'medical.*clearance', r'stress.*level', r'mental.*health'
+        ],
+        'mission_assignment': [
+            r'mission.*suitable', r'assign.*mission', r'deployment.*ready',
+            r'operation.*assignment', r'mission.*capability', r'sortie'
+        ],
+        'unit_statistics': [
+            r'unit.*stats', r'personnel.*count', r'unit.*strength',
+            r'department.*overview', r'team.*composition', r'squadron.*info'
+        ],
+        'iaf_policies': [
+            r'policy', r'regulation', r'rule', r'procedure', r'guideline',
+            r'air.*force.*order', r'afo', r'manual'
+        ],
+        'leave_management': [
+            r'leave.*balance', r'vacation', r'casual.*leave', r'earned.*leave',
+            r'medical.*leave', r'maternity.*leave', r'annual.*leave'
+        ],
+        'posting_transfer': [
+            r'posting', r'transfer', r'station.*change', r'relocation',
+            r'new.*assignment', r'base.*change'
+        ],
+        'pay_allowances': [
+            r'salary', r'pay.*scale', r'allowance', r'increment', r'pension',
+            r'da.*rate', r'hra', r'flying.*pay'
+        ],
+        'equipment_aircraft': [
+            r'aircraft.*type', r'equipment', r'fighter.*jet', r'helicopter',
+            r'transport.*aircraft', r'maintenance.*schedule'
+        ]
+    }
+    intent_matcher = IntentMatcher(intent_patterns, default='general_inquiry')
+
+    def __init__(self, max_history=DEFAULT_HISTORY_LIMIT):
         self.current_user_role = None
         self.current_user_id = None
         self.conversation_history = []
-        
-        # Load pre-trained models
-        try:
-            self.ml_models.load_models()
-        except:
-            print("ML models not found. Please train models first.")
-        
-        # Role-based capabilities
-        self.role_capabilities = {
-            'commander': {
-                'access_level': 'strategic',
-                'data_access': ['all_personnel', 'unit_stats', 'readiness', 'operations'],
-                'functions': ['unit_analysis', 'strategic_planning', 'resource_allocation', 'mission_planning']
-            },
-            'hr_manager': {
-                'access_level': 'administrative',
-                'data_access': ['personnel_records', 'performance', 'training', 'career_development'],
-                'functions': ['personnel_management', 'career_planning', 'skill_analysis', 'attrition_analysis']
-            },
-            'medical_officer': {
-                'access_level': 'medical',
-                'data_access': ['medical_records', 'fitness_data', 'wellness_metrics'],
-                'functions': ['health_analysis', 'fitness_tracking', 'wellness_recommendations', 'medical_clearance']
-            },
-            'training_officer': {
-                'access_level': 'training',
-                'data_access': ['training_records', 'skill_gaps', 'performance_metrics'],
-                'functions': ['training_analysis', 'skill_development', 'course_recommendations', 'progress_tracking']
-            },
-            'personnel': {
-                'access_level': 'personal',
-                'data_access': ['own_records', 'career_path', 'training_opportunities'],
-                'functions': ['career_guidance', 'training_requests', 'performance_review', 'wellness_tips']
-            }
-        }
-        
-        # Intent patterns for natural language understanding
-        self.intent_patterns = {
-            'attrition_analysis': [
-                r'attrition.*risk', r'who.*might.*leave', r'retention.*analysis',
-                r'turnover.*rate', r'personnel.*leaving', r'resignation', r'quit'
-            ],
-            'readiness_assessment': [
-                r'readiness.*score', r'mission.*ready', r'deployment.*status',
-                r'operational.*readiness', r'unit.*preparedness', r'combat.*ready'
-            ],
-            'leadership_evaluation': [
-                r'leadership.*potential', r'promote.*candidate', r'succession.*planning',
-                r'leadership.*assessment', r'next.*leader', r'command.*position'
-            ],
-            'career_guidance': [
-                r'career.*path', r'promotion.*timeline', r'career.*development',
-                r'advancement.*opportunity', r'next.*step', r'rank.*progression'
-            ],
-            'training_recommendations': [
-                r'training.*need', r'skill.*gap', r'course.*recommend',
-                r'development.*program', r'training.*plan', r'certification'
-            ],
-            'health_wellness': [
-                r'health.*status', r'fitness.*level', r'wellness.*check',
-                r'medical.*clearance', r'stress.*level', r'mental.*health'
-            ],
-            'mission_assignment': [
-                r'mission.*suitable', r'assign.*mission', r'deployment.*ready',
-                r'operation.*assignment', r'mission.*capability', r'sortie'
-            ],
-            'unit_statistics': [
-                r'unit.*stats', r'personnel.*count', r'unit.*strength',
-                r'department.*overview', r'team.*composition', r'squadron.*info'
-            ],
-            'iaf_policies': [
-                r'policy', r'regulation', r'rule', r'procedure', r'guideline',
-                r'air.*force.*order', r'afo', r'manual'
-            ],
-            'leave_management': [
-                r'leave.*balance', r'vacation', r'casual.*leave', r'earned.*leave',
-                r'medical.*leave', r'maternity.*leave', r'annual.*leave'
-            ],
-            'posting_transfer': [
-                r'posting', r'transfer', r'station.*change', r'relocation',
-                r'new.*assignment', r'base.*change'
-            ],
-            'pay_allowances': [
-                r'salary', r'pay.*scale', r'allowance', r'increment', r'pension',
-                r'da.*rate', r'hra', r'flying.*pay'
-            ],
-            'equipment_aircraft': [
-                r'aircraft.*type', r'equipment', r'fighter.*jet', r'helicopter',
-                r'transport.*aircraft', r'maintenance.*schedule'
-            ]
-        }
+        self.history_summary = None
+        self.max_history = max_history
         
     def set_user_context(self, role, user_id=None):
         """Set the current user's role and context"""
@@ -112,23 +108,29 @@ class IAFChatbot:
             return False, "Invalid role specified"
         
         return True, f"Welcome! You are now logged in as {role.title()}"
+
+    @property
+    def snapshot(self):
+        """Shared personnel aggregates; rebuilt by the first caller that finds them stale"""
+        return get_analytics_snapshot()
         
     def process_message(self, message):
         """Process user message and generate appropriate response"""
         if not self.current_user_role:
             return "Please specify your role first using set_role command"
         
+        # Detect intent
+        intent = self._detect_intent(message)
+        
         # Add to conversation history
         self.conversation_history.append({
             'timestamp': datetime.now(),
             'role': self.current_user_role,
             'message': message,
-            'type': 'user'
+            'type': 'user',
+            'intent': intent
         })
         
-        # Detect intent
-        intent = self._detect_intent(message)
-        
         # Check role permissions
         if not self._check_permissions(intent):
             response = "You don't have permission to access this information with your current role."
@@ -143,19 +145,36 @@ class IAFChatbot:
             'message': response,
             'type': 'bot'
         })
+        self._trim_history()
         
         return response
+
+    def _trim_history(self):
+        """Fold the oldest turns into history_summary once the history cap is exceeded"""
+        overflow = len(self.conversation_history) - self.max_history
+        if overflow <= 0:
+            return
         
-    def _detect_intent(self, message):
-        """Detect user intent from message"""
-        message_lower = message.lower()
+        dropped = self.conversation_history[:overflow]
+        del self.conversation_history[:overflow]
         
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, message_lower):
-                    return intent
+        if self.history_summary is None:
+            self.history_summary = {
+                'summarized_messages': 0,
+                'since': dropped[0]['timestamp'],
+                'topics': {}
+            }
         
-        return 'general_inquiry'
+        summary = self.history_summary
+        summary['summarized_messages'] += len(dropped)
+        for entry in dropped:
+            intent = entry.get('intent')
+            if intent:
+                summary['topics'][intent] = summary['topics'].get(intent, 0) + 1
+        
+    def _detect_intent(self, message):
+        """Detect user intent from message"""
+        return self.intent_matcher.best(message)
         
     def _check_permissions(self, intent):
         """Check if current role has permission for the intent"""
@@ -221,9 +240,10 @@ class IAFChatbot:
         """Handle attrition risk analysis queries"""
         if self.current_user_role == 'commander':
             # High-level attrition analysis
-            high_risk_count = len(self.ml_models.df[self.ml_models.df['attrition_risk'] == 1])
-            total_personnel = len(self.ml_models.df)
-            risk_percentage = (high_risk_count / total_personnel) * 100
+            snapshot = self.snapshot
+            high_risk_count = snapshot.high_attrition_risk
+            total_personnel = snapshot.total_personnel
+            risk_percentage = snapshot.high_risk_percentage
             
             response = f"""**IAF Attrition Risk Analysis (Strategic Overview)**
             
@@ -302,8 +322,9 @@ class IAFChatbot:
         
     def _handle_readiness_assessment(self, message):
         """Handle readiness assessment queries"""
-        avg_readiness = self.ml_models.df['readiness_score'].mean()
-        high_readiness = len(self.ml_models.df[self.ml_models.df['readiness_score'] > 85])
+        snapshot = self.snapshot
+        avg_readiness = snapshot.avg_readiness
+        high_readiness = snapshot.high_readiness
         
         if self.current_user_role in ['commander', 'training_officer']:
             response = f"""**Operational Readiness Assessment**
@@ -332,7 +353,7 @@ class IAFChatbot:
     def _handle_leadership_evaluation(self, message):
         """Handle leadership evaluation queries"""
         if self.current_user_role in ['commander', 'hr_manager']:
-            high_potential = len(self.ml_models.df[self.ml_models.df['leadership_potential'] == 'high'])
+            high_potential = self.snapshot.high_leadership_potential
             
             response = f"""**Leadership Assessment Summary**
             
@@ -459,15 +480,16 @@ class IAFChatbot:
     def _handle_health_wellness(self, message):
         """Handle health and wellness queries"""
         if self.current_user_role in ['medical_officer', 'personnel']:
-            avg_fitness = self.ml_models.df['fitness_score'].mean()
-            avg_stress = self.ml_models.df['stress_index'].mean()
+            snapshot = self.snapshot
+            avg_fitness = snapshot.avg_fitness
+            avg_stress = snapshot.avg_stress
             
             response = f"""**Health & Wellness Overview**
             
 🏥 **Current Health Metrics:**
 • Average fitness score: {avg_fitness:.1f}/100
 • Average stress index: {avg_stress:.1f}/100
-• Personnel requiring attention: {len(self.ml_models.df[self.ml_models.df['stress_index'] > 70])}
+• Personnel requiring attention: {snapshot.high_stress}
 
 💪 **Wellness Recommendations:**
 • Regular fitness assessments
@@ -495,7 +517,7 @@ class IAFChatbot:
     def _handle_mission_assignment(self, message):
         """Handle mission assignment queries"""
         if self.current_user_role == 'commander':
-            ready_personnel = len(self.ml_models.df[self.ml_models.df['readiness_score'] > 80])
+            ready_personnel = self.snapshot.mission_ready
             
             response = f"""**Mission Assignment Analysis**
             
@@ -523,8 +545,9 @@ class IAFChatbot:
         
     def _handle_unit_statistics(self, message):
         """Handle unit statistics queries"""
-        total_personnel = len(self.ml_models.df)
-        avg_experience = self.ml_models.df['years_of_service'].mean()
+        snapshot = self.snapshot
+        total_personnel = snapshot.total_personnel
+        avg_experience = snapshot.avg_years_of_service
         
         if self.current_user_role in ['commander', 'hr_manager']:
             response = f"""**Unit Statistics Overview**
@@ -871,6 +894,13 @@ You can access your personal information and development opportunities."""
             
         summary = f"**Conversation Summary for {self.current_user_role.title()}**\n\n"
         
+        if self.history_summary:
+            topics = sorted(self.history_summary['topics'].items(), key=lambda item: item[1], reverse=True)
+            summary += f"📜 {self.history_summary['summarized_messages']} earlier messages since {self.history_summary['since'].strftime('%d %b %H:%M')}"
+            if topics:
+                summary += f" (mostly {', '.join(topic.replace('_', ' ') for topic, _ in topics[:3])})"
+            summary += "\n\n"
+        
         for entry in self.conversation_history[-10:]:  # Last 10 entries
             timestamp = entry['timestamp'].strftime("%H:%M")
             if entry['type'] == 'user':
@@ -883,12 +913,13 @@ You can access your personal information and development opportunities."""
     def clear_conversation(self):
         """Clear conversation history"""
         self.conversation_history = []
+        self.history_summary = None
         return "Conversation history cleared."
 
 # API endpoints for integration
 class ChatbotAPI:
-    def __init__(self):
-        self.chatbot = IAFChatbot()
+    def __init__(self, max_history=DEFAULT_HISTORY_LIMIT):
+        self.chatbot = IAFChatbot(max_history=max_history)
         
     def set_user_role(self, role, user_id=None):
         """Set user role for the session"""
@@ -908,6 +939,36 @@ class ChatbotAPI:
         """Clear conversation"""
         message = self.chatbot.clear_conversation()
         return {'message': message}
+        
+    def export_state(self):
+        """JSON-serialisable session state for the persistence tier"""
+        chatbot = self.chatbot
+        summary = None
+        if chatbot.history_summary:
+            summary = dict(chatbot.history_summary, since=chatbot.history_summary['since'].isoformat())
+        
+        return {
+            'role': chatbot.current_user_role,
+            'user_id': chatbot.current_user_id,
+            'history': [dict(entry, timestamp=entry['timestamp'].isoformat()) for entry in chatbot.conversation_history],
+            'summary': summary
+        }
+        
+    @classmethod
+    def from_state(cls, state, max_history=DEFAULT_HISTORY_LIMIT):
+        """Rebuild a session from export_state() output"""
+        api = cls(max_history=max_history)
+        chatbot = api.chatbot
+        chatbot.current_user_role = state.get('role')
+        chatbot.current_user_id = state.get('user_id')
+        chatbot.conversation_history = [
+            dict(entry, timestamp=datetime.fromisoformat(entry['timestamp'])) for entry in state.get('history', [])
+        ]
+        summary = state.get('summary')
+        if summary:
+            chatbot.history_summary = dict(summary, since=datetime.fromisoformat(summary['since']))
+        chatbot._trim_history()
+        return api
 
 if __name__ == "__main__":
     # Test the chatbot
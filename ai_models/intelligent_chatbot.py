@@ -3,8 +3,28 @@ import json
 from datetime import datetime, timedelta
 import random
 
+try:
+    from .intent_matcher import IntentMatcher
+except ImportError:
+    from intent_matcher import IntentMatcher
+
 class IntelligentChatbot:
-    def __init__(self):
+    intent_keywords = {
+        'personnel_search': ['find', 'search', 'who is', 'personnel', 'officer', 'show me'],
+        'statistics': ['how many', 'total', 'count', 'statistics', 'stats', 'numbers'],
+        'performance': ['performance', 'rating', 'score', 'evaluation', 'assessment'],
+        'training': ['training', 'course', 'skill', 'certification', 'learn'],
+        'medical': ['medical', 'health', 'fitness', 'checkup', 'doctor'],
+        'leave': ['leave', 'vacation', 'holiday', 'time off', 'absence'],
+        'prediction': ['predict', 'forecast', 'future', 'trend', 'analysis'],
+        'recommendation': ['recommend', 'suggest', 'advice', 'should', 'best'],
+        'mission': ['mission', 'deployment', 'operation', 'readiness'],
+        'equipment': ['equipment', 'aircraft', 'maintenance', 'vehicle']
+    }
+    intent_matcher = IntentMatcher.from_keywords(intent_keywords)
+
+    def __init__(self, search_index=None):
+        self.search_index = search_index
         self.context = {}
         self.user_role = None
         self.conversation_history = []
@@ -33,24 +53,7 @@ class IntelligentChatbot:
     
     def analyze_intent(self, query):
         """Analyze user query to determine intent"""
-        intents = {
-            'personnel_search': ['find', 'search', 'who is', 'personnel', 'officer', 'show me'],
-            'statistics': ['how many', 'total', 'count', 'statistics', 'stats', 'numbers'],
-            'performance': ['performance', 'rating', 'score', 'evaluation', 'assessment'],
-            'training': ['training', 'course', 'skill', 'certification', 'learn'],
-            'medical': ['medical', 'health', 'fitness', 'checkup', 'doctor'],
-            'leave': ['leave', 'vacation', 'holiday', 'time off', 'absence'],
-            'prediction': ['predict', 'forecast', 'future', 'trend', 'analysis'],
-            'recommendation': ['recommend', 'suggest', 'advice', 'should', 'best'],
-            'mission': ['mission', 'deployment', 'operation', 'readiness'],
-            'equipment': ['equipment', 'aircraft', 'maintenance', 'vehicle']
-        }
-        
-        for intent_type, keywords in intents.items():
-            if any(keyword in query for keyword in keywords):
-                return intent_type
-        
-        return 'general'
+        return self.intent_matcher.best(query)
     
     def generate_response(self, intent, query, personnel_data, system_data):
         """Generate intelligent response based on real data"""
@@ -87,28 +90,39 @@ class IntelligentChatbot:
     
     def handle_personnel_search(self, query, personnel_data):
         """Search personnel based on query"""
-        if not personnel_data:
+        search_terms = self.extract_search_terms(query)
+
+        if self.search_index is not None:
+            if not search_terms:
+                return {
+                    'response': "Who are you looking for? Try a name, rank, unit, base or specialization.",
+                    'data': None,
+                    'suggestions': ['Search by rank', 'Search by unit', 'Search by base']
+                }
+            search = self.search_index.search(' '.join(search_terms), limit=5)
+            results = search['results']
+            total = search['total_count']
+        elif personnel_data:
+            results = [
+                person for person in personnel_data
+                if any(term in person.get('name', '').lower() or
+                       term in person.get('rank', '').lower() or
+                       term in person.get('unit', '').lower()
+                       for term in search_terms)
+            ]
+            total = len(results)
+            results = results[:5]
+        else:
             return {
                 'response': "I don't have access to personnel data right now. Please ensure you're connected to the system.",
                 'data': None,
                 'suggestions': ['Try refreshing the page', 'Check your connection']
             }
-        
-        # Extract search terms
-        search_terms = self.extract_search_terms(query)
-        results = []
-        
-        for person in personnel_data[:20]:  # Limit results
-            if any(term in person.get('name', '').lower() or 
-                   term in person.get('rank', '').lower() or
-                   term in person.get('unit', '').lower() 
-                   for term in search_terms):
-                results.append(person)
-        
+
         if results:
             return {
-                'response': f"Found {len(results)} personnel matching your search:",
-                'data': results[:5],  # Show top 5
+                'response': f"Found {total} personnel matching your search:",
+                'data': results,  # Show top 5
                 'suggestions': ['Show more results', 'Refine search', 'Get detailed info']
             }
         else:
@@ -298,7 +312,8 @@ class IntelligentChatbot:
     def extract_search_terms(self, query):
         """Extract meaningful search terms from query"""
         # Remove common words
-        stop_words = ['find', 'search', 'show', 'me', 'who', 'is', 'the', 'a', 'an', 'and', 'or']
+        stop_words = ['find', 'search', 'show', 'me', 'who', 'is', 'the', 'a', 'an', 'and', 'or',
+                      'personnel', 'people', 'list', 'all', 'from', 'with', 'named', 'called']
         words = re.findall(r'\b\w+\b', query.lower())
         return [word for word in words if word not in stop_words and len(word) > 2]
     
@@ -0,0 +1,161 @@
+import re
+from collections import defaultdict
+
+QUANTIFIERS = '?*{'
+LITERAL_CHARS = re.compile(r'[\w ]*')
+LITERAL_ALTERNATIVES = re.compile(r'\(([\w ]+(?:\|[\w ]+)*)\)')
+
+
+def _leading_literals(pattern):
+    """Literal strings one of which every match of the pattern must start with, or None.
+
+    Handles the two shapes used by our intent tables: a plain literal prefix
+    (r'attrition.*risk') and a leading group of literal alternatives
+    (r'(show|get|find).*(personnel|officer)').
+    """
+    group = LITERAL_ALTERNATIVES.match(pattern)
+    if group:
+        if pattern[group.end():group.end() + 1] in QUANTIFIERS and group.end() < len(pattern):
+            return None
+        return group.group(1).split('|')
+
+    literal = LITERAL_CHARS.match(pattern).group()
+    if literal and pattern[len(literal):len(literal) + 1] in QUANTIFIERS and len(literal) < len(pattern):
+        # The last character is optional, so it is not part of the guaranteed prefix
+        literal = literal[:-1]
+    return [literal] if literal else None
+
+
+def _trie_pattern(node):
+    """Regex for a character trie; shared prefixes are tested once per position"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        body = '(?:' + body + ')?'
+    return body
+
+
+class IntentMatcher:
+    """Single-pass intent matcher shared by the chatbots and the voice system.
+
+    The leading literal of every pattern is compiled into one trie-shaped
+    regex, so a message is scanned once to find every position where some
+    pattern could start. Only the patterns owning those literals are then
+    checked, anchored at that position, with their precompiled regex;
+    plain keywords need no check at all. Each matched pattern adds one to
+    its intent's score; the best intent is the highest score, ties going to
+    the intent declared first (the order the old first-match loops used).
+    Patterns without a usable literal prefix fall back to a compiled search.
+    """
+
+    def __init__(self, intent_patterns=None, default='general'):
+        self.default = default
+        self.intents = []
+        self._pattern_intent = []
+        self._pattern_regex = []
+        self._trigger_patterns = defaultdict(list)
+        self._unanchored = []
+
+        for intent, patterns in (intent_patterns or {}).items():
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            for pattern in patterns:
+                self._add(intent, pattern, _leading_literals(pattern))
+
+        self._compile()
+
+    @classmethod
+    def from_keywords(cls, intent_keywords, default='general'):
+        """Build a matcher from plain substring keywords (same semantics as `keyword in text`)"""
+        matcher = cls(default=default)
+        for intent, keywords in intent_keywords.items():
+            for keyword in keywords:
+                matcher._add(intent, None, [keyword])
+        matcher._compile()
+        return matcher
+
+    def _add(self, intent, pattern, triggers):
+        if intent not in self.intents:
+            self.intents.append(intent)
+
+        pattern_id = len(self._pattern_intent)
+        self._pattern_intent.append(intent)
+        # A pattern of None is a bare keyword: finding its trigger is the match
+        self._pattern_regex.append(re.compile(pattern) if pattern is not None else None)
+
+        if triggers:
+            for trigger in triggers:
+                self._trigger_patterns[trigger].append(pattern_id)
+        else:
+            self._unanchored.append(pattern_id)
+
+    def _compile(self):
+        self._priority = {intent: index for index, intent in enumerate(self.intents)}
+
+        trie = {}
+        for trigger in self._trigger_patterns:
+            node = trie
+            for char in trigger:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        # The scan reports the longest trigger at each position, so each trigger
+        # also owns the patterns of every shorter trigger that is its prefix
+        self._candidates = {
+            trigger: [
+                pattern_id
+                for other, pattern_ids in self._trigger_patterns.items() if trigger.startswith(other)
+                for pattern_id in pattern_ids
+            ]
+            for trigger in self._trigger_patterns
+        }
+        self._scanner = re.compile('(?=(' + _trie_pattern(trie) + '))') if trie else None
+        self._keywords_only = all(regex is None for regex in self._pattern_regex)
+
+    def scores(self, text):
+        """Matched pattern count per intent for the text; intents with no hits are omitted"""
+        text = text.lower()
+        matched = set()
+        pattern_regex = self._pattern_regex
+
+        if self._scanner is not None and self._keywords_only:
+            # Keyword tables need no positions, only which triggers occurred
+            for trigger in set(self._scanner.findall(text)):
+                matched.update(self._candidates[trigger])
+        elif self._scanner is not None:
+            candidates = self._candidates
+            for hit in self._scanner.finditer(text):
+                position = hit.start()
+                for pattern_id in candidates[hit.group(1)]:
+                    if pattern_id in matched:
+                        continue
+                    regex = pattern_regex[pattern_id]
+                    if regex is None or regex.match(text, position):
+                        matched.add(pattern_id)
+
+        for pattern_id in self._unanchored:
+            if pattern_regex[pattern_id].search(text):
+                matched.add(pattern_id)
+
+        scores = {}
+        pattern_intent = self._pattern_intent
+        for pattern_id in matched:
+            intent = pattern_intent[pattern_id]
+            scores[intent] = scores.get(intent, 0) + 1
+        return scores
+
+    def match(self, text):
+        """Return (best_intent, scores) for the text"""
+        scores = self.scores(text)
+        if not scores:
+            return self.default, scores
+
+        priority = self._priority
+        best = max(scores, key=lambda intent: (scores[intent], -priority[intent]))
+        return best, scores
+
+    def best(self, text):
+        return self.match(text)[0]
@@ -0,0 +1,89 @@
+import importlib
+import importlib.util
+import threading
+
+# capability -> modules it needs; the warm-up command preloads by capability
+CAPABILITIES = {
+    'speech': ['speech_recognition', 'pyttsx3', 'googletrans'],
+    'vision': ['cv2', 'face_recognition'],
+    'deep_learning': ['tensorflow'],
+    'ml': ['sklearn.ensemble', 'sklearn.neural_network', 'sklearn.cluster', 'sklearn.preprocessing',
+           'sklearn.model_selection', 'sklearn.metrics', 'xgboost'],
+}
+
+# import name -> pip package, for the error raised when a module is missing
+INSTALL_NAMES = {
+    'speech_recognition': 'SpeechRecognition',
+    'cv2': 'opencv-python',
+    'sklearn': 'scikit-learn',
+}
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name, capability=None):
+        self._name = name
+        self._capability = capability
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    try:
+                        self._module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        package = INSTALL_NAMES.get(self._name.split('.')[0], self._name.split('.')[0])
+                        feature = f" for the '{self._capability}' capability" if self._capability else ''
+                        raise ImportError(
+                            f"{self._name} is required{feature}; install it with 'pip install {package}'"
+                        ) from e
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name, capability=None):
+    """Shared LazyModule for a module name; nothing is imported until it is used"""
+    with _registry_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name, capability)
+        return module
+
+
+def is_available(name):
+    """Whether a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def preload(*capabilities):
+    """Import every module of the given capabilities (all when none given); returns name -> error or None"""
+    results = {}
+    for capability in capabilities or CAPABILITIES:
+        if capability not in CAPABILITIES:
+            raise ValueError(f"Unknown capability '{capability}'. Must be one of: {', '.join(CAPABILITIES)}")
+        for name in CAPABILITIES[capability]:
+            try:
+                lazy_import(name, capability)._load()
+                results[name] = None
+            except ImportError as e:
+                results[name] = str(e)
+    return results
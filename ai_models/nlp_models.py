@@ -1,17 +1,134 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.sentiment import SentimentIntensityAnalyzer
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from sklearn.utils import murmurhash3_32
+from nltk.sentiment import SentimentIntensityAnalyzer
 from sklearn.cluster import KMeans
 import joblib
 import re
 from datetime import datetime
 import random
 
+try:
+    from .sentiment_service import ContentHashCache, content_hash
+except ImportError:
+    from sentiment_service import ContentHashCache, content_hash
+
+
+def _top_indices(scores, top_n):
+    """Indices of the top_n scores, highest first, without sorting the whole array"""
+    top_n = min(top_n, len(scores))
+    if top_n == 0:
+        return np.array([], dtype=int)
+    candidates = np.argpartition(scores, -top_n)[-top_n:]
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+class StreamingThemeExtractor:
+    """One-pass theme extraction over feedback chunks, overall and per group.
+
+    Text is hashed rather than fitted to a vocabulary, so chunks can be fed as
+    they are read. Memory is bounded by n_features, not by the corpus or its
+    vocabulary: the totals are n_features long and term_names keeps one
+    token per hashed column (group sums add one sparse row per group value).
+    Each document's term counts are L1-normalised and summed per group value;
+    document frequencies are summed over the whole stream. A theme's score is
+    its mean term frequency within the group times its smoothed idf.
+    """
+
+    def __init__(self, group_fields=('unit', 'rank', 'feedback_type'), n_features=2 ** 18, stop_words='english'):
+        self.group_fields = tuple(group_fields)
+        self.n_features = n_features
+        self.analyzer = CountVectorizer(stop_words=stop_words).build_analyzer()
+        self.hasher = FeatureHasher(n_features=n_features, input_type='string', alternate_sign=False)
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self.term_sums = np.zeros(n_features)
+        self.group_sums = {field: {} for field in self.group_fields}
+        self.group_counts = {field: {} for field in self.group_fields}
+        self.term_names = {}  # hashed column -> first token seen there (at most n_features entries)
+
+    def _record_names(self, token_lists):
+        if len(self.term_names) >= self.n_features:
+            return
+        for token in set().union(*token_lists):
+            self.term_names.setdefault(abs(murmurhash3_32(token, seed=0)) % self.n_features, token)
+
+    def partial_fit(self, texts, groups=None):
+        """Add a chunk of texts; groups maps each group field to a value per text"""
+        token_lists = [self.analyzer(text) if isinstance(text, str) else [] for text in texts]
+        if not token_lists:
+            return self
+        self._record_names(token_lists)
+
+        counts = self.hasher.transform(token_lists).tocsr()
+        counts.sum_duplicates()
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+
+        totals = np.asarray(counts.sum(axis=1)).ravel()
+        totals[totals == 0] = 1
+        term_frequency = sparse.diags(1.0 / totals) @ counts
+        self.term_sums += np.asarray(term_frequency.sum(axis=0)).ravel()
+
+        for field in self.group_fields:
+            values = (groups or {}).get(field)
+            if values is None:
+                continue
+            codes, uniques = pd.factorize(pd.Series(values).fillna('Unknown').astype(str))
+            # One sparse product sums every document into its group's row
+            membership = sparse.csr_matrix(
+                (np.ones(len(codes)), (codes, np.arange(len(codes)))), shape=(len(uniques), len(codes))
+            )
+            chunk_sums = (membership @ term_frequency).tocsr()
+            chunk_counts = np.bincount(codes, minlength=len(uniques))
+            sums = self.group_sums[field]
+            group_counts = self.group_counts[field]
+            for code, value in enumerate(uniques):
+                row = chunk_sums.getrow(code)
+                sums[value] = sums[value] + row if value in sums else row
+                group_counts[value] = group_counts.get(value, 0) + int(chunk_counts[code])
+        return self
+
+    def partial_fit_records(self, records, text_field='feedback_text'):
+        """Add a chunk given as a DataFrame or a list of dicts"""
+        frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+        if frame.empty:
+            return self
+        groups = {field: frame[field].tolist() for field in self.group_fields if field in frame}
+        return self.partial_fit(frame[text_field].tolist(), groups)
+
+    def _idf(self):
+        return np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+
+    def _themes(self, indices, scores, top_n):
+        return [self.term_names.get(int(indices[i]), f'term_{indices[i]}') for i in _top_indices(scores, top_n)]
+
+    def top_themes(self, top_n=10):
+        """{'overall': [...], '<field>': {value: [...]}} of the highest scoring themes"""
+        if not self.n_documents:
+            return {'overall': [], **{field: {} for field in self.group_fields}}
+
+        idf = self._idf()
+        overall = self.term_sums / self.n_documents * idf
+        nonzero = np.flatnonzero(overall)
+        themes = {'overall': self._themes(nonzero, overall[nonzero], top_n)}
+
+        for field in self.group_fields:
+            themes[field] = {}
+            for value, row in self.group_sums[field].items():
+                scores = row.data / self.group_counts[field][value] * idf[row.indices]
+                themes[field][value] = self._themes(row.indices, scores, top_n)
+        return themes
+
+
 class IAFNLPModels:
     def __init__(self):
         self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
         self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.sentiment_cache = ContentHashCache()
         self.models = {}
         
     def generate_training_feedback(self, num_records=1000):
@@ -75,21 +192,40 @@ class IAFNLPModels:
         except:
             return {'positive': 0.5, 'negative': 0.3, 'neutral': 0.2, 'compound': 0.0}
     
+    def analyze_sentiment_batch(self, texts):
+        """Analyze sentiment of many texts, scoring each distinct text once"""
+        results = []
+        for text in texts:
+            key = content_hash(text)
+            sentiment = self.sentiment_cache.get(key)
+            if sentiment is None:
+                sentiment = self.analyze_sentiment(text)
+                self.sentiment_cache.put(key, sentiment)
+            results.append(dict(sentiment))  # callers get their own copy, never the cached dict
+        return results
+    
     def extract_key_themes(self, feedback_texts):
         """Extract key themes from feedback using TF-IDF"""
         try:
             tfidf_matrix = self.vectorizer.fit_transform(feedback_texts)
             feature_names = self.vectorizer.get_feature_names_out()
             
-            # Get top terms
-            mean_scores = np.mean(tfidf_matrix.toarray(), axis=0)
-            top_indices = mean_scores.argsort()[-20:][::-1]
+            # Get top terms (column means straight from the CSR matrix, never densified)
+            mean_scores = np.asarray(tfidf_matrix.mean(axis=0)).ravel()
+            top_indices = _top_indices(mean_scores, 20)
             
             themes = [feature_names[i] for i in top_indices]
             return themes
         except:
             return ['leadership', 'performance', 'training', 'technical', 'communication']
     
+    def extract_group_themes(self, feedback_chunks, group_fields=('unit', 'rank', 'feedback_type'), top_n=10):
+        """Top themes overall and per unit/rank/feedback type, in one pass over feedback chunks"""
+        extractor = StreamingThemeExtractor(group_fields)
+        for chunk in feedback_chunks:
+            extractor.partial_fit_records(chunk)
+        return extractor.top_themes(top_n)
+    
     def classify_feedback_category(self, text):
         """Classify feedback into categories"""
         text_lower = text.lower()
@@ -121,7 +257,7 @@ class IAFNLPModels:
             }
         
         # Analyze sentiment
-        sentiments = [self.analyze_sentiment(fb) for fb in officer_feedback]
+        sentiments = self.analyze_sentiment_batch(officer_feedback)
         avg_sentiment = np.mean([s['compound'] for s in sentiments])
         
         # Determine overall sentiment
@@ -164,10 +300,10 @@ class IAFNLPModels:
             }
         
         # Sentiment analysis over time
-        sentiments = []
-        for _, row in unit_feedback_data.iterrows():
-            sentiment = self.analyze_sentiment(row['feedback_text'])
-            sentiments.append(sentiment['compound'])
+        sentiments = [
+            sentiment['compound']
+            for sentiment in self.analyze_sentiment_batch(unit_feedback_data['feedback_text'].tolist())
+        ]
         
         avg_sentiment = np.mean(sentiments)
         sentiment_trend = 'improving' if avg_sentiment > 0.1 else 'declining' if avg_sentiment < -0.1 else 'stable'
@@ -1,16 +1,39 @@
-import speech_recognition as sr
-import pyttsx3
-from googletrans import Translator
-import re
 import json
 from datetime import datetime
 import numpy as np
 
+try:
+    from .intent_matcher import IntentMatcher
+    from .lazy_imports import lazy_import
+    from .sentiment_service import get_sentiment_service
+except ImportError:
+    from intent_matcher import IntentMatcher
+    from lazy_imports import lazy_import
+    from sentiment_service import get_sentiment_service
+
+# Speech and translation libraries are imported on first use, not at module load
+sr = lazy_import('speech_recognition', 'speech')
+pyttsx3 = lazy_import('pyttsx3', 'speech')
+googletrans = lazy_import('googletrans', 'speech')
+
 class VoiceNLPSystem:
+    # Command patterns
+    command_patterns = {
+        'personnel_info': r'(show|get|find).*(personnel|soldier|officer).*(details|info|record)',
+        'leave_request': r'(apply|request|submit).*(leave|vacation|holiday)',
+        'training_status': r'(check|show|get).*(training|course|certification)',
+        'medical_record': r'(show|get|check).*(medical|health|fitness)',
+        'mission_status': r'(check|show|get).*(mission|operation|deployment)',
+        'equipment_status': r'(check|show|get).*(equipment|aircraft|vehicle)',
+        'weather_info': r'(weather|forecast|conditions)',
+        'base_info': r'(base|station|facility).*(info|details|status)'
+    }
+    command_matcher = IntentMatcher(command_patterns, default='unknown')
+
     def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
-        self.translator = Translator()
+        self._recognizer = None
+        self._tts_engine = None
+        self._translator = None
         self.supported_languages = {
             'en': 'English',
             'hi': 'Hindi', 
@@ -20,8 +43,26 @@ class VoiceNLPSystem:
             'mr': 'Marathi',
             'gu': 'Gujarati'
         }
-        self.setup_voice()
-    
+
+    @property
+    def recognizer(self):
+        if self._recognizer is None:
+            self._recognizer = sr.Recognizer()
+        return self._recognizer
+
+    @property
+    def tts_engine(self):
+        if self._tts_engine is None:
+            self._tts_engine = pyttsx3.init()
+            self.setup_voice()
+        return self._tts_engine
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            self._translator = googletrans.Translator()
+        return self._translator
+
     def setup_voice(self):
         """Configure text-to-speech settings"""
         voices = self.tts_engine.getProperty('voices')
@@ -49,6 +90,9 @@ class VoiceNLPSystem:
                 'language': language,
                 'timestamp': datetime.now().isoformat()
             }
+        except ImportError as e:
+            # checked first: the clauses below would otherwise try to import the missing module again
+            return {'success': False, 'error': str(e)}
         except sr.UnknownValueError:
             return {'success': False, 'error': 'Could not understand audio'}
         except sr.RequestError as e:
@@ -91,24 +135,10 @@ class VoiceNLPSystem:
     
     def process_voice_command(self, command_text, user_role='personnel'):
         """Process natural language commands"""
-        command_lower = command_text.lower()
-        
-        # Command patterns
-        patterns = {
-            'personnel_info': r'(show|get|find).*(personnel|soldier|officer).*(details|info|record)',
-            'leave_request': r'(apply|request|submit).*(leave|vacation|holiday)',
-            'training_status': r'(check|show|get).*(training|course|certification)',
-            'medical_record': r'(show|get|check).*(medical|health|fitness)',
-            'mission_status': r'(check|show|get).*(mission|operation|deployment)',
-            'equipment_status': r'(check|show|get).*(equipment|aircraft|vehicle)',
-            'weather_info': r'(weather|forecast|conditions)',
-            'base_info': r'(base|station|facility).*(info|details|status)'
-        }
-        
-        # Match command patterns
-        for intent, pattern in patterns.items():
-            if re.search(pattern, command_lower):
-                return self.execute_command(intent, command_text, user_role)
+        # Match command patterns in a single scan
+        intent = self.command_matcher.best(command_text)
+        if intent != 'unknown':
+            return self.execute_command(intent, command_text, user_role)
         
         # Default response
         return {
@@ -170,33 +200,8 @@ class VoiceNLPSystem:
     
     def sentiment_analysis(self, text):
         """Analyze sentiment of personnel communications"""
-        # Simple sentiment analysis (in production, use advanced NLP models)
-        positive_words = ['good', 'great', 'excellent', 'happy', 'satisfied', 'motivated', 'proud']
-        negative_words = ['bad', 'terrible', 'unhappy', 'frustrated', 'stressed', 'worried', 'concerned']
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        
-        if positive_count > negative_count:
-            sentiment = 'positive'
-            score = min(0.8 + (positive_count * 0.1), 1.0)
-        elif negative_count > positive_count:
-            sentiment = 'negative'
-            score = max(0.2 - (negative_count * 0.1), 0.0)
-        else:
-            sentiment = 'neutral'
-            score = 0.5
-        
-        return {
-            'sentiment': sentiment,
-            'score': score,
-            'confidence': 0.75,
-            'keywords': {
-                'positive': [word for word in positive_words if word in text_lower],
-                'negative': [word for word in negative_words if word in text_lower]
-            }
-        }
+        # Simple lexicon sentiment (in production, use advanced NLP models)
+        return get_sentiment_service().analyze(text)
     
     def get_voice_interface_status(self):
         """Get status of voice interface components"""
@@ -0,0 +1,180 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+DEFAULT_PIVOTS = 64
+DEFAULT_TIME_BUDGET = 2.0  # seconds spent sampling betweenness pivots
+
+
+class OrgGraph:
+    """Personnel linked through the units they belong to, stored as a sparse bipartite graph
+
+    Each person gets one edge to the hub node of every unit they belong to.
+    Two personnel are colleagues when they share a hub, so the pairwise edges
+    are never built. A unit of n people needs n edges here, not n(n-1)/2.
+    Node indices 0..N-1 are personnel and N..N+G-1 are unit hubs.
+    """
+
+    def __init__(self, ids, membership, groups):
+        self.ids = np.asarray(ids)
+        self.groups = list(groups)
+        self.membership = membership.tocsr()
+        self.n_personnel, self.n_groups = self.membership.shape
+        self.adjacency = sparse.bmat([[None, self.membership], [self.membership.T, None]], format='csr')
+        self._is_person = np.zeros(self.adjacency.shape[0])
+        self._is_person[:self.n_personnel] = 1
+        self._degrees = None
+
+    @classmethod
+    def from_dataframe(cls, personnel_df, group_columns=('unit',), id_column='id'):
+        """Build the graph from roster columns; every non-empty value in group_columns is a membership
+
+        Each (column, value) pair is its own hub: the same name in 'unit' and
+        'current_posting' is two groups. With several columns the groups are
+        labelled 'column=value', with one just the value.
+        """
+        columns = [column for column in group_columns if column in personnel_df.columns]
+        n = len(personnel_df)
+        if not columns:
+            return cls(personnel_df[id_column].to_numpy(), sparse.csr_matrix((n, 0)), [])
+
+        codes, groups = [], []
+        for column in columns:
+            column_codes, values = pd.factorize(personnel_df[column])
+            codes.append(np.where(column_codes >= 0, column_codes + len(groups), -1))
+            groups.extend(values if len(columns) == 1 else [f'{column}={value}' for value in values])
+        codes = np.concatenate(codes)
+        rows = np.tile(np.arange(n), len(columns))
+        keep = codes >= 0
+        membership = sparse.csr_matrix((np.ones(keep.sum()), (rows[keep], codes[keep])), shape=(n, len(groups)))
+        return cls(personnel_df[id_column].to_numpy(), membership, groups)
+
+    def degrees(self):
+        """Colleagues per person, counted from unit sizes rather than edges
+
+        Personnel with the same set of units have the same colleagues, so the
+        union of their units is sized once per distinct set. The sets are read
+        from the CSR row indices; no dense person x unit matrix is built.
+        """
+        if self._degrees is None:
+            if not self.n_personnel:
+                self._degrees = np.zeros(0, dtype=np.int64)
+            elif self.n_groups == 0:
+                self._degrees = np.zeros(self.n_personnel, dtype=np.int64)
+            else:
+                membership = self.membership.sorted_indices()
+                indptr, indices = membership.indptr, membership.indices
+                signatures = [indices[start:end].tobytes() for start, end in zip(indptr[:-1], indptr[1:])]
+                inverse, unique = pd.factorize(pd.Series(signatures))
+                counts = np.bincount(inverse, minlength=len(unique))
+                first = np.zeros(len(unique), dtype=np.int64)
+                first[inverse[::-1]] = np.arange(self.n_personnel)[::-1]
+                units = (membership[first] != 0).astype(np.int64)
+                # People with no unit have an empty row, so they reach nobody
+                overlaps = ((units @ units.T) != 0).astype(np.int64)
+                reach = overlaps @ counts
+                self._degrees = np.maximum(reach - 1, 0)[inverse]
+        return self._degrees
+
+    def degree_centrality(self):
+        """Fraction of the other personnel each person is directly connected to"""
+        if self.n_personnel < 2:
+            return np.ones(self.n_personnel, dtype=float)
+        return self.degrees() / (self.n_personnel - 1)
+
+    def edge_count(self):
+        """Edges of the person-to-person graph the hubs stand in for"""
+        return int(self.degrees().sum() // 2)
+
+    def density(self):
+        n = self.n_personnel
+        if n < 2:
+            return 0.0
+        return 2 * self.edge_count() / (n * (n - 1))
+
+    def betweenness(self, pivots=DEFAULT_PIVOTS, time_budget=DEFAULT_TIME_BUDGET, seed=42):
+        """Normalized betweenness over person-to-person shortest paths, estimated from sampled pivots
+
+        Runs Brandes' accumulation from randomly chosen personnel (pivots)
+        until either all pivots are done or time_budget seconds have passed,
+        then scales the totals by N / pivots used. pivots=None or
+        time_budget=None removes that limit. With every person as a pivot the
+        result is exact. Returns (personnel scores, unit hub scores, pivots used).
+        """
+        n = self.n_personnel
+        totals = np.zeros(self.adjacency.shape[0])
+        order = np.random.default_rng(seed).permutation(n)
+        if pivots is not None:
+            order = order[:pivots]
+
+        started = time.perf_counter()
+        used = 0
+        for source in order:
+            self._accumulate(source, totals)
+            used += 1
+            if time_budget is not None and time.perf_counter() - started > time_budget:
+                break
+
+        if used and n > 2:
+            totals *= n / used / ((n - 1) * (n - 2))
+        return totals[:n], totals[n:], used
+
+    def _accumulate(self, source, totals):
+        """One Brandes pass: level-synchronous BFS counting shortest paths, then dependencies back up"""
+        adjacency = self.adjacency
+        sigma = np.zeros(adjacency.shape[0])
+        sigma[source] = 1
+        seen = np.zeros(adjacency.shape[0], dtype=bool)
+        seen[source] = True
+        levels = [np.array([source])]
+
+        while True:
+            frontier = levels[-1]
+            reach = adjacency[frontier].T @ sigma[frontier]
+            new = np.flatnonzero((reach > 0) & ~seen)
+            if not new.size:
+                break
+            seen[new] = True
+            sigma[new] = reach[new]
+            levels.append(new)
+
+        # Only personnel count as path endpoints; hubs pass dependency through
+        delta = np.zeros(adjacency.shape[0])
+        coefficient = np.zeros(adjacency.shape[0])
+        for depth in range(len(levels) - 1, 0, -1):
+            successors, predecessors = levels[depth], levels[depth - 1]
+            coefficient[successors] = (self._is_person[successors] + delta[successors]) / sigma[successors]
+            delta[predecessors] = sigma[predecessors] * (adjacency[predecessors] @ coefficient)
+            coefficient[successors] = 0
+        delta[source] = 0
+        totals += delta
+
+    def top(self, scores, limit=10):
+        """Highest-scoring personnel as (id, score) pairs; ties keep roster order"""
+        best = np.argsort(-scores, kind='stable')[:limit]
+        return [(self.ids[i].item() if hasattr(self.ids[i], 'item') else self.ids[i], float(scores[i]))
+                for i in best]
+
+    def unit_connectivity(self, hub_betweenness=None):
+        """Per-unit size, internal links, members shared with other units and which units they link to"""
+        membership = self.membership
+        sizes = np.asarray(membership.sum(axis=0)).ravel().astype(np.int64)
+        shared_counts = (membership.T @ membership).toarray().astype(np.int64)
+        multi_unit = np.asarray(membership.sum(axis=1)).ravel() > 1
+        shared_members = np.asarray(membership[multi_unit].sum(axis=0)).ravel().astype(np.int64)
+
+        connectivity = {}
+        for g, group in enumerate(self.groups):
+            linked = {self.groups[other]: int(shared_counts[g, other])
+                      for other in np.flatnonzero(shared_counts[g]) if other != g}
+            connectivity[group] = {
+                'personnel': int(sizes[g]),
+                'internal_links': int(sizes[g] * (sizes[g] - 1) // 2),
+                'shared_personnel': int(shared_members[g]),
+                'linked_units': linked
+            }
+            if hub_betweenness is not None:
+                connectivity[group]['betweenness'] = float(hub_betweenness[g])
+        return connectivity
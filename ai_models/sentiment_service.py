@@ -0,0 +1,208 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'happy', 'satisfied', 'motivated', 'proud']
+NEGATIVE_WORDS = ['bad', 'terrible', 'unhappy', 'frustrated', 'stressed', 'worried', 'concerned']
+
+TOKEN_RE = re.compile(r'\w+')
+DEFAULT_CACHE_SIZE = 100000
+MAX_BATCH_SIZE = 10000  # texts per request to the batch endpoint
+# Uncached texts before a batch is worth shipping to worker processes; kept
+# below MAX_BATCH_SIZE so large API batches reach the pool
+PARALLEL_THRESHOLD = 5000
+
+
+def build_lexicon(positive_words=POSITIVE_WORDS, negative_words=NEGATIVE_WORDS):
+    """word -> polarity (+1 / -1) lookup"""
+    lexicon = {word: 1 for word in positive_words}
+    lexicon.update({word: -1 for word in negative_words})
+    return lexicon
+
+
+def content_hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def score_text(text, lexicon):
+    """Sentiment for one text: tokenized once, lexicon hits found by set intersection"""
+    hits = lexicon.keys() & set(TOKEN_RE.findall(text.lower()))
+    positive = sorted(word for word in hits if lexicon[word] > 0)
+    negative = sorted(word for word in hits if lexicon[word] < 0)
+
+    if len(positive) > len(negative):
+        sentiment = 'positive'
+        score = min(0.8 + (len(positive) * 0.1), 1.0)
+    elif len(negative) > len(positive):
+        sentiment = 'negative'
+        score = max(0.2 - (len(negative) * 0.1), 0.0)
+    else:
+        sentiment = 'neutral'
+        score = 0.5
+
+    return {
+        'sentiment': sentiment,
+        'score': score,
+        'confidence': 0.75,
+        'keywords': {'positive': positive, 'negative': negative}
+    }
+
+
+def _copy_result(result):
+    """Caller's own copy of a (possibly cached) result, so edits cannot leak into the cache"""
+    return {**result, 'keywords': {polarity: list(words) for polarity, words in result['keywords'].items()}}
+
+
+_worker_lexicon = None
+
+
+def _init_worker(lexicon):
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _score_chunk(texts):
+    return [score_text(text, _worker_lexicon) for text in texts]
+
+
+class ContentHashCache:
+    """Thread-safe LRU cache keyed by a hash of the text, so large texts are not kept as keys"""
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_many(self, keys):
+        """key -> value for the keys that are cached, under one lock acquisition"""
+        found = {}
+        with self._lock:
+            entries = self._entries
+            for key in keys:
+                value = entries.get(key)
+                if value is not None:
+                    entries.move_to_end(key)
+                    found[key] = value
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+class SentimentService:
+    """Batched, cached lexicon sentiment scoring for personnel communications.
+
+    Each text is tokenized once and matched against the lexicon with a set
+    intersection. Results are cached by content hash (callers get copies);
+    duplicate texts in a batch are scored once. Batches with more than parallel_threshold
+    uncached texts are split across a process pool (the scoring is pure
+    Python, so threads would not help).
+    """
+
+    def __init__(self, lexicon=None, cache_size=DEFAULT_CACHE_SIZE, workers=None,
+                 parallel_threshold=PARALLEL_THRESHOLD):
+        self.lexicon = lexicon or build_lexicon()
+        self.cache = ContentHashCache(cache_size)
+        self.workers = os.cpu_count() if workers is None else workers
+        self.parallel_threshold = parallel_threshold
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def analyze(self, text):
+        key = content_hash(text)
+        result = self.cache.get(key)
+        if result is None:
+            result = score_text(text, self.lexicon)
+            self.cache.put(key, result)
+        return _copy_result(result)
+
+    def analyze_batch(self, texts):
+        """Score many texts; results are returned in input order"""
+        keys = [content_hash(text) for text in texts]
+        distinct = dict(zip(keys, texts))
+        results = self.cache.get_many(list(distinct))
+
+        pending_keys = [key for key in distinct if key not in results]
+        if pending_keys:
+            scored = self._score_many([distinct[key] for key in pending_keys])
+            self.cache.put_many(zip(pending_keys, scored))
+            results.update(zip(pending_keys, scored))
+
+        return [_copy_result(results[key]) for key in keys]
+
+    def _score_many(self, texts):
+        if self.workers and self.workers > 1 and len(texts) >= self.parallel_threshold:
+            chunk_size = -(-len(texts) // (self.workers * 4))
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            scored = []
+            for chunk_result in self._get_executor().map(_score_chunk, chunks):
+                scored.extend(chunk_result)
+            return scored
+        return [score_text(text, self.lexicon) for text in texts]
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                # Spawned, not forked: web processes run threads whose locks a fork would copy mid-use
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker, initargs=(self.lexicon,)
+                )
+            return self._executor
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def stats(self):
+        return {'workers': self.workers, 'parallel_threshold': self.parallel_threshold, 'cache': self.cache.stats()}
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_sentiment_service():
+    """Process-wide service shared by the API and VoiceNLPSystem"""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                _default_service = SentimentService()
+    return _default_service
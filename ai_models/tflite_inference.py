@@ -0,0 +1,112 @@
+import os
+import threading
+
+import numpy as np
+
+try:
+    from .lazy_imports import is_available, lazy_import
+    from .training_data import batches
+except ImportError:
+    from lazy_imports import is_available, lazy_import
+    from training_data import batches
+
+tf = lazy_import('tensorflow', 'deep_learning')
+
+QUANTIZATION_MODES = ('none', 'dynamic', 'int8')
+
+
+def representative_dataset(name, samples=200, data_dir=None):
+    """Calibration inputs for int8 quantization: single float32 samples from the training data"""
+    def generate():
+        seen = 0
+        for x, _ in batches(name, data_dir, batch_size=32):
+            for sample in x:
+                yield [sample[None, ...]]
+                seen += 1
+                if seen >= samples:
+                    return
+    return generate
+
+
+def export_tflite(model, path, name=None, quantization='dynamic', data_dir=None, saved_model_dir=None):
+    """Convert a trained Keras model to a .tflite file; returns its size in bytes
+
+    dynamic: weights stored as int8, activations computed in float.
+    int8: weights and activations quantized, calibrated on representative
+    samples of the named training dataset; inputs and outputs stay float32.
+    When saved_model_dir is given the model is also written as a SavedModel
+    and converted from there.
+    """
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"quantization must be one of: {', '.join(QUANTIZATION_MODES)}")
+
+    if saved_model_dir:
+        tf.saved_model.save(model, saved_model_dir)
+        converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+    else:
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if quantization != 'none':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'int8':
+        if name is None:
+            raise ValueError('int8 quantization needs the dataset name for calibration')
+        converter.representative_dataset = representative_dataset(name, data_dir=data_dir)
+        # Fall back to float kernels for ops without an int8 implementation (e.g. some LSTM variants)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8, tf.lite.OpsSet.TFLITE_BUILTINS]
+
+    flatbuffer = converter.convert()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(flatbuffer)
+    return len(flatbuffer)
+
+
+def _interpreter_class():
+    # The standalone runtime is a few MB against TensorFlow's hundreds; prefer it when installed
+    if is_available('tflite_runtime'):
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    return tf.lite.Interpreter
+
+
+class TFLiteModel:
+    """Batched inference on a .tflite model with a reused interpreter.
+
+    The input tensor is resized only when the batch size changes, so
+    repeated calls at the same size reuse the allocated tensors. Inputs
+    larger than max_batch are run in max_batch chunks.
+    """
+
+    def __init__(self, path, num_threads=None, max_batch=256):
+        self.path = path
+        self.max_batch = max_batch
+        self._interpreter = _interpreter_class()(model_path=path, num_threads=num_threads or os.cpu_count())
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._batch_size = None
+        self._lock = threading.Lock()
+
+    @property
+    def input_shape(self):
+        return tuple(self._input['shape'][1:])
+
+    def _resize(self, batch_size):
+        if batch_size != self._batch_size:
+            self._interpreter.resize_tensor_input(self._input['index'], [batch_size, *self.input_shape])
+            self._interpreter.allocate_tensors()
+            self._batch_size = batch_size
+
+    def predict(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        if x.shape[1:] != self.input_shape:
+            x = x.reshape((-1, *self.input_shape))
+        outputs = []
+        with self._lock:
+            for start in range(0, len(x), self.max_batch):
+                chunk = x[start:start + self.max_batch]
+                self._resize(len(chunk))
+                self._interpreter.set_tensor(self._input['index'], chunk)
+                self._interpreter.invoke()
+                outputs.append(self._interpreter.get_tensor(self._output['index']).copy())
+        return np.concatenate(outputs) if outputs else np.zeros((0,), dtype=np.float32)
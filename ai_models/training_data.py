@@ -0,0 +1,218 @@
+import glob
+import json
+import math
+import os
+
+import numpy as np
+
+try:
+    from .lazy_imports import lazy_import
+except ImportError:
+    from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow', 'deep_learning')
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+# model -> input shape, dtype on disk, number of classes (None = binary), synthetic sample count
+DATASETS = {
+    'behavior': {'shape': (20,), 'disk_dtype': np.float32, 'classes': 3, 'samples': 5000},
+    'mission_lstm': {'shape': (30, 10), 'disk_dtype': np.float32, 'classes': None, 'samples': 3000},
+    'facial_recognition': {'shape': (128, 128, 3), 'disk_dtype': np.uint8, 'classes': 1000, 'samples': 10000},
+}
+
+
+def plan_batches(name, batch_size, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, parallel_calls=4, prefetch=2):
+    """Batch size, map parallelism and prefetch depth whose in-flight batches fit the memory budget
+
+    Every parallel map call and every prefetched batch holds one float32
+    batch (plus its on-disk staging copy), so the budget is divided between
+    them; depth is given up before batch size.
+    """
+    spec = DATASETS[name]
+    sample_values = math.prod(spec['shape'])
+    sample_bytes = sample_values * (4 + np.dtype(spec['disk_dtype']).itemsize) + 4 * (spec['classes'] or 1)
+    budget = memory_budget_mb * 1024 * 1024
+
+    while True:
+        in_flight = parallel_calls + prefetch + 1  # +1 for the batch the model is training on
+        if batch_size * sample_bytes * in_flight <= budget or (batch_size == 1 and in_flight == 3):
+            break
+        if prefetch > 1:
+            prefetch -= 1
+        elif parallel_calls > 1:
+            parallel_calls -= 1
+        else:
+            batch_size = max(1, batch_size // 2)
+
+    return {
+        'batch_size': batch_size,
+        'parallel_calls': parallel_calls,
+        'prefetch': prefetch,
+        'peak_mb': round(batch_size * sample_bytes * (parallel_calls + prefetch + 1) / 1024 / 1024, 1)
+    }
+
+
+def one_hot(labels, classes):
+    encoded = np.zeros((len(labels), classes), dtype=np.float32)
+    encoded[np.arange(len(labels)), labels] = 1
+    return encoded
+
+
+def synthetic_batch(name, index, batch_size, seed=42):
+    """One float32 batch of synthetic training data, reproducible from its index"""
+    spec = DATASETS[name]
+    rng = np.random.default_rng((seed, int(index)))
+    x = rng.random((batch_size, *spec['shape']), dtype=np.float32)
+    if spec['classes']:
+        y = one_hot(rng.integers(0, spec['classes'], batch_size), spec['classes'])
+    else:
+        y = rng.integers(0, 2, batch_size).astype(np.float32)
+    return x, y
+
+
+def find_shards(root, name):
+    """Shard prefixes under root/name/ (each is a <prefix>.x.npy / <prefix>.y.npy pair)"""
+    if not root:
+        return []
+    return sorted(path[:-len('.x.npy')] for path in glob.glob(os.path.join(root, name, '*.x.npy')))
+
+
+def write_shards(root, name, x, y, shard_size=2000, labels=None):
+    """Save samples as memory-mappable shards; face crops are stored as uint8
+
+    labels (class index -> personnel id) is saved next to the shards as
+    labels.json, for classifiers whose predictions name personnel.
+    """
+    spec = DATASETS[name]
+    directory = os.path.join(root, name)
+    os.makedirs(directory, exist_ok=True)
+    if labels is not None:
+        with open(os.path.join(directory, 'labels.json'), 'w') as f:
+            json.dump(list(labels), f)
+    for number, start in enumerate(range(0, len(x), shard_size)):
+        prefix = os.path.join(directory, f'shard-{number:05d}')
+        np.save(f'{prefix}.x.npy', np.asarray(x[start:start + shard_size], dtype=spec['disk_dtype']))
+        np.save(f'{prefix}.y.npy', np.asarray(y[start:start + shard_size]))
+    return find_shards(root, name)
+
+
+def load_labels(root, name):
+    """Class labels saved by write_shards, or None"""
+    if not root:
+        return None
+    try:
+        with open(os.path.join(root, name, 'labels.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def shard_batches(name, prefix, batch_size, start=0, stop=None):
+    """Raw (on-disk dtype) batches from rows start:stop of one shard; it is memory-mapped, so only the batch is read"""
+    x = np.load(f'{prefix}.x.npy', mmap_mode='r')
+    y = np.load(f'{prefix}.y.npy', mmap_mode='r')
+    stop = len(x) if stop is None else min(stop, len(x))
+    for begin in range(start, stop, batch_size):
+        end = min(begin + batch_size, stop)
+        yield np.array(x[begin:end]), np.array(y[begin:end])
+
+
+def to_model_batch(name, x, y):
+    """float32 inputs (face crops scaled to 0..1) and float32 / one-hot labels"""
+    spec = DATASETS[name]
+    x = np.asarray(x, dtype=np.float32)
+    if spec['disk_dtype'] == np.uint8:
+        x /= 255.0
+    y = np.asarray(y)
+    if spec['classes'] and y.ndim == 1:
+        y = one_hot(y.astype(np.int64), spec['classes'])
+    return x, y.astype(np.float32)
+
+
+def batches(name, root=None, batch_size=32, split='train', validation_fraction=0.2, seed=42):
+    """Plain generator of float32 batches: disk shards when present, synthetic data otherwise (never both)"""
+    shards = find_shards(root, name)
+    if shards:
+        for prefix, start, stop in _split(shards, split, validation_fraction):
+            for x, y in shard_batches(name, prefix, batch_size, start, stop):
+                yield to_model_batch(name, x, y)
+        return
+    for index in _synthetic_indices(name, batch_size, split, validation_fraction):
+        yield synthetic_batch(name, index, batch_size, seed)
+
+
+def _split(shards, split, validation_fraction):
+    """(prefix, start, stop) row ranges of the split; a lone shard holds out its last rows instead of a shard"""
+    if len(shards) == 1:
+        rows = len(np.load(f'{shards[0]}.y.npy', mmap_mode='r'))
+        boundary = rows - min(max(1, round(rows * validation_fraction)), max(rows - 1, 0))
+        if split == 'train':
+            return [(shards[0], 0, boundary)]
+        return [(shards[0], boundary, rows)] if boundary < rows else []
+    held_out = max(1, round(len(shards) * validation_fraction))
+    shards = shards[:-held_out] if split == 'train' else shards[-held_out:]
+    return [(prefix, 0, len(np.load(f'{prefix}.y.npy', mmap_mode='r'))) for prefix in shards]
+
+
+def _synthetic_indices(name, batch_size, split, validation_fraction):
+    total = math.ceil(DATASETS[name]['samples'] / batch_size)
+    validation = max(1, round(total * validation_fraction))
+    return range(total - validation) if split == 'train' else range(total - validation, total)
+
+
+def make_dataset(name, root=None, batch_size=32, split='train', memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                 validation_fraction=0.2, seed=42):
+    """tf.data pipeline of float32 batches with parallel map and prefetch, sized to the memory budget
+
+    None when the shards leave no rows for this split (a one-row shard has
+    nothing to validate on); synthetic data only stands in when there are
+    no shards at all.
+    """
+    spec = DATASETS[name]
+    plan = plan_batches(name, batch_size, memory_budget_mb)
+    batch_size = plan['batch_size']
+    label_shape = (None, spec['classes']) if spec['classes'] else (None,)
+    x_spec = tf.TensorSpec((None, *spec['shape']), tf.float32)
+    y_spec = tf.TensorSpec(label_shape, tf.float32)
+
+    shards = find_shards(root, name)
+    if shards:
+        ranges = _split(shards, split, validation_fraction)
+        if not ranges:
+            return None
+        disk_dtype = tf.as_dtype(spec['disk_dtype'])
+        raw_label_dtype = tf.as_dtype(np.load(f'{shards[0]}.y.npy', mmap_mode='r').dtype)
+
+        def read_shard(prefix, start, stop):
+            return tf.data.Dataset.from_generator(
+                lambda p, a, b: shard_batches(name, p.decode(), batch_size, int(a), int(b)),
+                args=(prefix, start, stop),
+                output_signature=(tf.TensorSpec((None, *spec['shape']), disk_dtype),
+                                  tf.TensorSpec(None, raw_label_dtype))
+            )
+
+        def convert(x, y):
+            x, y = tf.numpy_function(lambda a, b: to_model_batch(name, a, b), [x, y], [tf.float32, tf.float32])
+            return tf.ensure_shape(x, x_spec.shape), tf.ensure_shape(y, y_spec.shape)
+
+        prefixes, starts, stops = (list(column) for column in zip(*ranges))
+        dataset = tf.data.Dataset.from_tensor_slices((prefixes, starts, stops))
+        if split == 'train':
+            dataset = dataset.shuffle(len(ranges), seed=seed)
+        dataset = dataset.interleave(read_shard, cycle_length=plan['parallel_calls'],
+                                     num_parallel_calls=plan['parallel_calls'], deterministic=False)
+        dataset = dataset.map(convert, num_parallel_calls=plan['parallel_calls'])
+    else:
+        def generate(index):
+            x, y = tf.numpy_function(lambda i: synthetic_batch(name, i, batch_size, seed), [index],
+                                     [tf.float32, tf.float32])
+            return tf.ensure_shape(x, x_spec.shape), tf.ensure_shape(y, y_spec.shape)
+
+        indices = _synthetic_indices(name, batch_size, split, validation_fraction)
+        dataset = tf.data.Dataset.range(indices.start, indices.stop)
+        if split == 'train':
+            dataset = dataset.shuffle(len(indices), seed=seed)
+        dataset = dataset.map(generate, num_parallel_calls=plan['parallel_calls'])
+
+    return dataset.prefetch(plan['prefetch'])
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+MIN_READINESS = 75  # only personnel above this readiness are moved
+LOAD_BAND = (0.8, 1.2)  # units outside this fraction of the average size are rebalanced
+
+
+def unit_loads(personnel_df, unit_column='unit', min_readiness=MIN_READINESS, band=LOAD_BAND):
+    """Headcount, transfer pool and load status per unit from a single groupby
+
+    Overloaded units can give up personnel down to the average size (limited
+    by how many are ready to move); underloaded units need personnel up to it.
+    """
+    eligible = personnel_df['readiness_score'] > min_readiness
+    loads = eligible.groupby(personnel_df[unit_column]).agg(['size', 'sum'])
+    loads.columns = ['personnel', 'eligible']
+
+    average = loads['personnel'].mean()
+    target = int(round(average))
+    overloaded = loads['personnel'] > average * band[1]
+    underloaded = loads['personnel'] < average * band[0]
+    loads['status'] = np.select([overloaded, underloaded], ['overloaded', 'underloaded'], 'balanced')
+    loads['surplus'] = np.where(overloaded, np.minimum(loads['personnel'] - target, loads['eligible']), 0)
+    loads['deficit'] = np.where(underloaded, target - loads['personnel'], 0)
+    loads.attrs['target_size'] = target
+    return loads
+
+
+def _solve_transfers(pool, surplus, gap, deficit):
+    """Min-cost flow from overloaded units to underloaded ones, solved as a linear program
+
+    Network: source unit u -> skill b (capacity pool[u, b]) -> target unit v,
+    either over a free arc filling v's shortfall in b (capacity gap[v, b]) or
+    over a unit-cost arc once that shortfall is covered. Units give at most
+    their surplus, targets take at most their deficit, and as many personnel
+    as possible are moved. The constraint matrix is a network matrix, so the
+    simplex vertex HiGHS returns is integral.
+    """
+    U, B = pool.shape
+    V = gap.shape[0]
+    n_pool, n_arc = U * B, B * V
+    # Variables: y[u, b] (row-major), then gap arcs g[b, v], then overflow arcs o[b, v]
+    cost = np.concatenate([np.zeros(n_pool + n_arc), np.ones(n_arc)])
+    bounds = np.concatenate([
+        np.column_stack([np.zeros(n_pool), pool.ravel()]),
+        np.column_stack([np.zeros(n_arc), gap.T.ravel()]),
+        np.column_stack([np.zeros(n_arc), np.full(n_arc, np.inf)])
+    ])
+
+    y = np.arange(n_pool).reshape(U, B)
+    g = n_pool + np.arange(n_arc).reshape(B, V)
+    o = g + n_arc
+
+    def rows(index_groups):
+        # One constraint row per group, with coefficient 1 on each listed variable
+        groups = [np.asarray(group).ravel() for group in index_groups]
+        row_ids = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+        return sparse.csr_matrix((np.ones(len(row_ids)), (row_ids, np.concatenate(groups))),
+                                 shape=(len(groups), len(cost)))
+
+    # Units give at most their surplus; targets take at most their deficit
+    a_ub = sparse.vstack([rows(y), rows([np.concatenate([g[:, v], o[:, v]]) for v in range(V)])])
+    b_ub = np.concatenate([surplus, deficit])
+    # Everything drawn from a skill pool is delivered, and the total moved is as large as possible
+    conservation = rows(y.T) - rows([np.concatenate([g[b], o[b]]) for b in range(B)])
+    a_eq = sparse.vstack([conservation, rows([y])])
+    b_eq = np.concatenate([np.zeros(B), [min(surplus.sum(), deficit.sum(), pool.sum())]])
+
+    result = linprog(cost, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=b_eq, bounds=bounds, method='highs')
+    if result.status != 0:
+        raise ValueError(f"Reallocation plan could not be solved: {result.message}")
+    flows = np.rint(result.x).astype(np.int64)
+    return flows[:n_pool].reshape(U, B), flows[n_pool:n_pool + n_arc].reshape(B, V), flows[n_pool + n_arc:].reshape(B, V)
+
+
+def plan_reallocations(personnel_df, unit_column='unit', skill_column='branch', min_readiness=MIN_READINESS,
+                       band=LOAD_BAND):
+    """Transfers that bring over- and underloaded units to the average size, matched on skills
+
+    Each underloaded unit should end up with the force-wide share of every
+    skill family (skill_column); transfers that fill such a shortfall are
+    preferred over ones that don't. The most ready eligible personnel in
+    each (unit, skill) pool move first.
+    """
+    loads = unit_loads(personnel_df, unit_column, min_readiness, band)
+    target = loads.attrs['target_size']
+    plan = {'target_size': target, 'transfers': 0, 'skill_mismatches': 0, 'unit_loads': {}, 'moves': []}
+    sources = loads.index[loads['surplus'] > 0]
+    targets = loads.index[loads['deficit'] > 0]
+    if not len(sources) or not len(targets):
+        return plan
+
+    skills = personnel_df[skill_column].fillna('General')
+    skill_codes, skill_names = pd.factorize(skills)
+    share = np.bincount(skill_codes, minlength=len(skill_names)) / len(skill_codes)
+
+    unit_codes = pd.Index(sources).get_indexer(personnel_df[unit_column])
+    eligible = (personnel_df['readiness_score'] > min_readiness).to_numpy() & (unit_codes >= 0)
+    pool = np.zeros((len(sources), len(skill_names)), dtype=np.int64)
+    np.add.at(pool, (unit_codes[eligible], skill_codes[eligible]), 1)
+
+    target_codes = pd.Index(targets).get_indexer(personnel_df[unit_column])
+    in_target = target_codes >= 0
+    present = np.zeros((len(targets), len(skill_names)), dtype=np.int64)
+    np.add.at(present, (target_codes[in_target], skill_codes[in_target]), 1)
+    gap = np.maximum(np.floor(share * target) - present, 0)
+
+    taken, filled, overflow = _solve_transfers(pool, loads.loc[sources, 'surplus'].to_numpy(),
+                                               gap, loads.loc[targets, 'deficit'].to_numpy())
+
+    # Pick the top taken[u, b] personnel of every pool by readiness
+    candidates = pd.DataFrame({
+        'row': np.flatnonzero(eligible),
+        'source': unit_codes[eligible],
+        'skill': skill_codes[eligible],
+        'readiness': personnel_df['readiness_score'].to_numpy()[eligible]
+    }).sort_values(['skill', 'readiness'], ascending=[True, False], kind='stable')
+    rank = candidates.groupby(['source', 'skill']).cumcount().to_numpy()
+    movers = candidates[rank < taken[candidates['source'], candidates['skill']]]
+
+    # Hand each skill's movers out to targets: shortfall-filling arcs, then the rest
+    destinations, fills = [], []
+    both = np.concatenate([np.arange(len(targets)), np.arange(len(targets))])
+    kind = np.repeat([True, False], len(targets))
+    for b in range(len(skill_names)):
+        counts = np.concatenate([filled[b], overflow[b]])
+        destinations.append(np.repeat(both, counts))
+        fills.append(np.repeat(kind, counts))
+    destinations, fills = np.concatenate(destinations), np.concatenate(fills)
+
+    rows = movers['row'].to_numpy()
+    moved_skills = pd.Series(np.asarray(skill_names)[movers['skill'].to_numpy()]).astype(str)
+    moves = pd.DataFrame({
+        'personnel_id': personnel_df['id'].to_numpy()[rows],
+        'name': personnel_df['name'].to_numpy()[rows] if 'name' in personnel_df else None,
+        'from_unit': sources[movers['source'].to_numpy()],
+        'to_unit': targets[destinations],
+        'skill': moved_skills,
+        'reason': np.where(fills, 'Load balancing, fills ' + moved_skills + ' shortfall', 'Load balancing')
+    })
+
+    after = loads['personnel'].sub(moves['from_unit'].value_counts(), fill_value=0).add(moves['to_unit'].value_counts(), fill_value=0)
+    changed = sources.append(targets)
+    plan.update({
+        'transfers': len(moves),
+        'skill_mismatches': int(overflow.sum()),
+        'unit_loads': {unit: {'before': int(loads.at[unit, 'personnel']), 'after': int(after[unit])} for unit in changed},
+        'moves': moves.to_dict('records')
+    })
+    return plan
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+ASGI load benchmark
+Drives the Django ASGI application in-process with concurrent clients and compares sync
+views (run one at a time on Django's shared sync thread under ASGI) with the async views
+that use the async ORM and hand model calls to the ML executor
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import datetime
+import tempfile
+import io
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iaf_hms.settings')
+
+import django
+from django.conf import settings
+
+DATABASE_DIR = tempfile.mkdtemp()
+settings.DATABASES['default']['NAME'] = os.path.join(DATABASE_DIR, 'load.sqlite3')
+django.setup()
+
+from django.core.asgi import get_asgi_application
+from django.core.management import call_command
+from django.http import JsonResponse
+from django.urls import clear_url_caches, path
+from django.utils import timezone
+
+from personnel.live_stats import dashboard_snapshot
+from personnel.models import Personnel
+
+UNITS = [f'No. {n} Squadron' for n in range(1, 40)]
+BASES = ['Hindon', 'Palam', 'Jodhpur', 'Pune', 'Ambala', 'Gwalior', 'Tezpur', 'Jamnagar']
+STATUSES = ['Active'] * 7 + ['On Leave', 'Training', 'Deployed']
+RANKS = ['Wing Commander', 'Squadron Leader', 'Flight Lieutenant', 'Flying Officer', 'Pilot Officer']
+
+
+def sync_dashboard_stats(request):
+    return JsonResponse(dashboard_snapshot())
+
+
+def sync_predictive_maintenance(request):
+    from ai_models.predictive_maintenance import PredictiveMaintenanceSystem
+    pm_system = PredictiveMaintenanceSystem()
+    pm_system.initialize_equipment_database()
+    return JsonResponse({
+        'analytics': pm_system.get_maintenance_analytics(),
+        'maintenance_schedule': pm_system.generate_maintenance_schedule()[:20],
+        'timestamp': timezone.now().isoformat()
+    })
+
+
+# URLconf for the sync run: how these endpoints were served before the async views
+urlpatterns = [
+    path('api/personnel/dashboard_stats/', sync_dashboard_stats),
+    path('api/personnel/predictive_maintenance/', sync_predictive_maintenance),
+]
+
+
+def populate(count):
+    call_command('migrate', verbosity=0)
+    today = datetime.date.today()
+    Personnel.objects.bulk_create([
+        Personnel(personnel_id=f'IAF{i:06d}', name=f'Officer {i}', rank=RANKS[i % len(RANKS)],
+                  unit=UNITS[i % len(UNITS)], base_location=BASES[i % len(BASES)],
+                  date_of_birth=today - datetime.timedelta(days=9000 + i % 5000), date_of_joining=today,
+                  years_of_service=i % 30, specialization='Pilot', status=STATUSES[i % len(STATUSES)],
+                  contact_number='0', email='officer@iaf.in', emergency_contact='-', blood_group='O+',
+                  marital_status='Single', readiness_score=60 + i % 40)
+        for i in range(count)
+    ], batch_size=2000)
+
+
+async def asgi_request(app, request_path):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': request_path, 'raw_path': request_path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'localhost')], 'client': ('127.0.0.1', 50000), 'server': ('localhost', 80)
+    }
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await app(scope, receive, send)
+    return status
+
+
+async def load(app, clients, duration, ml_every):
+    latencies = {'dashboard': [], 'maintenance': []}
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(number):
+        nonlocal errors
+        sent = number
+        while time.perf_counter() < deadline:
+            sent += 1
+            kind = 'maintenance' if sent % ml_every == 0 else 'dashboard'
+            start = time.perf_counter()
+            endpoint = 'predictive_maintenance' if kind == 'maintenance' else 'dashboard_stats'
+            status = await asgi_request(app, f'/api/personnel/{endpoint}/')
+            latencies[kind].append(time.perf_counter() - start)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test sync vs async views through the ASGI application')
+    parser.add_argument('--personnel', type=int, default=20000, help='personnel rows in the database')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 32], help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--ml-every', type=int, default=5, help='every Nth request is predictive maintenance')
+    parser.add_argument('--ml-wait-ms', type=float, default=0,
+                        help='blocking wait added to each maintenance call (model or data loaded over I/O)')
+    args = parser.parse_args()
+
+    if args.ml_wait_ms:
+        from ai_models.predictive_maintenance import PredictiveMaintenanceSystem
+        initialize = PredictiveMaintenanceSystem.initialize_equipment_database
+
+        def slow_initialize(self):
+            time.sleep(args.ml_wait_ms / 1000)
+            return initialize(self)
+        PredictiveMaintenanceSystem.initialize_equipment_database = slow_initialize
+
+    print("=" * 60)
+    print("ASGI LOAD BENCHMARK")
+    print("=" * 60)
+    populate(args.personnel)
+    print(f"{args.personnel:,} personnel; 1 in {args.ml_every} requests is predictive maintenance "
+          f"(+{args.ml_wait_ms:.0f} ms blocking wait); {args.duration:.0f}s per run")
+    print()
+    print(f"{'views':<8}{'clients':>8}{'req/s':>9}{'dash p50 ms':>13}{'dash p95 ms':>13}{'ml p95 ms':>11}{'errors':>8}")
+
+    app = get_asgi_application()
+    for mode, urlconf in (('sync', '__main__'), ('async', 'iaf_hms.urls')):
+        settings.ROOT_URLCONF = urlconf
+        clear_url_caches()
+        with contextlib.redirect_stdout(io.StringIO()):  # warm-up: imports, first model build
+            asyncio.run(load(app, 1, 0.5, 1))
+        for clients in args.clients:
+            with contextlib.redirect_stdout(io.StringIO()):  # PredictiveMaintenanceSystem prints per call
+                latencies, errors, elapsed = asyncio.run(load(app, clients, args.duration, args.ml_every))
+            total = sum(len(values) for values in latencies.values())
+            print(f"{mode:<8}{clients:>8}{total / elapsed:>9.1f}{percentile(latencies['dashboard'], 0.5):>13.1f}"
+                  f"{percentile(latencies['dashboard'], 0.95):>13.1f}{percentile(latencies['maintenance'], 0.95):>11.1f}"
+                  f"{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
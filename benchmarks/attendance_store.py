@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Attendance store benchmark
+Compares the in-memory attendance list (re-parsing every ISO timestamp per report) with
+the day-partitioned EventStore and its precomputed daily counters
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from event_store import EventStore
+
+LOCATIONS = ['Main Gate', 'Hangar 3', 'Operations Block', 'Armoury', 'Mess']
+
+
+def generate_entries(count, days, personnel, seed=42):
+    rng = random.Random(seed)
+    now = time.time()
+    for _ in range(count):
+        ts = now - rng.uniform(0, days * 86400)
+        yield ts, {
+            'personnel_id': f'IAF{rng.randint(1, personnel):06d}',
+            'name': 'Officer',
+            'rank': 'Flight Lieutenant',
+            'location': rng.choice(LOCATIONS),
+            'entry_type': 'entry',
+            'confidence': 0.93
+        }
+
+
+def list_report(attendance_log, date_range):
+    """The report as computed over the old in-memory list"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=date_range)
+    filtered_log = [
+        entry for entry in attendance_log
+        if start_date <= datetime.fromisoformat(entry['timestamp']) <= end_date
+    ]
+    unique_personnel = set(entry['personnel_id'] for entry in filtered_log)
+    daily_counts = {}
+    for entry in filtered_log:
+        day = str(datetime.fromisoformat(entry['timestamp']).date())
+        daily_counts[day] = daily_counts.get(day, 0) + 1
+    return len(filtered_log), len(unique_personnel)
+
+
+def store_report(store, date_range):
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=date_range)
+    summary = store.summary('attendance', start_date.timestamp(), end_date.timestamp())
+    return summary['total'], summary['distinct_personnel']
+
+
+def best_ms(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the attendance event store')
+    parser.add_argument('--entries', type=int, default=1000000, help='attendance entries')
+    parser.add_argument('--days', type=int, default=365, help='days of history')
+    parser.add_argument('--personnel', type=int, default=20000, help='distinct personnel')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ATTENDANCE STORE BENCHMARK")
+    print("=" * 60)
+
+    # Cameras log in time order
+    entries = sorted(generate_entries(args.entries, args.days, args.personnel), key=lambda entry: entry[0])
+    attendance_log = [{**entry, 'timestamp': datetime.fromtimestamp(ts).isoformat()} for ts, entry in entries]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = EventStore(os.path.join(directory, 'cv_events.sqlite3'))
+        start = time.perf_counter()
+        for ts, entry in entries:
+            store.append('attendance', entry, ts=ts)
+        store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"Batched writes: {args.entries:,} entries in {elapsed:.1f}s "
+              f"({elapsed * 1e6 / args.entries:.1f} us/entry)")
+        print()
+
+        print(f"{'report':<16}{'entries':>10}{'list ms':>10}{'store ms':>10}{'match':>7}")
+        for date_range in (1, 7, 30, 90, 365):
+            list_ms, expected = best_ms(lambda: list_report(attendance_log, date_range), repeat=1)
+            store_ms, result = best_ms(lambda: store_report(store, date_range))
+            print(f"{f'{date_range} day(s)':<16}{expected[0]:>10,}{list_ms:>10.1f}{store_ms:>10.1f}"
+                  f"{str(result == expected):>7}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
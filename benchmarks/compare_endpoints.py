@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark comparison
+Compares an endpoint_suite.py report against a stored baseline and flags endpoints whose
+p95 latency grew past a threshold or that now run more SQL queries per request; exits 1
+on any regression so it can gate CI
+"""
+
+import sys
+import json
+import argparse
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report.get('meta', {}), {(r['endpoint'], r['scale'], r['clients']): r for r in report['results']}
+
+
+def compare(baseline, current, threshold, min_ms):
+    """Rows of (key, baseline result, current result, verdict)"""
+    rows = []
+    for key in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(key), current.get(key)
+        if before is None or after is None:
+            rows.append((key, before, after, 'new' if before is None else 'missing'))
+            continue
+
+        problems = []
+        if after['p95_ms'] > before['p95_ms'] * (1 + threshold) and after['p95_ms'] - before['p95_ms'] >= min_ms:
+            problems.append('p95')
+        if (after.get('queries_per_request') or 0) > (before.get('queries_per_request') or 0) + 0.5:
+            problems.append('queries')
+        if after.get('errors', 0) > before.get('errors', 0):
+            problems.append('errors')
+        if problems:
+            verdict = 'REGRESSION (' + ', '.join(problems) + ')'
+        elif after['p95_ms'] < before['p95_ms'] * (1 - threshold) and before['p95_ms'] - after['p95_ms'] >= min_ms:
+            verdict = 'improved'
+        else:
+            verdict = 'ok'
+        rows.append((key, before, after, verdict))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flag endpoint latency and query-count regressions against a baseline')
+    parser.add_argument('baseline', help='stored endpoint_suite.py report')
+    parser.add_argument('current', help='new endpoint_suite.py report')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative p95 growth (0.2 = 20%%)')
+    parser.add_argument('--min-ms', type=float, default=2.0, help='ignore p95 changes smaller than this')
+    args = parser.parse_args()
+
+    baseline_meta, baseline = load(args.baseline)
+    current_meta, current = load(args.current)
+
+    print("=" * 60)
+    print("ENDPOINT BENCHMARK COMPARISON")
+    print("=" * 60)
+    for label, meta in (('baseline', baseline_meta), ('current', current_meta)):
+        print(f"{label:<9} {meta.get('created_at', '?')}  python {meta.get('python', '?')}, "
+              f"django {meta.get('django', '?')}, {meta.get('cpu_count', '?')} CPUs")
+    if baseline_meta.get('platform') != current_meta.get('platform') or baseline_meta.get('cpu_count') != current_meta.get('cpu_count'):
+        print("⚠️ Reports come from different machines; latency comparisons are indicative only")
+    print()
+
+    rows = compare(baseline, current, args.threshold, args.min_ms)
+    print(f"{'endpoint':<26}{'scale':>8}{'clients':>8}{'p95 before':>12}{'p95 after':>11}{'change':>9}{'queries':>12}  verdict")
+    regressions = 0
+    for (endpoint, scale, clients), before, after, verdict in rows:
+        if before is None or after is None:
+            print(f"{endpoint:<26}{scale:>8}{clients:>8}{'':>52}  {verdict}")
+            continue
+        change = (after['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0.0
+        queries = f"{before.get('queries_per_request')}->{after.get('queries_per_request')}"
+        print(f"{endpoint:<26}{scale:>8}{clients:>8}{before['p95_ms']:>12.1f}{after['p95_ms']:>11.1f}{change:>+8.0f}%{queries:>12}  {verdict}")
+        regressions += verdict.startswith('REGRESSION')
+
+    print()
+    if regressions:
+        print(f"❌ {regressions} regression(s) beyond {args.threshold:.0%} / {args.min_ms:g} ms")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
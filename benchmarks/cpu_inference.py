@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+CPU inference benchmark
+Compares Keras predict with the exported TFLite models (float, dynamic-range and int8)
+for the behavior, mission readiness and face recognition networks: latency and memory
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from lazy_imports import is_available
+from training_data import synthetic_batch
+
+BATCH_SIZES = (1, 32)
+
+
+def latency_ms(predict, x, repeat):
+    predict(x)  # warm-up (tensor allocation, graph tracing)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict(x)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Keras predict against TFLite inference')
+    parser.add_argument('--repeat', type=int, default=50, help='timed calls per measurement')
+    parser.add_argument('--train-batches', type=int, default=5, help='training steps before export')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CPU INFERENCE BENCHMARK")
+    print("=" * 60)
+    if not is_available('tensorflow'):
+        print("Skipped: TensorFlow is not installed (pip install tensorflow)")
+        return
+
+    from deep_learning_models import DeepLearningModels
+    from tflite_inference import TFLiteModel, export_tflite
+
+    dl_models = DeepLearningModels()
+    builders = {
+        'behavior': dl_models.create_personnel_behavior_model,
+        'mission_lstm': dl_models.create_mission_readiness_lstm,
+        'facial_recognition': dl_models.create_facial_recognition_cnn,
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, builder in builders.items():
+            model = builder()
+            for index in range(args.train_batches):
+                model.train_on_batch(*synthetic_batch(name, index, 16))
+
+            print()
+            print(f"{name}")
+            print(f"  {'runtime':<18}{'size KB':>9}" + ''.join(f"{f'batch {b} ms':>13}" for b in BATCH_SIZES)
+                  + f"{'max diff':>10}{'RSS +MB':>9}")
+            inputs = {b: synthetic_batch(name, 1000 + b, b)[0] for b in BATCH_SIZES}
+            reference = model.predict(inputs[32], verbose=0)
+
+            before = rss_mb()
+            timings = [latency_ms(lambda x: model.predict(x, verbose=0), inputs[b], args.repeat) for b in BATCH_SIZES]
+            print(f"  {'keras predict':<18}{'':>9}" + ''.join(f"{t:>13.2f}" for t in timings)
+                  + f"{0:>10.4f}{rss_mb() - before:>9.1f}")
+
+            for quantization in ('none', 'dynamic', 'int8'):
+                path = os.path.join(directory, f'{name}-{quantization}.tflite')
+                size = export_tflite(model, path, name=name, quantization=quantization)
+                before = rss_mb()
+                runner = TFLiteModel(path)
+                timings = [latency_ms(runner.predict, inputs[b], args.repeat) for b in BATCH_SIZES]
+                diff = float(np.max(np.abs(runner.predict(inputs[32]) - reference)))
+                print(f"  {f'tflite {quantization}':<18}{size / 1024:>9.0f}" + ''.join(f"{t:>13.2f}" for t in timings)
+                      + f"{diff:>10.4f}{rss_mb() - before:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
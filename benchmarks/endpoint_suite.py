@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite
+Seeds a SQLite database at a scale factor (personnel plus medical, training, leave, review,
+skill, HR, deployment, mission, aircraft and equipment rows), then drives every API endpoint
+through Django's test client from concurrent clients and writes p50/p95/p99 latency,
+throughput and SQL queries per request to JSON (compare runs with compare_endpoints.py)
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+import platform
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iaf_hms.settings')
+
+SCALES = {'10k': 10000, '100k': 100000, '500k': 500000}
+FIXTURE_DIR = os.path.join(tempfile.gettempdir(), 'iaf_hms_bench_fixtures')
+
+RANKS = ['Group Captain', 'Wing Commander', 'Squadron Leader', 'Flight Lieutenant', 'Flying Officer', 'Pilot Officer']
+UNITS = [f'No. {n} Squadron' for n in range(1, 60)]
+BASES = ['Hindon', 'Palam', 'Jodhpur', 'Pune', 'Ambala', 'Gwalior', 'Tezpur', 'Jamnagar', 'Halwara', 'Bagdogra']
+SPECIALIZATIONS = ['Pilot', 'Navigator', 'Engineer', 'Air Traffic Control', 'Logistics', 'Medical', 'Intelligence']
+STATUSES = ['Active'] * 12 + ['On Leave', 'Training', 'Deployed', 'Retired']
+NOTES = [
+    'commended for outstanding performance during night operations',
+    'completed advanced navigation course with distinction',
+    'medical leave following knee injury during training sortie',
+    'recommended for promotion board consideration',
+    'annual leave to attend family wedding',
+    'temporary duty at forward base for exercise preparations',
+]
+
+# (name, method, path, JSON body, group); {personnel_id} / {equipment_id} are filled from the fixture
+ENDPOINTS = [
+    ('personnel_list', 'GET', '/api/personnel/?limit=100', None, 'read'),
+    ('personnel_list_columns', 'GET', '/api/personnel/?limit=1000&layout=columns', None, 'read'),
+    ('personnel_detail', 'GET', '/api/personnel/{personnel_id}/', None, 'read'),
+    ('performance_report', 'GET', '/api/personnel/{personnel_id}/performance_report/', None, 'read'),
+    ('personnel_search', 'GET', '/api/personnel/search/?q=squadron+leader+pilot', None, 'read'),
+    ('record_search', 'GET', '/api/search/records/?q=knee+injury&role=medical_officer', None, 'read'),
+    ('dashboard_stats', 'GET', '/api/personnel/dashboard_stats/', None, 'read'),
+    ('advanced_analytics', 'GET', '/api/personnel/advanced_analytics/', None, 'read'),
+    ('training_courses', 'GET', '/api/personnel/training_courses/', None, 'read'),
+    ('equipment_list', 'GET', '/api/equipment/', None, 'read'),
+    ('equipment_detail', 'GET', '/api/equipment/{equipment_id}/', None, 'read'),
+    ('maintenance_due', 'GET', '/api/equipment/maintenance_due/', None, 'read'),
+    ('chatbot_help', 'GET', '/api/chatbot/help/?role=commander', None, 'read'),
+    ('jobs', 'GET', '/api/jobs/', None, 'read'),
+    ('metrics', 'GET', '/api/_metrics/', None, 'read'),
+    ('what_if_simulation', 'POST', '/api/personnel/what_if_simulation/',
+     {'scenario_type': 'retirement', 'parameters': {'retirement_age': 55}}, 'read'),
+    ('what_if_simulation_async', 'POST', '/api/personnel/what_if_simulation_async/',
+     {'scenario_type': 'redeployment', 'parameters': {'from_unit': 'No. 7 Squadron', 'percentage': 10}}, 'write'),
+    ('apply_leave', 'POST', '/api/personnel/apply_leave/',
+     {'personnel_id': '{personnel_id}', 'leave_type': 'Annual', 'start_date': '2025-01-06', 'end_date': '2025-01-10',
+      'reason': 'annual leave to attend family wedding'}, 'write'),
+    ('schedule_medical', 'POST', '/api/personnel/schedule_medical/',
+     {'personnel_id': '{personnel_id}', 'appointment_date': '2025-02-01'}, 'write'),
+    ('predict_attrition', 'POST', '/api/personnel/predict_attrition/', {'personnel_id': '{personnel_id}'}, 'ml'),
+    ('sentiment_analysis', 'POST', '/api/personnel/sentiment_analysis/',
+     {'text': 'Morale in the squadron is excellent after the successful exercise'}, 'ml'),
+    ('sentiment_analysis_batch', 'POST', '/api/personnel/sentiment_analysis_batch/',
+     {'texts': ['Great support from the unit', 'Workload is stressful and leave was denied'] * 25}, 'ml'),
+    ('predictive_maintenance', 'GET', '/api/personnel/predictive_maintenance/', None, 'ml'),
+    ('predict_failure', 'POST', '/api/equipment/{equipment_id}/predict_failure/', {}, 'ml'),
+]
+
+
+def configure(database_path, warm_cache):
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database_path
+    settings.DATABASES['default'].setdefault('OPTIONS', {})['timeout'] = 30
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.JOB_QUEUE = dict(getattr(settings, 'JOB_QUEUE', {}), PATH=database_path + '.jobs')
+    settings.REQUEST_METRICS = dict(getattr(settings, 'REQUEST_METRICS', {}), ENABLED=True, SLOW_REQUEST_MS=10 ** 9)
+    if not warm_cache:
+        # Every request runs its view instead of being served from the ETag response cache
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+    import django
+    django.setup()
+
+
+def seed(count, seed_value=42):
+    """Personnel and child tables at roughly the proportions of a real roster"""
+    from django.core.management import call_command
+    from personnel.models import (
+        AirBase, Aircraft, Deployment, Equipment, HRRecord, LeaveRequest, MaintenanceRecord, MedicalRecord,
+        MissionAssignment, MissionRecord, PerformanceReview, Personnel, Skill, TrainingRecord
+    )
+
+    rng = random.Random(seed_value)
+    today = datetime.date.today()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    started = time.perf_counter()
+    call_command('migrate', verbosity=0)
+
+    def days_ago(days):
+        return today - datetime.timedelta(days=days)
+
+    def insert(model, objects, per_batch=5000):
+        batch = []
+        created = 0
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == per_batch:
+                model.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            created += len(batch)
+        print(f"  {model.__name__:<18}{created:>10,}")
+
+    ids = [f'IAF{i:07d}' for i in range(count)]
+    insert(Personnel, (Personnel(
+        personnel_id=pid, name=f'Officer {i}', rank=RANKS[i % len(RANKS)], unit=rng.choice(UNITS),
+        base_location=rng.choice(BASES), date_of_birth=days_ago(8000 + rng.randint(0, 9000)),
+        date_of_joining=days_ago(rng.randint(100, 11000)), years_of_service=rng.randint(0, 30),
+        specialization=rng.choice(SPECIALIZATIONS), status=rng.choice(STATUSES), contact_number='9800000000',
+        email=f'officer{i}@iaf.in', emergency_contact='Next of kin', blood_group=rng.choice(['O+', 'A+', 'B+', 'AB+']),
+        marital_status=rng.choice(['Single', 'Married']), performance_score=rng.uniform(50, 100),
+        leadership_score=rng.uniform(1, 10), technical_score=rng.uniform(50, 100), attrition_risk=rng.random(),
+        readiness_score=rng.uniform(50, 100)
+    ) for i, pid in enumerate(ids)))
+
+    insert(MedicalRecord, (MedicalRecord(
+        personnel_id=pid, checkup_date=days_ago(rng.randint(0, 365)), medical_status=rng.choice(['Fit', 'Fit', 'Temporary Unfit']),
+        height=rng.uniform(160, 190), weight=rng.uniform(55, 95), blood_pressure='120/80', heart_rate=rng.randint(55, 90),
+        vision_status='6/6', hearing_status='Normal', fitness_level=rng.choice(['A', 'B', 'C']),
+        medical_notes=rng.choice(NOTES), next_checkup=days_ago(-rng.randint(1, 365))
+    ) for pid in ids))
+    insert(TrainingRecord, (TrainingRecord(
+        personnel_id=pid, course_name=f'Course {rng.randint(1, 40)}', course_type='Technical',
+        start_date=days_ago(rng.randint(30, 400)), end_date=days_ago(rng.randint(0, 200)),
+        status=rng.choice(['Completed', 'In Progress', 'Scheduled']), score=rng.uniform(50, 100),
+        instructor='Wg Cdr Instructor', location=rng.choice(BASES)
+    ) for pid in ids))
+    insert(Skill, (Skill(
+        personnel_id=pid, skill_name=rng.choice(SPECIALIZATIONS), skill_category='Core',
+        proficiency_level=rng.choice(['Beginner', 'Intermediate', 'Advanced', 'Expert']),
+        years_of_experience=rng.randint(0, 20)
+    ) for pid in ids))
+    insert(LeaveRequest, (LeaveRequest(
+        personnel_id=pid, leave_type='Annual', start_date=days_ago(30), end_date=days_ago(25), days_requested=6,
+        reason=rng.choice(NOTES), status=rng.choice(['Pending', 'Approved', 'Rejected'])
+    ) for pid in ids[::2]))
+    insert(PerformanceReview, (PerformanceReview(
+        personnel_id=pid, review_period_start=days_ago(365), review_period_end=days_ago(0),
+        overall_rating=rng.uniform(1, 5), leadership_rating=rng.uniform(1, 5), technical_rating=rng.uniform(1, 5),
+        communication_rating=rng.uniform(1, 5), teamwork_rating=rng.uniform(1, 5), goals_achieved=rng.choice(NOTES),
+        areas_for_improvement=rng.choice(NOTES), reviewer_name='Gp Capt Reviewer', review_date=days_ago(10)
+    ) for pid in ids[::2]))
+    insert(HRRecord, (HRRecord(
+        personnel_id=pid, record_type='Note', description=rng.choice(NOTES), created_by='HR Cell'
+    ) for pid in ids[::3]))
+    insert(Deployment, (Deployment(
+        personnel_id=pid, deployment_name='Exercise Gaganshakti', location=rng.choice(BASES), start_date=days_ago(60),
+        end_date=days_ago(30), status='Completed', purpose='Exercise'
+    ) for pid in ids[::10]))
+
+    missions = max(count // 200, 1)
+    insert(MissionRecord, (MissionRecord(
+        mission_id=f'M{i:06d}', mission_name=f'Mission {i}', mission_type='Training', start_date=now, end_date=now,
+        status=rng.choice(['Planned', 'Active', 'Completed']), location=rng.choice(BASES), description=rng.choice(NOTES)
+    ) for i in range(missions)))
+    mission_pks = list(MissionRecord.objects.values_list('pk', flat=True))
+    insert(MissionAssignment, (MissionAssignment(
+        personnel_id=rng.choice(ids), mission_id=mission_pk, role='Pilot'
+    ) for mission_pk in mission_pks for _ in range(5)))
+
+    insert(AirBase, (AirBase(
+        base_id=f'B{i:03d}', name=f'{base} Air Force Station', location=base, state='-', base_type='Main',
+        established_date=days_ago(20000), hangar_capacity=40, personnel_capacity=5000
+    ) for i, base in enumerate(BASES)))
+    insert(Aircraft, (Aircraft(
+        aircraft_id=f'AC{i:06d}', model=rng.choice(['Su-30MKI', 'Rafale', 'Tejas', 'C-17', 'Mi-17']), aircraft_type='Fighter',
+        status=rng.choice(['Operational'] * 4 + ['Maintenance']), base_id=f'B{rng.randrange(len(BASES)):03d}',
+        squadron=rng.choice(UNITS), manufactured_date=days_ago(5000), last_maintenance=days_ago(60),
+        next_maintenance=days_ago(-60), pilot_assigned_id=rng.choice(ids) if rng.random() < 0.7 else None
+    ) for i in range(max(count // 200, 1))))
+    equipment_count = max(count // 100, 1)
+    insert(Equipment, (Equipment(
+        equipment_id=f'EQ{i:06d}', name=f'Equipment {i}', type=rng.choice(['Radar', 'Engine', 'Avionics', 'Ground Support']),
+        status=rng.choice(['Operational', 'Maintenance']), location=rng.choice(BASES), assigned_personnel_id=rng.choice(ids),
+        last_maintenance=days_ago(rng.randint(0, 180)), next_maintenance=days_ago(-rng.randint(0, 180))
+    ) for i in range(equipment_count)))
+    insert(MaintenanceRecord, (MaintenanceRecord(
+        equipment_id=f'EQ{i % equipment_count:06d}', maintenance_type='Preventive', scheduled_date=days_ago(30),
+        description=rng.choice(NOTES), technician='Sgt Technician', status='Completed'
+    ) for i in range(equipment_count * 2)))
+
+    print(f"Seeded {count:,} personnel in {time.perf_counter() - started:.0f}s")
+
+
+def fixture_path(count, fixture_dir):
+    return os.path.join(fixture_dir, f'personnel_{count}.sqlite3')
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000 if values else 0.0
+
+
+def fill(value, context):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {key: fill(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, context) for item in value]
+    return value
+
+
+def route_of(path):
+    from django.urls import Resolver404, resolve
+
+    try:
+        match = resolve(path.split('?')[0])
+    except Resolver404:
+        return 'unmatched'
+    return match.route or match.view_name
+
+
+def bench_user():
+    """Signed-in user for the endpoints that check auth groups (record search)"""
+    from django.contrib.auth.models import Group, User
+
+    user, _ = User.objects.get_or_create(username='endpoint_bench')
+    for role in ('commander', 'medical_officer'):
+        user.groups.add(Group.objects.get_or_create(name=role)[0])
+    return user
+
+
+def run_endpoint(method, path, body, clients, requests, warmup, user):
+    from django.db import connections
+    from django.test import Client
+
+    def client_for():
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+        return client
+
+    def call(client):
+        if method == 'GET':
+            return client.get(path)
+        return client.post(path, json.dumps(body), content_type='application/json')
+
+    warm = client_for()
+    for _ in range(warmup):
+        call(warm)
+
+    latencies, statuses = [], []
+    remaining = [requests]
+    lock = threading.Lock()
+
+    def worker():
+        client = client_for()
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                status = call(client).status_code
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    statuses.append(status)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every API endpoint at a database scale factor')
+    parser.add_argument('--scale', default='10k', help=f"personnel count or one of {', '.join(SCALES)}")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8], help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=50, help='measured requests per endpoint and client count')
+    parser.add_argument('--warmup', type=int, default=2, help='unmeasured requests per endpoint first')
+    parser.add_argument('--groups', nargs='+', default=['read', 'write', 'ml'], help='endpoint groups: read write ml')
+    parser.add_argument('--endpoints', nargs='*', help='only endpoints whose name contains one of these')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the ETag response cache on (default: every request runs its view)')
+    parser.add_argument('--fixture-dir', default=FIXTURE_DIR, help='seeded databases are kept here and reused')
+    parser.add_argument('--reseed', action='store_true', help='rebuild the seeded database')
+    parser.add_argument('--output', default='endpoint_benchmark.json', help='JSON report path')
+    args = parser.parse_args()
+
+    count = SCALES.get(args.scale) or int(args.scale)
+    os.makedirs(args.fixture_dir, exist_ok=True)
+    path = fixture_path(count, args.fixture_dir)
+    if args.reseed and os.path.exists(path):
+        os.remove(path)
+    fresh = not os.path.exists(path)
+
+    print("=" * 60)
+    print("ENDPOINT BENCHMARK SUITE")
+    print("=" * 60)
+    configure(path, args.warm_cache)
+    if fresh:
+        print(f"Seeding {count:,} personnel into {path}")
+        seed(count)
+    else:
+        print(f"Using seeded database {path}")
+
+    from personnel.metrics import registry
+    from personnel.models import Equipment, Personnel
+
+    user = bench_user()
+    context = {
+        'personnel_id': Personnel.objects.order_by('personnel_id').values_list('personnel_id', flat=True)[count // 2],
+        'equipment_id': Equipment.objects.order_by('equipment_id').values_list('equipment_id', flat=True).first(),
+    }
+    endpoints = [endpoint for endpoint in ENDPOINTS if endpoint[4] in args.groups]
+    if args.endpoints:
+        endpoints = [endpoint for endpoint in endpoints if any(name in endpoint[0] for name in args.endpoints)]
+
+    results = []
+    print()
+    print(f"{'endpoint':<26}{'clients':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>8}{'queries':>9}{'errors':>8}")
+    for name, method, path_template, body, group in endpoints:
+        path, body = fill(path_template, context), fill(body, context)
+        route = route_of(path)
+        for clients in args.clients:
+            registry.reset()
+            latencies, statuses, elapsed = run_endpoint(method, path, body, clients, args.requests, args.warmup, user)
+            queries = registry._histograms.get(('request_sql_queries', route, method))
+            result = {
+                'endpoint': name, 'group': group, 'method': method, 'path': path, 'scale': count, 'clients': clients,
+                'requests': len(latencies), 'errors': sum(status >= 400 for status in statuses),
+                'statuses': sorted(set(statuses)),
+                'p50_ms': round(percentile(latencies, 0.50), 3), 'p95_ms': round(percentile(latencies, 0.95), 3),
+                'p99_ms': round(percentile(latencies, 0.99), 3),
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+                'queries_per_request': round(queries.sum / queries.count, 2) if queries and queries.count else None,
+            }
+            results.append(result)
+            print(f"{name:<26}{clients:>8}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}"
+                  f"{result['throughput_rps']:>8.1f}{result['queries_per_request'] if result['queries_per_request'] is not None else '-':>9}"
+                  f"{result['errors']:>8}")
+
+    import django
+    report = {
+        'meta': {
+            'scale': count, 'clients': args.clients, 'requests': args.requests, 'warm_cache': args.warm_cache,
+            'python': platform.python_version(), 'django': django.get_version(), 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'created_at': datetime.datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print()
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
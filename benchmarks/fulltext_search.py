@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Full-text search benchmark
+Compares the FTS5 index over HR free text with the icontains (LIKE '%term%') scans it replaces
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from personnel.fulltext import FULLTEXT_SOURCES, FULLTEXT_TABLE, fulltext_schema_sql, search_fulltext
+
+SOURCES = {name: FULLTEXT_SOURCES[name] for name in ('hr_description', 'leave_reason')}
+
+PHRASES = [
+    'commended for outstanding performance during night operations',
+    'counselled regarding late reporting to duty',
+    'completed advanced navigation course with distinction',
+    'recommended for promotion board consideration',
+    'requested transfer to southern air command for family reasons',
+    'medical leave following knee injury during training sortie',
+    'annual leave to attend family wedding',
+    'participated in humanitarian relief operations after floods',
+    'awarded commendation for quick response to engine fire',
+    'warned for unauthorised absence from station',
+    'volunteered as instructor for junior pilot conversion training',
+    'temporary duty at forward base for exercise preparations'
+]
+RARE_WORDS = ['garuda', 'tarang', 'shakti', 'vayu', 'cope', 'pitch', 'black', 'red', 'flag', 'desert', 'knight']
+QUERIES = ['operations', 'knee injury', 'promotion board', 'garuda exercise', 'instructor pilot', 'tarang shakti']
+
+
+def create_database(path, rows, seed=42):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE personnel_hrrecord (id INTEGER PRIMARY KEY, description TEXT, personnel_id TEXT)')
+    conn.execute('CREATE TABLE personnel_leaverequest (id INTEGER PRIMARY KEY, reason TEXT, personnel_id TEXT)')
+    for statement in fulltext_schema_sql(SOURCES):
+        conn.execute(statement)
+
+    def texts(count):
+        for i in range(count):
+            text = rng.choice(PHRASES)
+            if rng.random() < 0.3:
+                text += ' and ' + rng.choice(PHRASES)
+            if rng.random() < 0.05:
+                text += f' during exercise {rng.choice(RARE_WORDS)} {rng.choice(RARE_WORDS)}'
+            yield i + 1, text, f'IAF{rng.randint(1, 100000):06d}'
+
+    started = time.perf_counter()
+    with conn:
+        conn.executemany('INSERT INTO personnel_hrrecord VALUES (?, ?, ?)', texts(rows))
+        conn.executemany('INSERT INTO personnel_leaverequest VALUES (?, ?, ?)', texts(rows // 4))
+    print(f"Inserted {rows + rows // 4:,} rows (FTS triggers active) in {time.perf_counter() - started:.1f}s")
+    return conn
+
+
+def time_call(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def icontains_where(query):
+    """What HRRecord.objects.filter(description__icontains=...) compiles to on SQLite, for every word"""
+    words = query.split()
+    return ' AND '.join(["description LIKE ? ESCAPE '\\'"] * len(words)), [f'%{word}%' for word in words]
+
+
+def icontains_page(conn, query):
+    where, params = icontains_where(query)
+    return conn.execute(f'SELECT id, description FROM personnel_hrrecord WHERE {where} LIMIT 21', params).fetchall()
+
+
+def icontains_count(conn, query):
+    where, params = icontains_where(query)
+    return conn.execute(f'SELECT count(*) FROM personnel_hrrecord WHERE {where}', params).fetchone()[0]
+
+
+def fulltext_page(conn, query):
+    return search_fulltext(query, 'hr_manager', sources=['hr_description'], cursor=conn)['results']
+
+
+def fulltext_count(conn, query):
+    return conn.execute(
+        f"SELECT count(*) FROM {FULLTEXT_TABLE} WHERE {FULLTEXT_TABLE} MATCH ? AND (rowid & 7) = ?",
+        (' AND '.join(f'"{word}"' for word in query.split()), FULLTEXT_SOURCES['hr_description'][0])
+    ).fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FTS5 search against icontains scans')
+    parser.add_argument('--rows', type=int, default=1000000, help='number of HR records')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("FULL-TEXT SEARCH BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_database(os.path.join(directory, 'fulltext.sqlite3'), args.rows)
+        print()
+        print(f"{'':<18}{'---- icontains ms ----':>24}{'------ fts5 ms ------':>24}")
+        print(f"{'query':<18}{'hits':>9}{'page':>7}{'count':>8}{'hits':>9}{'page':>7}{'count':>8}")
+        for query in QUERIES:
+            like_page, _ = time_call(lambda: icontains_page(conn, query), args.repeat)
+            like_count, like_total = time_call(lambda: icontains_count(conn, query), args.repeat)
+            fts_page, _ = time_call(lambda: fulltext_page(conn, query), args.repeat)
+            fts_count, fts_total = time_call(lambda: fulltext_count(conn, query), args.repeat)
+            print(f"{query:<18}{like_total:>9,}{like_page * 1000:>7.1f}{like_count * 1000:>8.1f}"
+                  f"{fts_total:>9,}{fts_page * 1000:>7.1f}{fts_count * 1000:>8.1f}")
+
+        print()
+        print("icontains pages are unranked first matches; fts5 pages are BM25-ranked with snippets,")
+        print("so every hit is scored and the page cost grows with the number of matches.")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
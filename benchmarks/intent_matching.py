@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Intent matching benchmark for the IAF chatbots and voice command system
+Compares the compiled single-pass IntentMatcher with the per-pattern loops it replaced
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from iaf_chatbot import IAFChatbot
+from intelligent_chatbot import IntelligentChatbot
+
+try:
+    from nlp_voice_system import VoiceNLPSystem
+except ImportError:
+    VoiceNLPSystem = None
+
+OPENERS = ['', 'please ', 'can you ', 'i need to ', 'quickly ', 'show me ', 'check ', 'get ']
+SUBJECTS = [
+    'attrition risk', 'who might leave', 'readiness score', 'mission ready crews', 'leadership potential',
+    'career path', 'promotion timeline', 'training needs', 'skill gap', 'health status', 'stress level',
+    'mission suitable pilots', 'unit stats', 'squadron info', 'policy on leave', 'leave balance',
+    'posting orders', 'transfer request', 'salary slip', 'flying pay', 'aircraft type', 'helicopter fleet',
+    'personnel details', 'officer record', 'medical report', 'equipment status', 'weather forecast',
+    'base status', 'how many officers', 'course recommendation', 'deployment status', 'fitness level'
+]
+QUALIFIERS = ['', ' for my unit', ' in western air command', ' this quarter', ' for wing commanders',
+              ' at hindon air force station', ' compared with last year', ' and the trend']
+
+
+def build_corpus(size, seed=42):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        query = rng.choice(OPENERS) + rng.choice(SUBJECTS) + rng.choice(QUALIFIERS)
+        if rng.random() < 0.3:
+            query += ' and ' + rng.choice(SUBJECTS)
+        corpus.append(query)
+    return corpus
+
+
+def legacy_regex_intent(patterns, message, default):
+    message_lower = message.lower()
+    for intent, intent_patterns in patterns.items():
+        if isinstance(intent_patterns, str):
+            intent_patterns = [intent_patterns]
+        for pattern in intent_patterns:
+            if re.search(pattern, message_lower):
+                return intent
+    return default
+
+
+def legacy_keyword_intent(intents, query, default):
+    query = query.lower()
+    for intent_type, keywords in intents.items():
+        if any(keyword in query for keyword in keywords):
+            return intent_type
+    return default
+
+
+def legacy_regex_scores(patterns, message):
+    message_lower = message.lower()
+    scores = {}
+    for intent, intent_patterns in patterns.items():
+        if isinstance(intent_patterns, str):
+            intent_patterns = [intent_patterns]
+        hits = sum(1 for pattern in intent_patterns if re.search(pattern, message_lower))
+        if hits:
+            scores[intent] = hits
+    return scores
+
+
+def legacy_keyword_scores(intents, query):
+    query = query.lower()
+    scores = {}
+    for intent_type, keywords in intents.items():
+        hits = sum(1 for keyword in keywords if keyword in query)
+        if hits:
+            scores[intent_type] = hits
+    return scores
+
+
+def time_per_query(func, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in corpus:
+            func(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus)
+
+
+def run_case(name, legacy, legacy_scores, matcher, corpus, repeat):
+    legacy_time = time_per_query(legacy, corpus, repeat)
+    scoring_time = time_per_query(legacy_scores, corpus, repeat)
+    compiled_time = time_per_query(matcher.best, corpus, repeat)
+
+    legacy_intents = [legacy(query) for query in corpus]
+    compiled_intents = [matcher.best(query) for query in corpus]
+    agreement = sum(a == b for a, b in zip(legacy_intents, compiled_intents)) / len(corpus)
+    same_scores = sum(legacy_scores(query) == matcher.scores(query) for query in corpus) / len(corpus)
+
+    print(f"{name}")
+    print(f"  legacy first-hit: {legacy_time * 1e6:8.2f} us/query ({1 / legacy_time:,.0f} queries/sec)")
+    print(f"  legacy scoring  : {scoring_time * 1e6:8.2f} us/query ({1 / scoring_time:,.0f} queries/sec)")
+    print(f"  compiled matcher: {compiled_time * 1e6:8.2f} us/query ({1 / compiled_time:,.0f} queries/sec)")
+    print(f"  speedup         : {legacy_time / compiled_time:.2f}x vs first-hit, "
+          f"{scoring_time / compiled_time:.2f}x vs scoring")
+    print(f"  same scores     : {same_scores * 100:.1f}%")
+    print(f"  same top intent : {agreement * 100:.1f}% (differences are multi-intent queries now scored by hits)")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chatbot intent matching')
+    parser.add_argument('--queries', type=int, default=5000, help='number of synthetic queries')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.queries)
+
+    print("=" * 60)
+    print("INTENT MATCHING BENCHMARK")
+    print("=" * 60)
+    print(f"Corpus: {len(corpus)} synthetic queries")
+    print()
+
+    run_case(
+        'IAFChatbot._detect_intent',
+        lambda q: legacy_regex_intent(IAFChatbot.intent_patterns, q, 'general_inquiry'),
+        lambda q: legacy_regex_scores(IAFChatbot.intent_patterns, q),
+        IAFChatbot.intent_matcher, corpus, args.repeat
+    )
+    run_case(
+        'IntelligentChatbot.analyze_intent',
+        lambda q: legacy_keyword_intent(IntelligentChatbot.intent_keywords, q, 'general'),
+        lambda q: legacy_keyword_scores(IntelligentChatbot.intent_keywords, q),
+        IntelligentChatbot.intent_matcher, corpus, args.repeat
+    )
+    if VoiceNLPSystem is not None:
+        run_case(
+            'VoiceNLPSystem.process_voice_command',
+            lambda q: legacy_regex_intent(VoiceNLPSystem.command_patterns, q, 'unknown'),
+            lambda q: legacy_regex_scores(VoiceNLPSystem.command_patterns, q),
+            VoiceNLPSystem.command_matcher, corpus, args.repeat
+        )
+    else:
+        print("VoiceNLPSystem skipped (voice dependencies not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+ML training and inference benchmark
+Times AdvancedIAFMLModels on synthetic personnel from generate_data.py: feature engineering,
+each train_* method, pickle size and load time, single-row predict_* latency and batch
+throughput, at one or more dataset sizes; writes a JSON report with stable keys so runs
+can be diffed
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+import platform
+import tempfile
+import contextlib
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+sys.path.append(ROOT)
+
+from ai_models.lazy_imports import is_available
+
+# train method, model key, pickle it writes, public predict method (DBSCAN has none)
+STEPS = [
+    ('train_advanced_attrition_model', 'attrition', 'advanced_attrition_model.pkl', 'predict_attrition_risk'),
+    ('train_readiness_prediction_model', 'readiness', 'advanced_readiness_model.pkl', 'predict_readiness'),
+    ('train_leadership_assessment_model', 'leadership', 'advanced_leadership_model.pkl', 'predict_leadership_potential'),
+    ('train_career_trajectory_model', 'career_trajectory', 'career_trajectory_model.pkl', 'predict_career_trajectory'),
+    ('train_mission_optimization_model', 'mission_optimization', 'mission_optimization_model.pkl', 'predict_mission_suitability'),
+    ('train_wellness_prediction_model', 'wellness', 'wellness_model.pkl', 'predict_wellness_risk'),
+    ('train_skill_gap_analysis_model', 'skill_clustering', 'advanced_skill_clustering_model.pkl', None),
+]
+
+
+def synthetic_frame(rows, seed):
+    """generate_data.py records, with the *_str columns its CSV export adds"""
+    import pandas as pd
+    import generate_data
+
+    random.seed(seed)
+    generate_data.fake.seed_instance(seed)
+    df = pd.DataFrame(generate_data.generate_synthetic_data(rows))
+    for column in ('skills', 'certifications', 'injury_history'):
+        df[f'{column}_str'] = df[column].apply(lambda x: ','.join(x) if x else '')
+    return df
+
+
+@contextlib.contextmanager
+def quiet(verbose):
+    if verbose:
+        yield
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+
+
+def timed(func, repeat=1):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def latencies_ms(func, repeat):
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {'p50_ms': round(samples[len(samples) // 2], 3), 'p95_ms': round(samples[int(len(samples) * 0.95)], 3)}
+
+
+def batch_throughput(model, X, batch_sizes):
+    """Rows per second of the estimator's own predict on pre-scaled feature matrices"""
+    predict = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+    results = {}
+    for size in batch_sizes:
+        batch = np.resize(X, (size, X.shape[1]))
+        predict(batch)  # warm-up
+        elapsed, _ = timed(lambda: predict(batch), repeat=max(3, min(50, 20000 // size)))
+        results[str(size)] = {'ms': round(elapsed * 1000, 3), 'rows_per_s': round(size / elapsed, 1)}
+    return results
+
+
+def benchmark_size(rows, args, workdir):
+    from ai_models.advanced_ml_models import AdvancedIAFMLModels
+    import joblib
+
+    report = {'rows': rows, 'models': {}}
+    elapsed, df = timed(lambda: synthetic_frame(rows, args.seed))
+    report['generate_s'] = round(elapsed, 3)
+
+    ml_models = AdvancedIAFMLModels()
+    ml_models.df = df
+    with quiet(args.verbose):
+        elapsed, _ = timed(ml_models.advanced_feature_engineering)
+    report['feature_engineering_s'] = round(elapsed, 3)
+    print(f"{rows:,} rows: generated in {report['generate_s']:.1f}s, features engineered in {elapsed:.2f}s")
+    largest_batch = max(args.batch_sizes)
+    print(f"  {'model':<22}{'train s':>9}{'pickle KB':>11}{'load ms':>10}{'p50 ms':>10}{f'rows/s @{largest_batch}':>16}")
+
+    sample = df.sample(min(rows, 50), random_state=args.seed).to_dict('records')
+    for method, key, pickle_name, predict_method in STEPS:
+        if args.models and key not in args.models:
+            continue
+        result = {'status': 'ok'}
+        report['models'][key] = result
+        try:
+            with quiet(args.verbose):
+                elapsed, _ = timed(getattr(ml_models, method))
+        except ImportError as e:
+            result.update(status='skipped', reason=str(e))
+            print(f"  {key:<22}skipped: {e}")
+            continue
+        except Exception as e:
+            # e.g. a stratified split on a dataset too small to hold every class twice
+            result.update(status='failed', reason=f'{type(e).__name__}: {e}')
+            print(f"  {key:<22}failed: {result['reason'][:200]}")
+            continue
+        result['train_s'] = round(elapsed, 3)
+
+        path = os.path.join(workdir, pickle_name)
+        result['pickle_bytes'] = os.path.getsize(path)
+        elapsed, _ = timed(lambda: joblib.load(path), repeat=3)
+        result['load_ms'] = round(elapsed * 1000, 3)
+
+        model = ml_models.models[key]
+        if predict_method is not None:
+            predict = getattr(ml_models, predict_method)
+            rows_iter = iter(sample * (args.repeat // len(sample) + 2))
+            try:
+                result['single_row'] = latencies_ms(lambda: predict(next(rows_iter)), args.repeat)
+            except Exception as e:
+                result['single_row'] = {'error': f'{type(e).__name__}: {e}'}
+            result['batch'] = batch_throughput(model, ml_models.X_scaled, args.batch_sizes)
+
+        single = result.get('single_row', {})
+        batch = result.get('batch', {})
+        largest = batch.get(str(largest_batch), {}).get('rows_per_s')
+        print(f"  {key:<22}{result['train_s']:>9.2f}{result['pickle_bytes'] / 1024:>11.0f}{result['load_ms']:>10.1f}"
+              f"{single.get('p50_ms', '-') if 'error' not in single else 'error':>10}"
+              f"{largest if largest is not None else '-':>16}")
+        if 'error' in single:
+            print(f"    ⚠️ {predict_method}: {single['error'][:200]}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AdvancedIAFMLModels training and inference')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2000], help='synthetic personnel rows per run')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 10000], help='rows per batch predict')
+    parser.add_argument('--repeat', type=int, default=50, help='timed single-row predictions per model')
+    parser.add_argument('--models', nargs='*', help='only these model keys (attrition, readiness, leadership, ...)')
+    parser.add_argument('--seed', type=int, default=42, help='seed for the synthetic data')
+    parser.add_argument('--verbose', action='store_true', help='show the training output of each model')
+    parser.add_argument('--output', default='ml_benchmark.json', help='JSON report path')
+    args = parser.parse_args()
+    args.output = os.path.abspath(args.output)
+
+    print("=" * 60)
+    print("ML TRAINING AND INFERENCE BENCHMARK")
+    print("=" * 60)
+    if not is_available('sklearn'):
+        print("Skipped: scikit-learn is not installed (pip install scikit-learn)")
+        return
+    if not is_available('xgboost'):
+        print("⚠️ xgboost is not installed; models that train it are skipped")
+
+    import pandas as pd
+    import sklearn
+
+    reports = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # train_* methods write their pickles to the working directory
+        os.chdir(workdir)
+        try:
+            for rows in args.sizes:
+                print()
+                reports.append(benchmark_size(rows, args, workdir))
+        finally:
+            os.chdir(cwd)
+
+    xgboost_version = None
+    if is_available('xgboost'):
+        import xgboost
+        xgboost_version = xgboost.__version__
+    report = {
+        'meta': {
+            'sizes': args.sizes, 'batch_sizes': args.batch_sizes, 'repeat': args.repeat, 'seed': args.seed,
+            'python': platform.python_version(), 'pandas': pd.__version__, 'sklearn': sklearn.__version__,
+            'xgboost': xgboost_version, 'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds')
+        },
+        'results': reports
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print()
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Organizational network benchmark
+Compares the pairwise NetworkX graph network_analysis used to build with the sparse
+unit-hub OrgGraph (analytic degree centrality, pivot-sampled betweenness)
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from org_graph import OrgGraph
+
+UNITS = ['No. 1 Squadron', 'No. 7 Squadron', 'No. 17 Squadron', 'No. 45 Squadron', 'No. 220 Squadron',
+         'Western Air Command', 'Eastern Air Command', 'Southern Air Command', 'Central Air Command',
+         'South Western Air Command', 'Training Command', 'Maintenance Command']
+
+
+def generate_roster(count, posted_fraction=0.15, seed=42):
+    rng = np.random.default_rng(seed)
+    units = rng.choice(UNITS, count)
+    postings = rng.choice(UNITS, count).astype(object)
+    postings[rng.random(count) >= posted_fraction] = None
+    return pd.DataFrame({'id': np.arange(1, count + 1), 'unit': units, 'current_posting': postings})
+
+
+def pairwise_analysis(df, group_columns):
+    """The old construction: an edge for every pair of personnel sharing a group (column, unit)"""
+    G = nx.Graph()
+    G.add_nodes_from(df['id'])
+    for column in group_columns:
+        for unit in UNITS:
+            members = df['id'][df[column] == unit].tolist()
+            for i, person1 in enumerate(members):
+                for person2 in members[i + 1:]:
+                    G.add_edge(person1, person2)
+    centrality = nx.degree_centrality(G)
+    betweenness = nx.betweenness_centrality(G)
+    return G.number_of_edges(), centrality, betweenness
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the organizational network analysis')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1500, 10000, 100000, 500000],
+                        help='roster sizes')
+    parser.add_argument('--pairwise-limit', type=int, default=1500, help='largest roster to run NetworkX on')
+    parser.add_argument('--pivots', type=int, default=64, help='betweenness pivots')
+    parser.add_argument('--time-budget', type=float, default=2.0, help='seconds for betweenness sampling')
+    args = parser.parse_args()
+    group_columns = ('unit', 'current_posting')
+
+    print("=" * 60)
+    print("ORGANIZATIONAL NETWORK BENCHMARK")
+    print("=" * 60)
+    print(f"{len(UNITS)} units, memberships from {', '.join(group_columns)}; "
+          f"{args.pivots} pivots, {args.time_budget}s budget")
+    print()
+    print(f"{'personnel':>10}{'pair edges':>16}{'networkx s':>12}{'hub edges':>11}"
+          f"{'build s':>9}{'degree s':>10}{'btw s':>8}{'pivots':>8}{'top-10':>8}")
+
+    for size in args.sizes:
+        df = generate_roster(size)
+
+        start = time.perf_counter()
+        graph = OrgGraph.from_dataframe(df, group_columns)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        centrality = graph.degree_centrality()
+        degree = time.perf_counter() - start
+        start = time.perf_counter()
+        betweenness, _, used = graph.betweenness(args.pivots, args.time_budget)
+        sampled = time.perf_counter() - start
+
+        networkx_s, overlap = '-', '-'
+        if size <= args.pairwise_limit:
+            start = time.perf_counter()
+            edges, expected_centrality, expected_betweenness = pairwise_analysis(df, group_columns)
+            networkx_s = f"{time.perf_counter() - start:.1f}"
+            assert edges == graph.edge_count()
+            assert np.allclose([expected_centrality[i] for i in df['id']], centrality)
+            # Bridges on the hub graph against exact betweenness on the pairwise graph
+            expected_top = {i for i, _ in sorted(expected_betweenness.items(), key=lambda x: x[1], reverse=True)[:10]}
+            overlap = f"{len(expected_top & {i for i, _ in graph.top(betweenness)})}/10"
+
+        print(f"{size:>10,}{graph.edge_count():>16,}{networkx_s:>12}{graph.adjacency.nnz // 2:>11,}"
+              f"{build:>9.2f}{degree:>10.2f}{sampled:>8.2f}{used:>8}{overlap:>8}")
+
+
+if __name__ == "__main__":
+    main()
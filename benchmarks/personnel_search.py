@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Personnel search index benchmark
+Builds the in-process inverted index over synthetic personnel rows and times lookups
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import resource
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from personnel.search_index import PersonnelSearchIndex
+
+RANKS = ['Air Chief Marshal', 'Air Marshal', 'Air Vice Marshal', 'Air Commodore', 'Group Captain',
+         'Wing Commander', 'Squadron Leader', 'Flight Lieutenant', 'Flying Officer', 'Pilot Officer']
+UNITS = [f'{number} Squadron' for number in range(1, 48)]
+BASES = ['Hindon Air Base', 'Palam Air Base', 'Jodhpur Air Base', 'Pune Air Base', 'Bangalore Air Base',
+         'Gwalior Air Base', 'Kalaikunda Air Base', 'Pathankot Air Base', 'Ambala Air Base', 'Bareilly Air Base',
+         'Bidar Air Base', 'Chandigarh Air Base', 'Halwara Air Base', 'Jaisalmer Air Base', 'Jamnagar Air Base']
+SPECIALIZATIONS = ['Fighter Pilot', 'Transport Pilot', 'Helicopter Pilot', 'Navigator', 'Flight Engineer',
+                   'Air Traffic Controller', 'Radar Operator', 'Communications Specialist', 'Meteorologist',
+                   'Ground Crew', 'Maintenance Engineer', 'Weapons Specialist', 'Intelligence Officer']
+FIRST_NAMES = ['Rajesh', 'Priya', 'Amit', 'Sunita', 'Vikram', 'Kavita', 'Suresh', 'Meera', 'Ravi', 'Anita',
+               'Deepak', 'Pooja', 'Manoj', 'Sita', 'Arun', 'Geeta', 'Kiran', 'Lata', 'Mohan', 'Nisha']
+LAST_NAMES = ['Sharma', 'Patel', 'Singh', 'Kumar', 'Gupta', 'Yadav', 'Verma', 'Agarwal', 'Jain', 'Mishra']
+SYLLABLES = ['ra', 'ja', 'ni', 'ka', 'shi', 'va', 'dev', 'pra', 'mal', 'hot', 'tri', 'bha', 'gan', 'war', 'dha']
+
+QUERIES = {
+    'rare surname': 'shibhadev',
+    'name + base': 'sharma ambala',
+    'rank': 'wing commander',
+    'prefix': 'squ lea hind',
+    'specialization + unit': 'fighter pilot 17 squadron',
+    'no match (relaxed)': 'sharma xyzzy'
+}
+
+
+def generate_rows(count, seed=42):
+    rng = random.Random(seed)
+    # A long tail of generated surnames alongside the common ones, like a real roster
+    surnames = LAST_NAMES + [
+        ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize() for _ in range(5000)
+    ]
+    for i in range(count):
+        yield {
+            'personnel_id': f'IAF{i:07d}',
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(surnames)}',
+            'rank': rng.choice(RANKS),
+            'unit': rng.choice(UNITS),
+            'base_location': rng.choice(BASES),
+            'specialization': rng.choice(SPECIALIZATIONS),
+            'status': 'Active'
+        }
+
+
+def time_query(index, query, repeat):
+    index._result_cache.clear()
+    index._prefix_cache.clear()
+    start = time.perf_counter()
+    result = index.search(query, limit=20)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index.search(query, limit=20, page=2)
+    warm = (time.perf_counter() - start) / repeat
+    return result['total_count'], cold, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the personnel search index')
+    parser.add_argument('--rows', type=int, default=500000, help='number of synthetic personnel rows')
+    parser.add_argument('--repeat', type=int, default=200, help='warm lookups per query')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PERSONNEL SEARCH INDEX BENCHMARK")
+    print("=" * 60)
+
+    index = PersonnelSearchIndex()
+    rows = list(generate_rows(args.rows))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index.build(rows)
+    queries = {'exact name': rows[len(rows) // 2]['name'], **QUERIES}
+    del rows
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(f"Index size: ~{memory / 1024:.0f} MB peak RSS growth for {args.rows:,} rows")
+    print()
+
+    print(f"{'query':<24}{'hits':>9}{'cold ms':>10}{'cached ms':>11}")
+    for name, query in queries.items():
+        total, cold, warm = time_query(index, query, args.repeat)
+        print(f"{name:<24}{total:>9,}{cold * 1000:>10.3f}{warm * 1000:>11.3f}")
+
+    updates = 1000
+    start = time.perf_counter()
+    for i in range(updates):
+        index.update({'personnel_id': f'IAF{i:07d}', 'name': 'Updated Name', 'rank': 'Air Marshal',
+                      'unit': '1 Squadron', 'base_location': 'Palam Air Base', 'specialization': 'Navigator',
+                      'status': 'Active'})
+    print()
+    print(f"Incremental update: {(time.perf_counter() - start) * 1000 / updates:.3f} ms/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Response encoding benchmark
+Payload size and encode time of the personnel list: stdlib JSON vs orjson, record vs
+columnar layout, uncompressed vs gzip vs brotli
+"""
+
+import os
+import sys
+import time
+import gzip
+import json
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iaf_hms.settings')
+
+import django
+
+django.setup()
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from personnel.encoding import brotli, columnar, dumps, orjson
+from personnel.models import Personnel
+
+UNITS = [f'No. {n} Squadron' for n in range(1, 40)]
+BASES = ['Hindon', 'Palam', 'Jodhpur', 'Pune', 'Ambala', 'Gwalior', 'Tezpur', 'Jamnagar']
+RANKS = ['Wing Commander', 'Squadron Leader', 'Flight Lieutenant', 'Flying Officer', 'Pilot Officer']
+
+
+def personnel_rows(count):
+    """Rows shaped like Personnel.objects.values()"""
+    today = datetime.date.today()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [{
+        'personnel_id': f'IAF{i:06d}', 'name': f'Officer {i}', 'rank': RANKS[i % len(RANKS)],
+        'unit': UNITS[i % len(UNITS)], 'base_location': BASES[i % len(BASES)],
+        'date_of_birth': today - datetime.timedelta(days=9000 + i % 5000), 'date_of_joining': today,
+        'years_of_service': i % 30, 'specialization': 'Pilot', 'status': 'Active', 'contact_number': '9800000000',
+        'email': f'officer{i}@iaf.in', 'emergency_contact': 'Next of kin', 'blood_group': 'O+',
+        'marital_status': 'Single', 'performance_score': 60 + (i * 7) % 40 + 0.5, 'leadership_score': (i * 3) % 10 + 0.25,
+        'technical_score': (i * 11) % 100 / 1.5, 'attrition_risk': (i % 97) / 97, 'readiness_score': 60 + i % 40,
+        'leadership_potential': 'Medium', 'created_at': now, 'updated_at': now
+    } for i in range(count)]
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding and compression of the personnel list')
+    parser.add_argument('--personnel', type=int, default=20000, help='rows in the payload')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("RESPONSE ENCODING BENCHMARK")
+    print("=" * 60)
+    print(f"{args.personnel:,} personnel rows, {len(Personnel._meta.concrete_fields)} fields; "
+          f"orjson {'installed' if orjson else 'missing'}, brotli {'installed' if brotli else 'missing'}")
+    print()
+
+    rows = personnel_rows(args.personnel)
+    columns = list(rows[0])
+    encodings = [
+        ('stdlib records', lambda: json.dumps(rows, cls=DjangoJSONEncoder).encode()),
+        ('dumps records', lambda: dumps(rows)),
+        ('dumps columnar', lambda: dumps(columnar([[row[c] for c in columns] for row in rows], columns))),
+    ]
+
+    print(f"{'encoding':<18}{'encode ms':>11}{'raw KB':>10}{'gzip KB':>10}{'gzip ms':>9}{'br KB':>9}{'br ms':>8}")
+    for name, encode in encodings:
+        encode_s, body = timed(encode)
+        gzip_s, gzipped = timed(lambda: gzip.compress(body, compresslevel=6, mtime=0))
+        line = f"{name:<18}{encode_s * 1000:>11.1f}{len(body) / 1024:>10.0f}{len(gzipped) / 1024:>10.0f}{gzip_s * 1000:>9.1f}"
+        if brotli is not None:
+            br_s, compressed = timed(lambda: brotli.compress(body, quality=4))
+            line += f"{len(compressed) / 1024:>9.0f}{br_s * 1000:>8.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
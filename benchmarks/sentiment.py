@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Sentiment service benchmark
+Texts/sec for the per-request word scans versus the batched, cached SentimentService
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from sentiment_service import SentimentService, build_lexicon, POSITIVE_WORDS, NEGATIVE_WORDS
+
+FRAGMENTS = [
+    'morale in the squadron is good', 'crew are stressed after back to back sorties',
+    'maintenance backlog has everyone worried', 'proud of the team after the exercise',
+    'leave approvals are slow and people are frustrated', 'new simulator training is excellent',
+    'mess facilities need attention', 'families are concerned about the posting',
+    'flight line discipline remains steady', 'motivated to take on the instructor course',
+    'night flying roster was announced', 'satisfied with the promotion board outcome'
+]
+
+
+def build_texts(count, duplicate_ratio, seed=42):
+    rng = random.Random(seed)
+    unique = []
+    texts = []
+    for _ in range(count):
+        if unique and rng.random() < duplicate_ratio:
+            texts.append(rng.choice(unique))
+            continue
+        text = '. '.join(rng.sample(FRAGMENTS, rng.randint(2, 5))) + f'. Ref {rng.randint(1, 10 ** 9)}'
+        unique.append(text)
+        texts.append(text)
+    return texts
+
+
+def synthetic_words(count, seed=7):
+    """Extra lexicon entries, standing in for a full sentiment lexicon"""
+    rng = random.Random(seed)
+    return [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9))) for _ in range(count)]
+
+
+def legacy_sentiment(text, positive_words, negative_words):
+    """VoiceNLPSystem.sentiment_analysis before the service: one substring scan per word"""
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    return {
+        'positive_count': positive_count,
+        'negative_count': negative_count,
+        'keywords': {
+            'positive': [word for word in positive_words if word in text_lower],
+            'negative': [word for word in negative_words if word in text_lower]
+        }
+    }
+
+
+def report(name, count, elapsed):
+    print(f"{name:<34}{elapsed:8.2f}s {count / elapsed:>12,.0f} texts/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sentiment scoring throughput')
+    parser.add_argument('--texts', type=int, default=100000, help='number of texts')
+    parser.add_argument('--duplicates', type=float, default=0.3, help='fraction of repeated texts')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes for the pool run')
+    parser.add_argument('--lexicon-size', type=int, default=0,
+                        help='pad the lexicon with this many extra words per polarity (0 = built-in lexicon)')
+    args = parser.parse_args()
+
+    texts = build_texts(args.texts, args.duplicates)
+    positive_words = POSITIVE_WORDS + synthetic_words(args.lexicon_size, seed=1)
+    negative_words = NEGATIVE_WORDS + synthetic_words(args.lexicon_size, seed=2)
+    lexicon = build_lexicon(positive_words, negative_words)
+
+    print("=" * 60)
+    print("SENTIMENT SERVICE BENCHMARK")
+    print("=" * 60)
+    print(f"Texts: {len(texts):,} ({len(set(texts)):,} distinct), lexicon {len(lexicon):,} words, "
+          f"{args.workers} CPU workers available")
+    print()
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_sentiment(text, positive_words, negative_words)
+    report('legacy per-text word scans', len(texts), time.perf_counter() - start)
+
+    service = SentimentService(lexicon, workers=1)
+    start = time.perf_counter()
+    for text in texts:
+        service.analyze(text)
+    report('service.analyze, one at a time', len(texts), time.perf_counter() - start)
+
+    service = SentimentService(lexicon, workers=1)
+    start = time.perf_counter()
+    service.analyze_batch(texts)
+    report('analyze_batch, cold, in-process', len(texts), time.perf_counter() - start)
+
+    pooled = SentimentService(lexicon, workers=args.workers, parallel_threshold=1)
+    pooled.analyze_batch(texts[:args.workers])  # start the pool outside the timing
+    pooled.cache = SentimentService(lexicon, workers=1).cache
+    start = time.perf_counter()
+    pooled.analyze_batch(texts)
+    report(f'analyze_batch, cold, {args.workers} processes', len(texts), time.perf_counter() - start)
+    pooled.shutdown()
+
+    start = time.perf_counter()
+    service.analyze_batch(texts)
+    report('analyze_batch, warm cache', len(texts), time.perf_counter() - start)
+    print()
+    print(f"Cache: {service.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark
+Runs `python -X importtime` on server startup and on each AI module import, reports the
+slowest imports, and exits non-zero when startup exceeds the budget or pulls in a
+library that should only be imported on first use
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+sys.path.append(ROOT)
+
+from ai_models.lazy_imports import CAPABILITIES
+
+# What a worker process imports before serving its first request
+STARTUP_CODE = (
+    "import django; django.setup(); "
+    "import iaf_hms.urls, personnel.views, personnel.chatbot_views"
+)
+MODULE_IMPORTS = {
+    'nlp_voice_system': 'import ai_models.nlp_voice_system',
+    'computer_vision': 'import ai_models.computer_vision',
+    'deep_learning_models': 'import ai_models.deep_learning_models',
+    'advanced_ml_models': 'import ai_models.advanced_ml_models',
+}
+DEFERRED_MODULES = sorted({name for names in CAPABILITIES.values() for name in names})
+
+LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_profile(code):
+    """(module, cumulative us, depth) for every import the code triggers"""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='iaf_hms.settings', PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            imports.append((match.group(4), int(match.group(2)), len(match.group(3)) // 2))
+    return imports
+
+
+def total_ms(imports):
+    return sum(cumulative for _, cumulative, depth in imports if depth == 0) / 1000
+
+
+def best_of(code, repeat):
+    profiles = [import_profile(code) for _ in range(repeat)]
+    return min(profiles, key=total_ms)
+
+
+def report(name, imports, top):
+    print(f"{name:<24}{total_ms(imports):>10.1f} ms  ({len(imports)} modules)")
+    # Modules imported directly by the top-level imports are where the time goes
+    heaviest = sorted((entry for entry in imports if entry[2] == 1), key=lambda entry: -entry[1])[:top]
+    for module, cumulative, _ in heaviest:
+        print(f"    {module:<40}{cumulative / 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure server startup import time')
+    parser.add_argument('--budget-ms', type=float, default=1500,
+                        help='fail when startup imports take longer than this')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is reported)')
+    parser.add_argument('--top', type=int, default=5, help='slowest imports to list per measurement')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("STARTUP IMPORT-TIME BENCHMARK")
+    print("=" * 60)
+
+    startup = best_of(STARTUP_CODE, args.repeat)
+    report('server startup', startup, args.top)
+    for name, code in MODULE_IMPORTS.items():
+        report(name, best_of(code, args.repeat), args.top)
+
+    failures = []
+    startup_ms = total_ms(startup)
+    if startup_ms > args.budget_ms:
+        failures.append(f"startup took {startup_ms:.0f} ms, budget is {args.budget_ms:.0f} ms")
+    loaded = {module for module, _, _ in startup}
+    eager = [module for module in DEFERRED_MODULES if module in loaded]
+    if eager:
+        failures.append(f"imported at startup instead of on first use: {', '.join(eager)}")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK: startup {startup_ms:.0f} ms within the {args.budget_ms:.0f} ms budget, no deferred library loaded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Theme extraction benchmark
+Compares the dense TF-IDF column mean extract_key_themes used to do with the sparse
+column mean and the chunked StreamingThemeExtractor
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from nlp_models import StreamingThemeExtractor, _top_indices
+
+PERFORMANCE = ['excellent', 'good', 'satisfactory', 'needs improvement', 'outstanding']
+COURSES = ['Fighter Training', 'Leadership Course', 'Technical Training', 'Cyber Security', 'Medical Training']
+DETAILS = [
+    "Shows strong analytical thinking and decision-making capabilities.",
+    "Requires additional support in complex scenarios.",
+    "Demonstrates natural leadership qualities and team coordination.",
+    "Excellent technical proficiency and attention to detail.",
+    "Needs improvement in stress management and time management.",
+    "Outstanding performance under pressure situations.",
+    "Shows potential for advanced responsibilities.",
+    "Requires focused training in specific technical areas."
+]
+UNITS = [f'{number} Squadron' for number in range(1, 48)]
+RANKS = ['Group Captain', 'Wing Commander', 'Squadron Leader', 'Flight Lieutenant', 'Flying Officer', 'Pilot Officer']
+TYPES = ['training', 'performance', 'medical', 'leadership']
+
+
+def generate_feedback(count, seed=42):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        'feedback_text': [
+            f"Officer showed {rng.choice(PERFORMANCE)} aptitude in {rng.choice(COURSES)}. "
+            f"{rng.choice(DETAILS)} {rng.choice(DETAILS)} Ref {rng.randint(1, 50000)}"
+            for _ in range(count)
+        ],
+        'unit': [rng.choice(UNITS) for _ in range(count)],
+        'rank': [rng.choice(RANKS) for _ in range(count)],
+        'feedback_type': [rng.choice(TYPES) for _ in range(count)]
+    })
+
+
+def dense_themes(texts):
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    matrix = vectorizer.fit_transform(texts)
+    mean_scores = np.mean(matrix.toarray(), axis=0)
+    return list(vectorizer.get_feature_names_out()[mean_scores.argsort()[-20:][::-1]])
+
+
+def sparse_themes(texts):
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    matrix = vectorizer.fit_transform(texts)
+    mean_scores = np.asarray(matrix.mean(axis=0)).ravel()
+    return list(vectorizer.get_feature_names_out()[_top_indices(mean_scores, 20)])
+
+
+def streaming_themes(frame, chunk_size):
+    extractor = StreamingThemeExtractor()
+    for start in range(0, len(frame), chunk_size):
+        extractor.partial_fit_records(frame.iloc[start:start + chunk_size])
+    return extractor.top_themes(20)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark feedback theme extraction')
+    parser.add_argument('--docs', type=int, default=100000, help='number of synthetic feedback records')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='records per streaming chunk')
+    parser.add_argument('--dense-limit', type=int, default=100000,
+                        help='skip the dense baseline above this many records (it needs docs x 8 KB)')
+    args = parser.parse_args()
+
+    frame = generate_feedback(args.docs)
+    texts = frame['feedback_text'].tolist()
+
+    print("=" * 60)
+    print("THEME EXTRACTION BENCHMARK")
+    print("=" * 60)
+    print(f"Feedback records: {args.docs:,}")
+    print()
+
+    if args.docs <= args.dense_limit:
+        dense, elapsed, peak = measure(dense_themes, texts)
+        print(f"dense toarray() mean : {elapsed:6.2f}s  peak {peak / 1024 / 1024:8.1f} MB")
+    else:
+        dense = None
+        print(f"dense toarray() mean : skipped (would allocate ~{args.docs * 8000 / 1024 / 1024:,.0f} MB)")
+
+    sparse_result, elapsed, peak = measure(sparse_themes, texts)
+    print(f"sparse CSR mean      : {elapsed:6.2f}s  peak {peak / 1024 / 1024:8.1f} MB")
+
+    streamed, elapsed, peak = measure(streaming_themes, frame, args.chunk_size)
+    print(f"streaming, per group : {elapsed:6.2f}s  peak {peak / 1024 / 1024:8.1f} MB "
+          f"({len(streamed['unit'])} units, {len(streamed['rank'])} ranks, {len(streamed['feedback_type'])} types)")
+
+    print()
+    if dense is not None:
+        print(f"Sparse top themes identical to dense: {set(dense) == set(sparse_result)}")
+    overlap = len(set(sparse_result) & set(streamed['overall'])) / len(sparse_result)
+    print(f"Streaming overall top-20 overlap with TF-IDF: {overlap * 100:.0f}%")
+    print(f"Top themes: {', '.join(streamed['overall'][:8])}")
+
+
+if __name__ == "__main__":
+    main()
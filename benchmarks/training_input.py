@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Deep learning input pipeline benchmark
+Compares the up-front float64 arrays train_models used to allocate with streamed float32
+batches (plain generator, and the tf.data pipeline when TensorFlow is installed)
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from lazy_imports import is_available
+from training_data import DATASETS, batches, make_dataset, plan_batches, write_shards
+
+BATCH_SIZES = {'behavior': 32, 'mission_lstm': 32, 'facial_recognition': 16}
+
+
+def eager_mb(name):
+    """Size of the np.random.rand(...) inputs plus float64 labels the old code built before training"""
+    spec = DATASETS[name]
+    values = spec['samples'] * (np.prod(spec['shape']) + (spec['classes'] or 1))
+    return values * 8 / 1024 / 1024
+
+
+def stream(iterable):
+    tracemalloc.start()
+    start = time.perf_counter()
+    samples = 0
+    for x, _ in iterable:
+        samples += len(x)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return samples, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the deep learning input pipelines')
+    parser.add_argument('--memory-budget-mb', type=int, default=256, help='budget for batches in flight')
+    parser.add_argument('--face-shards', type=int, default=2000,
+                        help='face crops to write as on-disk shards for the shard-reading path (0 to skip)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("DEEP LEARNING INPUT PIPELINE BENCHMARK")
+    print("=" * 60)
+    print(f"Memory budget: {args.memory_budget_mb} MB")
+    print()
+    print(f"{'dataset':<28}{'eager MB':>10}{'stream MB':>11}{'samples/s':>11}{'batch':>7}{'planned MB':>12}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.face_shards:
+            rng = np.random.default_rng(42)
+            write_shards(directory, 'facial_recognition',
+                         rng.integers(0, 256, (args.face_shards, 128, 128, 3), dtype=np.uint8),
+                         rng.integers(0, 1000, args.face_shards), shard_size=500)
+
+        runs = [(name, None) for name in DATASETS]
+        if args.face_shards:
+            runs.append(('facial_recognition', directory))
+        for name, root in runs:
+            plan = plan_batches(name, BATCH_SIZES[name], args.memory_budget_mb)
+            samples, elapsed, peak = stream(batches(name, root, plan['batch_size']))
+            label = f"{name}{' (shards)' if root else ''}"
+            print(f"{label:<28}{eager_mb(name):>10,.0f}{peak:>11.1f}{samples / elapsed:>11,.0f}"
+                  f"{plan['batch_size']:>7}{plan['peak_mb']:>12.1f}")
+
+        print()
+        if not is_available('tensorflow'):
+            print("tf.data pipeline: skipped (TensorFlow is not installed)")
+            return
+        print("tf.data pipeline (parallel map + prefetch):")
+        for name, root in runs:
+            dataset = make_dataset(name, root, BATCH_SIZES[name], memory_budget_mb=args.memory_budget_mb)
+            start = time.perf_counter()
+            samples = sum(int(x.shape[0]) for x, _ in dataset)
+            print(f"  {name:<24}{samples / (time.perf_counter() - start):>11,.0f} samples/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Workforce reallocation benchmark
+Compares the per-unit-pair DataFrame filtering and iterrows loops in AdvancedAnalytics with
+the groupby + min-cost flow reallocation planner and the vectorized skill helpers
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
+
+from advanced_analytics import AdvancedAnalytics
+from workforce_planner import plan_reallocations
+
+BRANCHES = {
+    'Flying': ['Fighter Aircraft', 'Transport Aircraft', 'Helicopter Operations', 'Navigation', 'Air Combat'],
+    'Technical': ['Aircraft Maintenance', 'Avionics', 'Radar Systems', 'Communication Systems', 'Weapon Systems'],
+    'Ground Duty': ['Administration', 'Logistics', 'Intelligence', 'Meteorology', 'Air Traffic Control'],
+    'Medical': ['Aviation Medicine', 'Emergency Medicine', 'Preventive Medicine', 'Psychology'],
+    'Education': ['Training', 'Simulation', 'Technical Education', 'Leadership Development']
+}
+
+
+def generate_roster(count, units, seed=42):
+    """Roster with uneven unit sizes (some units far above and below the average)"""
+    rng = np.random.default_rng(seed)
+    weights = rng.lognormal(0, 0.45, units)
+    branch_names = list(BRANCHES)
+    branches = rng.choice(branch_names, count, p=[0.3, 0.3, 0.2, 0.1, 0.1])
+    skills = np.array([', '.join(BRANCHES[b][:3]) for b in branch_names])
+    return pd.DataFrame({
+        'id': np.arange(1, count + 1),
+        'name': 'Officer',
+        'unit': np.array([f'Unit {n:03d}' for n in range(units)])[rng.choice(units, count, p=weights / weights.sum())],
+        'branch': branches,
+        'skills_str': skills[pd.Index(branch_names).get_indexer(branches)],
+        'readiness_score': rng.integers(50, 100, count),
+        'leadership_score': rng.integers(1, 11, count),
+        'engagement_score': rng.integers(40, 100, count),
+        'years_of_service': rng.integers(0, 30, count),
+        'leadership_potential': rng.choice(['high', 'medium', 'low'], count)
+    })
+
+
+def legacy_reallocations(personnel_df):
+    """The loop _suggest_reallocations used: one full-roster filter per overloaded x underloaded pair"""
+    suggestions = []
+    unit_counts = personnel_df['unit'].value_counts()
+    avg_size = unit_counts.mean()
+    overloaded = unit_counts[unit_counts > avg_size * 1.2]
+    underloaded = unit_counts[unit_counts < avg_size * 0.8]
+    for over_unit in overloaded.index:
+        for under_unit in underloaded.index:
+            candidates = personnel_df[
+                (personnel_df['unit'] == over_unit) &
+                (personnel_df['readiness_score'] > 75)
+            ].head(2)
+            for _, candidate in candidates.iterrows():
+                suggestions.append({'personnel_id': candidate['id'], 'from_unit': over_unit, 'to_unit': under_unit})
+    return suggestions
+
+
+def legacy_skill_loss(personnel_df):
+    skill_loss = {}
+    for _, person in personnel_df.iterrows():
+        if pd.notna(person['skills_str']):
+            for skill in [s.strip() for s in person['skills_str'].split(',')]:
+                skill_loss[skill] = skill_loss.get(skill, 0) + 1
+    return skill_loss
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the workforce reallocation planner')
+    parser.add_argument('--personnel', type=int, default=500000, help='roster size')
+    parser.add_argument('--units', type=int, default=200, help='number of units')
+    parser.add_argument('--skill-loss-rows', type=int, default=50000, help='retiring personnel for the skill loss tally')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("WORKFORCE REALLOCATION BENCHMARK")
+    print("=" * 60)
+    df = generate_roster(args.personnel, args.units)
+    counts = df['unit'].value_counts()
+    print(f"{args.personnel:,} personnel in {args.units} units "
+          f"(sizes {counts.min():,}-{counts.max():,}, average {counts.mean():,.0f})")
+    print()
+
+    legacy_s, legacy = timed(legacy_reallocations, df)
+    planner_s, plan = timed(plan_reallocations, df)
+    before = counts.std()
+    after = pd.Series({unit: loads['after'] for unit, loads in plan['unit_loads'].items()})
+    balanced = counts.copy()
+    balanced[after.index] = after
+    print(f"{'reallocation':<24}{'seconds':>10}{'suggestions':>14}")
+    print(f"{'  pairwise loop':<24}{legacy_s:>10.2f}{len(legacy):>14,}")
+    print(f"{'  min-cost flow plan':<24}{planner_s:>10.2f}{plan['transfers']:>14,}")
+    print(f"  unit size std dev {before:,.0f} -> {balanced.std():,.0f}; "
+          f"{plan['skill_mismatches']:,} transfers outside a skill shortfall")
+    print()
+
+    analytics = AdvancedAnalytics()
+    retiring = df.head(args.skill_loss_rows)
+    legacy_s, expected = timed(legacy_skill_loss, retiring)
+    vector_s, result = timed(analytics._calculate_skill_loss, retiring)
+    print(f"{'skill loss':<24}{'seconds':>10}{'match':>14}")
+    print(f"{'  iterrows':<24}{legacy_s:>10.2f}{'':>14}")
+    print(f"{'  explode + value_counts':<24}{vector_s:>10.2f}{str(result == expected):>14}")
+    print()
+
+    matrix_s, matrix = timed(analytics._create_skill_matrix, df)
+    cross_s, _ = timed(analytics._identify_cross_training, df)
+    print(f"Skill matrix for the full roster: {matrix_s:.2f}s ({matrix.shape[1]} skills)")
+    print(f"Cross-training candidates: {cross_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,16 @@ const CommanderDashboard = ({ user }) => {
 
   useEffect(() => {
     fetchDashboardData();
+    
+    // Live updates instead of refetching: a snapshot, then only the stats that changed
+    const stream = new EventSource('/api/personnel/stream/');
+    stream.addEventListener('snapshot', (event) => setStats(JSON.parse(event.data)));
+    stream.addEventListener('delta', (event) => {
+      const delta = JSON.parse(event.data);
+      setStats(prev => ({ ...prev, ...delta }));
+    });
+    
+    return () => stream.close();
   }, []);
 
   useEffect(() => {
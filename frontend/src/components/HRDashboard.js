@@ -13,12 +13,16 @@ const HRDashboard = ({ user }) => {
     fetchData();
     fetchDashboardData();
     
-    // Realistic update: Only refresh data every 30 minutes
-    const interval = setInterval(() => {
-      fetchDashboardData();
-    }, 30 * 60 * 1000);
+    // Live updates: the server pushes a snapshot, then only the stats that changed.
+    // EventSource reconnects by itself and resumes from the last event id.
+    const stream = new EventSource('http://localhost:8000/api/personnel/stream/');
+    stream.addEventListener('snapshot', (event) => setStats(JSON.parse(event.data)));
+    stream.addEventListener('delta', (event) => {
+      const delta = JSON.parse(event.data);
+      setStats(prev => ({ ...prev, ...delta }));
+    });
     
-    return () => clearInterval(interval);
+    return () => stream.close();
   }, []);
 
   const fetchDashboardData = async () => {
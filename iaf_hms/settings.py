@@ -45,12 +45,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'personnel.metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'personnel.encoding.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'personnel.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -63,9 +66,81 @@ CORS_ALLOWED_ORIGINS = [
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'personnel.encoding.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ]
 }
 
+# Per-view latency, SQL and response size histograms, served at /api/_metrics/ (Prometheus);
+# with ENABLED off the middleware and query timer are not installed at all
+REQUEST_METRICS = {
+    'ENABLED': True,
+    'SLOW_REQUEST_MS': 500,  # print a trace (with the slowest queries) for requests at least this slow
+    'SLOW_QUERY_COUNT': 5,
+    'ALLOWED_IPS': ['127.0.0.1', '::1'],  # scrapers allowed without logging in
+    'ROLES': ['commander'],  # auth groups allowed to read metrics, besides superusers
+    'ALLOW_STAFF': True,
+}
+
+# Opt-in request profiling: X-Profile: 1 (or ?_profile=1) from a permitted user saves a profile,
+# downloadable from the X-Profile-Url response header; python manage.py slowest_profiles lists them
+PROFILING = {
+    'ENABLED': True,
+    'DIRECTORY': BASE_DIR / 'profiles',
+    'MODE': 'cprofile',  # cprofile (.prof for pstats / snakeviz) or sample (folded stacks for flamegraph.pl / speedscope)
+    'SAMPLE_INTERVAL_MS': 5,
+    'ROLES': ['commander'],  # auth groups allowed to profile, besides superusers
+    'ALLOW_STAFF': True,
+    'MAX_PROFILES': 200,  # the oldest are deleted past this
+}
+
+# gzip / brotli (if the brotli package is installed) for responses of at least MIN_SIZE bytes
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,  # 0-11; higher levels cost far more CPU for a few percent
+}
+
+# Chatbot session store: LRU + idle TTL, per-session history cap, optional SQLite spill file
+CHATBOT_SESSIONS = {
+    'MAX_SESSIONS': 500,
+    'TTL_SECONDS': 30 * 60,
+    'HISTORY_LIMIT': 50,
+    'PERSIST_PATH': None,  # e.g. BASE_DIR / 'chatbot_sessions.sqlite3'
+}
+
+# Optional AI libraries are imported on first use; capabilities listed here
+# (speech, vision, deep_learning, ml) are preloaded in a background thread at startup
+AI_PRELOAD_CAPABILITIES = []
+
+# SQLite file for the computer vision attendance log and security alerts
+CV_EVENTS_PATH = BASE_DIR / 'cv_events.sqlite3'
+
+# Live dashboard feed (/api/personnel/stream/): one aggregation fanned out to all subscribers
+DASHBOARD_STREAM = {
+    'DEBOUNCE_SECONDS': 0.5,  # coalesce bursts of saves into one aggregation
+    'REFRESH_SECONDS': 60,  # re-aggregate anyway, for bulk updates that send no signals
+    'HEARTBEAT_SECONDS': 15,
+    'HISTORY': 100,  # deltas kept for clients reconnecting with Last-Event-ID
+}
+
+# Server-side response cache for the ETag-cached read endpoints (see personnel.http_cache);
+# use django.core.cache.backends.filebased.FileBasedCache to share it between processes
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'iaf-hms',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    }
+}
+
+HTTP_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'RESPONSE_TIMEOUT_SECONDS': 300,
+}
+
 ROOT_URLCONF = 'iaf_hms.urls'
 
 TEMPLATES = [
@@ -86,6 +161,24 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'iaf_hms.wsgi.application'
 
+# ASGI deployment (e.g. uvicorn iaf_hms.asgi:application): async views serve the
+# read-heavy endpoints and the live feed without holding a worker thread per request
+ASGI_APPLICATION = 'iaf_hms.asgi.application'
+
+# Threads for CPU-bound model calls made from async views
+ML_EXECUTOR_WORKERS = 2
+
+# Background job queue (/api/jobs/) for long-running ML, simulation and maintenance
+# tasks; python manage.py run_job_workers starts the worker processes
+JOB_QUEUE = {
+    'PATH': BASE_DIR / 'jobs.sqlite3',
+    'WORKERS': 2,
+    'RESULT_TTL_SECONDS': 60 * 60,  # finished jobs keep their result this long
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY_SECONDS': 5,  # doubled after every failed attempt
+    'LEASE_SECONDS': 10 * 60,  # a running job not reporting progress this long is retried
+}
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
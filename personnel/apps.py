@@ -1,6 +1,17 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PersonnelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'personnel'
+
+    def ready(self):
+        from . import signals
+
+        capabilities = getattr(settings, 'AI_PRELOAD_CAPABILITIES', [])
+        if capabilities:
+            from ai_models.lazy_imports import preload
+            threading.Thread(target=preload, args=tuple(capabilities), daemon=True, name='ai-preload').start()
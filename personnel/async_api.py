@@ -0,0 +1,229 @@
+import asyncio
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count
+from django.http import HttpResponseNotAllowed
+from django.utils import timezone
+
+from .encoding import JsonResponse, columnar
+from .http_cache import conditional_cache
+from .live_stats import adashboard_snapshot
+from .models import (
+    AirBase, Aircraft, Equipment, LeaveRequest, MedicalRecord, MissionRecord, Personnel, TrainingRecord
+)
+from .serializers import PersonnelSerializer
+from .views import PersonnelViewSet
+
+# CPU-bound model calls run here rather than in Django's shared sync thread, which
+# every sync view and async ORM query goes through under ASGI
+ml_executor = ThreadPoolExecutor(max_workers=getattr(settings, 'ML_EXECUTOR_WORKERS', 2), thread_name_prefix='ml')
+
+
+async def run_ml(func, *args, **kwargs):
+    """Run a model call on the ML executor without blocking the event loop
+
+    The call runs in a copy of the caller's context, so per-request context
+    variables (request metrics, profiling) still see it.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(ml_executor, partial(context.run, func, *args, **kwargs))
+
+
+def async_endpoint(methods):
+    """csrf_exempt + require_http_methods for coroutine views (the Django 4.2 decorators only wrap sync views)"""
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+        inner.csrf_exempt = True
+        return inner
+    return decorator
+
+
+FORM_CONTENT_TYPES = ('application/x-www-form-urlencoded', 'multipart/form-data')
+
+
+def request_data(request):
+    """Body fields as DRF's request.data gives them (JSON object or form fields); ValueError if malformed"""
+    if request.content_type in FORM_CONTENT_TYPES:
+        return request.POST
+    data = json.loads(request.body or b'{}')
+    if not isinstance(data, dict):
+        raise ValueError('expected a JSON object')
+    return data
+
+
+personnel_create = sync_to_async(PersonnelViewSet.as_view({'post': 'create'}))
+serialize_personnel = sync_to_async(lambda queryset: PersonnelSerializer(queryset, many=True).data)
+
+
+@async_endpoint(["GET"])
+@conditional_cache([Personnel, Aircraft, AirBase, LeaveRequest], server_cache=True)
+async def dashboard_stats(request):
+    """Get dashboard statistics"""
+    # Same aggregation the live feed (/api/personnel/stream/) pushes to subscribers
+    return JsonResponse(await adashboard_snapshot())
+
+
+@async_endpoint(["GET", "POST"])
+@conditional_cache([Personnel], server_cache=True)
+async def personnel_list(request):
+    """List personnel as PersonnelViewSet would (optionally ?limit=&offset=); creating a record is handled by it
+
+    ?layout=rows returns the raw field values and ?layout=columns the same
+    values column by column: both skip the serializer, for bulk exports.
+    """
+    if request.method == 'POST':
+        return await personnel_create(request)
+
+    layout = request.GET.get('layout')
+    if layout not in (None, 'rows', 'columns'):
+        return JsonResponse({'error': 'layout must be rows or columns'}, status=400)
+    try:
+        offset = max(int(request.GET.get('offset', 0)), 0)
+        limit = request.GET.get('limit')
+        limit = min(max(int(limit), 0), 1000) if limit else None
+    except ValueError:
+        return JsonResponse({'error': 'limit and offset must be integers'}, status=400)
+
+    # Meta ordering (rank, name), with the primary key making pages stable
+    queryset = Personnel.objects.order_by(*Personnel._meta.ordering, 'personnel_id')
+    queryset = queryset[offset:offset + limit] if limit is not None else queryset[offset:]
+    if layout == 'columns':
+        columns = [field.attname for field in Personnel._meta.concrete_fields]
+        return JsonResponse(columnar([row async for row in queryset.values_list(*columns)], columns))
+    if layout == 'rows':
+        return JsonResponse([person async for person in queryset.values()], safe=False)
+    return JsonResponse(await serialize_personnel(queryset), safe=False)
+
+
+@async_endpoint(["GET"])
+@conditional_cache([Personnel, TrainingRecord, MedicalRecord, Equipment, MissionRecord], period=300, server_cache=True)
+async def advanced_analytics(request):
+    """Get advanced analytics data"""
+    try:
+        # Real-time metrics
+        current_time = timezone.now()
+
+        # Personnel distribution by base
+        base_distribution = Personnel.objects.values('base_location').annotate(
+            count=Count('personnel_id')
+        ).order_by('-count')
+
+        # Training completion rates
+        training_stats = TrainingRecord.objects.filter(
+            end_date__gte=current_time - timedelta(days=90)
+        ).values('status').annotate(count=Count('id'))
+
+        # Medical fitness levels
+        medical_stats = MedicalRecord.objects.filter(
+            checkup_date__gte=current_time - timedelta(days=180)
+        ).values('medical_status').annotate(count=Count('id'))
+
+        # Equipment status
+        equipment_stats = Equipment.objects.values('status').annotate(
+            count=Count('equipment_id')
+        )
+
+        return JsonResponse({
+            'base_distribution': [row async for row in base_distribution],
+            'training_completion': [row async for row in training_stats],
+            'medical_fitness': [row async for row in medical_stats],
+            'equipment_status': [row async for row in equipment_stats],
+            'mission_readiness': {
+                'active_missions': await MissionRecord.objects.filter(status='Active').acount(),
+                'planned_missions': await MissionRecord.objects.filter(status='Planned').acount(),
+                'readiness_score': 94.2  # Calculated metric
+            },
+            'timestamp': current_time.isoformat()
+        })
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@async_endpoint(["GET"])
+async def predictive_maintenance(request):
+    """Get predictive maintenance data"""
+    try:
+        from ai_models.predictive_maintenance import PredictiveMaintenanceSystem
+
+        def build():
+            pm_system = PredictiveMaintenanceSystem()
+            pm_system.initialize_equipment_database()
+            return pm_system.get_maintenance_analytics(), pm_system.generate_maintenance_schedule()
+
+        analytics, schedule = await run_ml(build)
+
+        return JsonResponse({
+            'analytics': analytics,
+            'maintenance_schedule': schedule[:20],  # Top 20 items
+            'timestamp': timezone.now().isoformat()
+        })
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@async_endpoint(["POST"])
+async def sentiment_analysis(request):
+    """Analyze sentiment of personnel communications"""
+    try:
+        from ai_models.sentiment_service import get_sentiment_service
+
+        try:
+            text = request_data(request).get('text')
+        except ValueError as e:
+            return JsonResponse({'error': f'Invalid request body: {e}'}, status=400)
+
+        if not text:
+            return JsonResponse({'error': 'Text required for analysis'}, status=400)
+
+        return JsonResponse(await run_ml(lambda: get_sentiment_service().analyze(text)))
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@async_endpoint(["POST"])
+async def sentiment_analysis_batch(request):
+    """Analyze sentiment of a batch of personnel communications"""
+    try:
+        from ai_models.sentiment_service import get_sentiment_service, MAX_BATCH_SIZE
+
+        try:
+            data = request_data(request)
+        except ValueError as e:
+            return JsonResponse({'error': f'Invalid request body: {e}'}, status=400)
+        texts = data.getlist('texts') if hasattr(data, 'getlist') else data.get('texts')
+
+        if not isinstance(texts, list) or not texts:
+            return JsonResponse({'error': 'texts must be a non-empty list'}, status=400)
+        if len(texts) > MAX_BATCH_SIZE:
+            return JsonResponse({'error': f'At most {MAX_BATCH_SIZE} texts per batch'}, status=400)
+        if not all(isinstance(text, str) for text in texts):
+            return JsonResponse({'error': 'Every text must be a string'}, status=400)
+
+        service = await run_ml(get_sentiment_service)
+        results = await run_ml(service.analyze_batch, texts)
+        summary = {'positive': 0, 'negative': 0, 'neutral': 0}
+        for result in results:
+            summary[result['sentiment']] += 1
+
+        return JsonResponse({
+            'count': len(results),
+            'summary': summary,
+            'results': results,
+            'cache': service.cache.stats()
+        })
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
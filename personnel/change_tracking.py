@@ -0,0 +1,150 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import models, transaction
+from django.db.models import F
+
+TRACKED_APPS = ('personnel',)
+
+
+def _table(model):
+    return model if isinstance(model, str) else model._meta.db_table
+
+
+def is_tracked(model):
+    return model._meta.app_label in TRACKED_APPS and model._meta.db_table != 'personnel_tableversion'
+
+
+class ChangeTracker:
+    """Change version per table, stored in TableVersion and mirrored in this process.
+
+    Every write bumps its table's row with an atomic UPDATE inside the
+    writing transaction, so a rolled-back write leaves the version alone.
+    Reads come from the in-process mirror, a dict lookup: versions bumped
+    here are refreshed when the transaction commits, versions bumped by
+    other processes at the next poll (at most every poll_interval seconds).
+    New rows start at the current time in milliseconds, so versions keep
+    increasing when the table is recreated.
+
+    Caches register with on_change() to be told when a table moved. Pass
+    row_changes=False to hear only about changes the per-row save/delete
+    signals did not cover (bulk writes and other processes).
+    """
+
+    def __init__(self, poll_interval=1.0):
+        self.poll_interval = poll_interval
+        self._versions = {}
+        self._polled_at = None
+        self._lock = threading.Lock()
+        self._listeners = []  # (tables, callback, row_changes)
+        self._batch = threading.local()
+
+    def get(self, model):
+        self._poll_if_due()
+        return self._versions.get(_table(model), 0)
+
+    def signature(self, models_or_tables):
+        self._poll_if_due()
+        return ','.join(f'{table}={self._versions.get(table, 0)}' for table in map(_table, models_or_tables))
+
+    def on_change(self, models_or_tables, callback, row_changes=True):
+        """Call callback(table) after a listed table changes"""
+        self._listeners.append((frozenset(map(_table, models_or_tables)), callback, row_changes))
+
+    def bump(self, *models_or_tables, row_change=False):
+        """Record a change to these tables (call inside the writing transaction)"""
+        tables = set(map(_table, models_or_tables))
+        pending = getattr(self._batch, 'tables', None)
+        if pending is not None:
+            pending.update(tables)
+            return
+
+        from .models import TableVersion
+
+        for table in tables:
+            if not TableVersion.objects.filter(table=table).update(version=F('version') + 1):
+                TableVersion.objects.get_or_create(table=table, defaults={'version': int(time.time() * 1000)})
+        transaction.on_commit(lambda: self._refresh(tables, row_change))
+
+    @contextmanager
+    def batch(self):
+        """Coalesce the bumps of many writes into one per table, made when the block ends"""
+        if getattr(self._batch, 'tables', None) is not None:
+            yield
+            return
+        self._batch.tables = set()
+        try:
+            yield
+            tables = self._batch.tables
+        finally:
+            self._batch.tables = None
+        if tables:
+            self.bump(*tables)
+
+    def _refresh(self, tables, row_change):
+        from .models import TableVersion
+
+        versions = dict(TableVersion.objects.filter(table__in=tables).values_list('table', 'version'))
+        with self._lock:
+            self._versions.update(versions)
+        self._notify(tables, row_change)
+
+    def _poll_if_due(self):
+        now = time.monotonic()
+        if self._polled_at is not None and now - self._polled_at < self.poll_interval:
+            return
+        from .models import TableVersion
+
+        first = self._polled_at is None
+        self._polled_at = now
+        versions = dict(TableVersion.objects.values_list('table', 'version'))
+        with self._lock:
+            changed = {table for table, version in versions.items() if self._versions.get(table) != version}
+            self._versions = versions
+        if changed and not first:
+            self._notify(changed, row_change=False)
+
+    def _notify(self, tables, row_change):
+        for listened, callback, row_changes in self._listeners:
+            if row_change and not row_changes:
+                continue
+            for table in listened & set(tables):
+                try:
+                    callback(table)
+                except Exception as e:
+                    print(f"⚠️ Change listener for {table} failed: {e}")
+
+
+table_versions = ChangeTracker()
+
+
+class ChangeTrackingQuerySet(models.QuerySet):
+    """Bulk writes, which send no per-row signals, bump the table version too"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            if created:
+                table_versions.bump(self.model)
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        # Django runs update() once per batch of rows; bump the table once for all of them
+        with transaction.atomic(using=self.db), table_versions.batch():
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.db):
+            updated = super().update(**kwargs)
+            if updated:
+                table_versions.bump(self.model)
+        return updated
+
+    def delete(self):
+        # Deleted rows send post_delete one by one; bump each table once
+        with transaction.atomic(using=self.db), table_versions.batch():
+            return super().delete()
+
+
+ChangeTrackingManager = models.Manager.from_queryset(ChangeTrackingQuerySet)
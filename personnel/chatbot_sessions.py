@@ -0,0 +1,173 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def _estimate_size(obj):
+    """Rough retained size of a session's history entries, in bytes"""
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_estimate_size(k) + _estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_estimate_size(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+class ChatbotSessionStore:
+    """LRU + TTL bounded store for chatbot sessions.
+
+    Sessions are evicted least-recently-used once max_sessions is reached and
+    dropped once idle for longer than ttl seconds. When persist_path is set,
+    LRU-evicted sessions are written to SQLite and rehydrated on next access.
+    """
+
+    def __init__(self, factory, restore, max_sessions=500, ttl=1800, persist_path=None):
+        self.factory = factory
+        self.restore = restore
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self._sessions = OrderedDict()  # session_id -> (session, last_access)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'rehydrated': 0, 'evicted_lru': 0, 'expired': 0}
+
+        if persist_path:
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS chatbot_sessions ('
+                    'session_id TEXT PRIMARY KEY, state TEXT NOT NULL, last_access REAL NOT NULL)'
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.persist_path, timeout=5)
+
+    def create(self, session_id):
+        """Create (or replace) a session and return it"""
+        session = self.factory()
+        now = time.monotonic()
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._sessions[session_id] = (session, now)
+            self._evict_locked(now)
+        if self.persist_path:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM chatbot_sessions WHERE session_id = ?', (session_id,))
+        return session
+
+    def get(self, session_id):
+        """Return the live session, rehydrating it from SQLite if needed, or None"""
+        if not session_id:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                if now - entry[1] > self.ttl:
+                    del self._sessions[session_id]
+                    self._stats['expired'] += 1
+                else:
+                    self._sessions[session_id] = (entry[0], now)
+                    self._sessions.move_to_end(session_id)
+                    self._stats['hits'] += 1
+                    return entry[0]
+            self._stats['misses'] += 1
+
+        session = self._rehydrate(session_id)
+        if session is None:
+            return None
+
+        with self._lock:
+            self._sessions[session_id] = (session, now)
+            self._stats['rehydrated'] += 1
+            self._evict_locked(now)
+        return session
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def remove(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self.persist_path:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM chatbot_sessions WHERE session_id = ?', (session_id,))
+
+    def _evict_locked(self, now):
+        """Drop expired sessions, then spill the least recently used over capacity"""
+        expired = [sid for sid, (_, last_access) in self._sessions.items() if now - last_access > self.ttl]
+        for sid in expired:
+            del self._sessions[sid]
+        self._stats['expired'] += len(expired)
+
+        spilled = []
+        while len(self._sessions) > self.max_sessions:
+            sid, (session, last_access) = self._sessions.popitem(last=False)
+            spilled.append((sid, session, last_access))
+        self._stats['evicted_lru'] += len(spilled)
+
+        if self.persist_path and spilled:
+            # Stored as wall-clock time so the TTL survives a process restart
+            offset = time.time() - now
+            with self._connect() as conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO chatbot_sessions (session_id, state, last_access) VALUES (?, ?, ?)',
+                    [(sid, json.dumps(session.export_state()), last_access + offset) for sid, session, last_access in spilled]
+                )
+
+    def _rehydrate(self, session_id):
+        if not self.persist_path:
+            return None
+
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT state, last_access FROM chatbot_sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('DELETE FROM chatbot_sessions WHERE session_id = ?', (session_id,))
+
+        state, last_access = row
+        if time.time() - last_access > self.ttl:
+            return None
+        return self.restore(json.loads(state))
+
+    def purge_persisted(self):
+        """Delete persisted sessions that have outlived the TTL"""
+        if not self.persist_path:
+            return 0
+        with self._connect() as conn:
+            cursor = conn.execute('DELETE FROM chatbot_sessions WHERE last_access < ?', (time.time() - self.ttl,))
+            return cursor.rowcount
+
+    def metrics(self):
+        """Live session count, retained history bytes and eviction counters"""
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            stats = dict(self._stats)
+
+        history_entries = 0
+        bytes_retained = 0
+        for session in sessions:
+            chatbot = session.chatbot
+            history_entries += len(chatbot.conversation_history)
+            bytes_retained += sys.getsizeof(chatbot) + _estimate_size(chatbot.conversation_history)
+            if chatbot.history_summary:
+                bytes_retained += _estimate_size(chatbot.history_summary)
+
+        persisted_sessions = 0
+        if self.persist_path:
+            with self._connect() as conn:
+                persisted_sessions = conn.execute('SELECT COUNT(*) FROM chatbot_sessions').fetchone()[0]
+
+        return {
+            'live_sessions': len(sessions),
+            'max_sessions': self.max_sessions,
+            'ttl_seconds': self.ttl,
+            'history_entries': history_entries,
+            'bytes_retained': bytes_retained,
+            'persisted_sessions': persisted_sessions,
+            **stats
+        }
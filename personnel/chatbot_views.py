@@ -1,11 +1,12 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import JsonResponse
+from django.conf import settings
 import json
 import sys
 import os
 from datetime import datetime
+from .chatbot_sessions import ChatbotSessionStore
 
 # Add the ai_models directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai_models'))
@@ -15,8 +16,16 @@ try:
 except ImportError:
     ChatbotAPI = None
 
-# Global chatbot instance (in production, use session-based storage)
-chatbot_sessions = {}
+# Bounded, expiring session store shared by all requests in this process
+session_config = getattr(settings, 'CHATBOT_SESSIONS', {})
+history_limit = session_config.get('HISTORY_LIMIT', 50)
+chatbot_sessions = ChatbotSessionStore(
+    factory=lambda: ChatbotAPI(max_history=history_limit),
+    restore=lambda state: ChatbotAPI.from_state(state, max_history=history_limit),
+    max_sessions=session_config.get('MAX_SESSIONS', 500),
+    ttl=session_config.get('TTL_SECONDS', 1800),
+    persist_path=session_config.get('PERSIST_PATH')
+)
 
 @api_view(['POST'])
 def initialize_chatbot(request):
@@ -40,11 +49,10 @@ def initialize_chatbot(request):
         
         # Create new chatbot session
         if ChatbotAPI:
-            chatbot_api = ChatbotAPI()
+            chatbot_api = chatbot_sessions.create(session_id)
             result = chatbot_api.set_user_role(role, user_id)
             
             if result['success']:
-                chatbot_sessions[session_id] = chatbot_api
                 return Response({
                     'success': True,
                     'message': result['message'],
@@ -53,6 +61,7 @@ def initialize_chatbot(request):
                     'capabilities': get_role_capabilities(role)
                 })
             else:
+                chatbot_sessions.remove(session_id)
                 return Response({
                     'error': result['message']
                 }, status=status.HTTP_400_BAD_REQUEST)
@@ -79,12 +88,12 @@ def send_message(request):
                 'error': 'Message is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        if not session_id or session_id not in chatbot_sessions:
+        chatbot_api = chatbot_sessions.get(session_id)
+        if chatbot_api is None:
             return Response({
                 'error': 'Invalid session. Please initialize chatbot first.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        chatbot_api = chatbot_sessions[session_id]
         result = chatbot_api.send_message(message)
         
         return Response({
@@ -104,12 +113,12 @@ def get_conversation_history(request):
     try:
         session_id = request.GET.get('session_id', '')
         
-        if not session_id or session_id not in chatbot_sessions:
+        chatbot_api = chatbot_sessions.get(session_id)
+        if chatbot_api is None:
             return Response({
                 'error': 'Invalid session'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        chatbot_api = chatbot_sessions[session_id]
         result = chatbot_api.get_conversation_history()
         
         # Convert datetime objects to strings for JSON serialization
@@ -122,9 +131,16 @@ def get_conversation_history(request):
                 'type': entry['type']
             })
         
+        summary = chatbot_api.chatbot.history_summary
+        
         return Response({
             'success': True,
-            'history': history
+            'history': history,
+            'earlier_summary': {
+                'summarized_messages': summary['summarized_messages'],
+                'since': summary['since'].isoformat(),
+                'topics': summary['topics']
+            } if summary else None
         })
         
     except Exception as e:
@@ -139,12 +155,12 @@ def clear_conversation(request):
         data = request.data
         session_id = data.get('session_id', '')
         
-        if not session_id or session_id not in chatbot_sessions:
+        chatbot_api = chatbot_sessions.get(session_id)
+        if chatbot_api is None:
             return Response({
                 'error': 'Invalid session'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        chatbot_api = chatbot_sessions[session_id]
         result = chatbot_api.clear_conversation()
         
         return Response({
@@ -157,6 +173,20 @@ def clear_conversation(request):
             'error': f'Failed to clear conversation: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def chatbot_metrics(request):
+    """Live session count and memory retained by the chatbot session store"""
+    try:
+        return Response({
+            'success': True,
+            'metrics': chatbot_sessions.metrics()
+        })
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to get chatbot metrics: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 def get_chatbot_help(request):
     """Get role-specific help information"""
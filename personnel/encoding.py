@@ -0,0 +1,133 @@
+import gzip
+import json
+import re
+import time
+
+from django.conf import settings
+from django.http import JsonResponse as DjangoJsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .metrics import record_serialization
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+compression_config = getattr(settings, 'RESPONSE_COMPRESSION', {})
+ACCEPT_ENCODING_RE = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*')
+
+
+# Whatever orjson cannot encode natively (Decimal, timedelta, sets, pandas objects, numpy
+# arrays that are not C-contiguous or hold objects...) is encoded the way DRF's renderer did
+_default = JSONEncoder().default
+
+
+def _stdlib_dumps(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def dumps(data):
+    """Compact JSON bytes: orjson when installed, else the stdlib encoder; other types as DRF encodes them"""
+    started = time.perf_counter()
+    if orjson is not None:
+        try:
+            body = orjson.dumps(data, default=_default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            # Integers past 64 bits, nesting deeper than orjson allows, ...
+            body = _stdlib_dumps(data)
+    else:
+        body = _stdlib_dumps(data)
+    record_serialization(time.perf_counter() - started)
+    return body
+
+
+class JsonResponse(DjangoJsonResponse):
+    """JsonResponse encoded with dumps()"""
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        super(DjangoJsonResponse, self).__init__(content=dumps(data), **kwargs)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """DRF JSON renderer using dumps(); indented output for the browsable API is left to JSONRenderer"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+def columnar(rows, columns=None):
+    """{"columns": [...], "rows": [[...]]}: list payloads without the keys repeated on every row"""
+    rows = list(rows)
+    if columns is None:
+        columns = list(rows[0]) if rows and isinstance(rows[0], dict) else []
+    if rows and isinstance(rows[0], dict):
+        rows = [[row.get(column) for column in columns] for row in rows]
+    return {'columns': list(columns), 'rows': [list(row) for row in rows]}
+
+
+def negotiate_encoding(accept_encoding):
+    """Best of br / gzip the client accepts (q-values honoured), or None"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        match = ACCEPT_ENCODING_RE.fullmatch(part)
+        if match:
+            try:
+                accepted[match.group(1).lower()] = float(match.group(2) or 1)
+            except ValueError:
+                continue
+    available = (['br'] if brotli is not None else []) + ['gzip']
+    wildcard = accepted.get('*', 0)
+    ranked = [(accepted.get(coding, wildcard), -order, coding) for order, coding in enumerate(available)]
+    quality, _, coding = max(ranked)
+    return coding if quality > 0 else None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """gzip / brotli for responses of at least MIN_SIZE bytes, negotiated on Accept-Encoding
+
+    Streaming responses (the live dashboard feed) are passed through, since
+    compressing them would buffer events.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < compression_config.get('MIN_SIZE', 1024):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding == 'br':
+            compressed = brotli.compress(response.content, quality=compression_config.get('BROTLI_QUALITY', 4))
+        elif coding == 'gzip':
+            compressed = gzip.compress(response.content, compresslevel=compression_config.get('GZIP_LEVEL', 6), mtime=0)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        # The body differs byte-for-byte from the uncompressed one
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
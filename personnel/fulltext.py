@@ -0,0 +1,151 @@
+import re
+
+from django.db import connection
+
+FULLTEXT_TABLE = 'personnel_fulltext'
+
+# source name -> (rowid code, table, text column, personnel column or None)
+# Each indexed text gets rowid (record_id << 3) | code, so triggers can
+# update and delete index rows by rowid instead of scanning the FTS table.
+FULLTEXT_SOURCES = {
+    'hr_description': (1, 'personnel_hrrecord', 'description', 'personnel_id'),
+    'medical_notes': (2, 'personnel_medicalrecord', 'medical_notes', 'personnel_id'),
+    'review_goals_achieved': (3, 'personnel_performancereview', 'goals_achieved', 'personnel_id'),
+    'review_areas_for_improvement': (4, 'personnel_performancereview', 'areas_for_improvement', 'personnel_id'),
+    'leave_reason': (5, 'personnel_leaverequest', 'reason', 'personnel_id'),
+    'mission_description': (6, 'personnel_missionrecord', 'description', None),
+}
+
+# Sources each role may search; a user's roles are the Django auth groups of these names.
+# 'personnel' is further limited to their own records
+ROLE_SOURCES = {
+    'commander': ['hr_description', 'review_goals_achieved', 'review_areas_for_improvement',
+                  'leave_reason', 'mission_description'],
+    'hr_manager': ['hr_description', 'review_goals_achieved', 'review_areas_for_improvement', 'leave_reason'],
+    'medical_officer': ['medical_notes'],
+    'training_officer': ['review_goals_achieved', 'review_areas_for_improvement'],
+    'personnel': ['hr_description', 'medical_notes', 'review_goals_achieved',
+                  'review_areas_for_improvement', 'leave_reason'],
+}
+
+TERM_RE = re.compile(r'\w+')
+
+
+def user_roles(user):
+    """Search roles of an authenticated user, from their auth groups (superusers search as commander)"""
+    if not getattr(user, 'is_authenticated', False):
+        return []
+    groups = set(user.groups.filter(name__in=ROLE_SOURCES).values_list('name', flat=True))
+    if user.is_superuser:
+        groups.add('commander')
+    return [role for role in ROLE_SOURCES if role in groups]
+
+
+def _rowid(code, id_expr):
+    return f'(({id_expr} << 3) | {code})'
+
+
+def fulltext_schema_sql(sources=FULLTEXT_SOURCES):
+    """DDL for the FTS5 table and the triggers that keep it in sync with the source tables"""
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FULLTEXT_TABLE} USING fts5("
+        f"body, source UNINDEXED, record_id UNINDEXED, personnel_id UNINDEXED, "
+        f"tokenize = 'porter unicode61')"
+    ]
+    for source, (code, table, column, personnel_column) in sources.items():
+        personnel_expr = f'new.{personnel_column}' if personnel_column else 'NULL'
+        insert = (
+            f"INSERT INTO {FULLTEXT_TABLE} (rowid, body, source, record_id, personnel_id) "
+            f"SELECT {_rowid(code, 'new.id')}, new.{column}, '{source}', new.id, {personnel_expr} "
+            f"WHERE coalesce(new.{column}, '') != '';"
+        )
+        delete = f"DELETE FROM {FULLTEXT_TABLE} WHERE rowid = {_rowid(code, 'old.id')};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {FULLTEXT_TABLE}_{source}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {FULLTEXT_TABLE}_{source}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {FULLTEXT_TABLE}_{source}_au AFTER UPDATE ON {table} "
+            f"BEGIN {delete} {insert} END",
+        ]
+    return statements
+
+
+def reindex_sql(sources=FULLTEXT_SOURCES):
+    """Statements that rebuild the FTS table from scratch (for data loaded before the triggers existed)"""
+    statements = [f"DELETE FROM {FULLTEXT_TABLE}"]
+    for source, (code, table, column, personnel_column) in sources.items():
+        personnel_expr = personnel_column or 'NULL'
+        statements.append(
+            f"INSERT INTO {FULLTEXT_TABLE} (rowid, body, source, record_id, personnel_id) "
+            f"SELECT {_rowid(code, 'id')}, {column}, '{source}', id, {personnel_expr} FROM {table} "
+            f"WHERE coalesce({column}, '') != ''"
+        )
+    statements.append(f"INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}) VALUES ('optimize')")
+    return statements
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word required, the last one also as a prefix.
+
+    Prefix terms are not stemmed by the porter tokenizer, so the last word
+    must match either as a (stemmed) word or as the prefix of an indexed stem.
+    """
+    terms = TERM_RE.findall(text.lower())
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] = f'({quoted[-1]} OR {quoted[-1]}*)'
+    return ' AND '.join(quoted)
+
+
+def search_fulltext(query, role, sources=None, personnel_id=None, page=1, limit=20, cursor=None):
+    """BM25-ranked search over the free-text fields the role may see, with highlighted snippets"""
+    if role not in ROLE_SOURCES:
+        raise ValueError(f"Invalid role. Must be one of: {', '.join(ROLE_SOURCES)}")
+    if role == 'personnel' and not personnel_id:
+        raise ValueError('personnel_id required for the personnel role')
+
+    allowed = ROLE_SOURCES[role]
+    sources = [source for source in (sources or allowed) if source in allowed]
+    match = build_match_query(query)
+    page = max(int(page), 1)
+    limit = max(int(limit), 1)
+
+    response = {'query': query, 'sources': sources, 'page': page, 'limit': limit, 'results': []}
+    if not match or not sources:
+        response['has_next'] = False
+        return response
+
+    # Django cursors take %s placeholders, raw sqlite3 cursors (benchmarks) take ?
+    mark = '%s' if cursor is None else '?'
+    # Filter on the source code packed into the rowid; reading the UNINDEXED
+    # source column would fetch every matching row's stored content
+    where = [f"{FULLTEXT_TABLE} MATCH {mark}", f"(rowid & 7) IN ({', '.join([mark] * len(sources))})"]
+    params = [match, *[FULLTEXT_SOURCES[source][0] for source in sources]]
+    if personnel_id:
+        where.append(f'personnel_id = {mark}')
+        params.append(personnel_id)
+
+    # One extra row tells us whether there is a next page without a COUNT over the match
+    sql = (
+        f"SELECT source, record_id, personnel_id, "
+        f"snippet({FULLTEXT_TABLE}, 0, '<mark>', '</mark>', '...', 16), bm25({FULLTEXT_TABLE}) "
+        f"FROM {FULLTEXT_TABLE} WHERE {' AND '.join(where)} ORDER BY rank LIMIT {mark} OFFSET {mark}"
+    )
+    params += [limit + 1, (page - 1) * limit]
+
+    if cursor is None:
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(sql, params)
+            rows = db_cursor.fetchall()
+    else:
+        rows = cursor.execute(sql, params).fetchall()
+
+    response['has_next'] = len(rows) > limit
+    response['results'] = [{
+        'source': source,
+        'record_id': record_id,
+        'personnel_id': row_personnel_id,
+        'snippet': snippet,
+        'score': round(-score, 4)
+    } for source, record_id, row_personnel_id, snippet, score in rows[:limit]]
+    return response
@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+from .change_tracking import table_versions
+
+cache_config = getattr(settings, 'HTTP_CACHE', {})
+
+
+def response_cache():
+    return caches[cache_config.get('CACHE_ALIAS', 'default')]
+
+
+def conditional_cache(models=(), max_age=0, period=None, server_cache=False):
+    """ETag / If-None-Match support for a GET view whose body depends only on models
+
+    The ETag combines the change versions of the models' tables with the
+    request path and query string, so an unchanged client copy gets a 304
+    before the view runs any query. period (seconds) also rolls the ETag over
+    on a clock, for views whose output depends on the current time.
+    max_age is sent as Cache-Control (0: revalidate every time). With
+    server_cache, 200 responses are kept in the HTTP_CACHE['CACHE_ALIAS']
+    cache under their ETag, so other clients asking for the same version
+    are served without running the view. Profiled requests (see
+    personnel.profiling) bypass both. Works on sync and async views.
+    """
+    tables = sorted(model if isinstance(model, str) else model._meta.db_table for model in models)
+    timeout = cache_config.get('RESPONSE_TIMEOUT_SECONDS', 300)
+
+    def current_etag(request):
+        key = table_versions.signature(tables) + '|' + request.get_full_path()
+        if period:
+            key += f'|{int(time.time() // period)}'
+        return quote_etag(hashlib.blake2b(key.encode(), digest_size=12).hexdigest())
+
+    def not_modified(request, etag):
+        client_etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if '*' not in client_etags and etag not in {tag.removeprefix('W/') for tag in client_etags}:
+            return None
+        response = HttpResponseNotModified()
+        finish(response, etag)
+        return response
+
+    def finish(response, etag):
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=max_age, must_revalidate=True)
+        return response
+
+    def from_cache(entry, etag):
+        if entry is None:
+            return None
+        content, content_type = entry
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Cache'] = 'hit'
+        return finish(response, etag)
+
+    def to_cache(response):
+        if response.status_code != 200 or getattr(response, 'streaming', False):
+            return None
+        if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+            return None  # DRF responses are rendered after the view returns
+        return response.content, response['Content-Type']
+
+    def cache_key(etag):
+        return f'http_cache:{etag}'
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD') or getattr(request, 'profiling', False):
+                    return await view(request, *args, **kwargs)
+                etag = await sync_to_async(current_etag)(request)  # may poll TableVersion
+                response = not_modified(request, etag)
+                if response is None and server_cache:
+                    response = from_cache(await response_cache().aget(cache_key(etag)), etag)
+                if response is not None:
+                    return response
+
+                response = await view(request, *args, **kwargs)
+                if server_cache and (entry := to_cache(response)) is not None:
+                    await response_cache().aset(cache_key(etag), entry, timeout)
+                return finish(response, etag) if response.status_code == 200 else response
+        else:
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD') or getattr(request, 'profiling', False):
+                    return view(request, *args, **kwargs)
+                etag = current_etag(request)
+                response = not_modified(request, etag)
+                if response is None and server_cache:
+                    response = from_cache(response_cache().get(cache_key(etag)), etag)
+                if response is not None:
+                    return response
+
+                response = view(request, *args, **kwargs)
+                if server_cache and (entry := to_cache(response)) is not None:
+                    response_cache().set(cache_key(etag), entry, timeout)
+                return finish(response, etag) if response.status_code == 200 else response
+        return inner
+    return decorator
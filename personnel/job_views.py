@@ -0,0 +1,49 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from .jobs import job_queue
+from .views import enqueue
+from . import tasks  # noqa: F401 (registers the task functions)
+
+
+@api_view(['GET', 'POST'])
+def jobs(request):
+    """Submit a background job ({"task": ..., "params": {...}}) or get queue counts"""
+    if request.method == 'GET':
+        return Response({'tasks': sorted(job_queue.tasks), 'jobs': job_queue.stats()})
+
+    task = request.data.get('task')
+    params = request.data.get('params') or {}
+    if task not in job_queue.tasks:
+        return Response({'error': f"task must be one of: {', '.join(sorted(job_queue.tasks))}"}, status=400)
+    if not isinstance(params, dict):
+        return Response({'error': 'params must be an object'}, status=400)
+
+    return enqueue(request, task, params)
+
+
+@api_view(['GET', 'DELETE'])
+def job_detail(request, job_id):
+    """Job status, progress and result; DELETE cancels it"""
+    if request.method == 'DELETE':
+        return _cancel(job_id)
+
+    job = job_queue.get(job_id)
+    if job is None:
+        return Response({'error': 'Job not found or its result has expired'}, status=404)
+    return Response(job)
+
+
+@api_view(['POST'])
+def cancel_job(request, job_id):
+    """Cancel a queued job, or ask a running one to stop at its next progress report"""
+    return _cancel(job_id)
+
+
+def _cancel(job_id):
+    job_status = job_queue.cancel(job_id)
+    if job_status is None:
+        return Response({'error': 'Job not found'}, status=404)
+    if job_status in ('succeeded', 'failed'):
+        return Response({'job_id': job_id, 'status': job_status, 'error': 'Job already finished'}, status=409)
+    return Response({'job_id': job_id, 'status': job_status, 'cancel_requested': True})
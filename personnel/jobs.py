@@ -0,0 +1,353 @@
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS jobs ('
+    'id TEXT PRIMARY KEY, task TEXT NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL, '
+    'progress REAL NOT NULL DEFAULT 0, message TEXT, result TEXT, error TEXT, '
+    'attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, cancel_requested INTEGER NOT NULL DEFAULT 0, '
+    'worker TEXT, created_at REAL NOT NULL, run_at REAL NOT NULL, started_at REAL, finished_at REAL, '
+    'lease_until REAL, expires_at REAL)',
+    'CREATE INDEX IF NOT EXISTS jobs_status_run_at ON jobs (status, run_at)',
+    'CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)',
+]
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a task when its job was cancelled while running"""
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class JobFailed(Exception):
+    """Raised by a task for failures a retry would not fix"""
+
+
+class JobContext:
+    """Handed to a running task: its params, progress reporting and cancellation checks"""
+
+    def __init__(self, queue, job_id, params, attempt):
+        self.queue = queue
+        self.id = job_id
+        self.params = params
+        self.attempt = attempt
+
+    def progress(self, fraction, message=None):
+        """Record progress (0-1), renew the lease; raises JobCancelled if cancelled or the lease was lost"""
+        if self.queue.report_progress(self.id, self.attempt, fraction, message):
+            raise JobCancelled(self.id)
+
+    def check_cancelled(self):
+        if self.queue.cancel_requested(self.id):
+            raise JobCancelled(self.id)
+
+
+class JobQueue:
+    """Durable job queue in a SQLite file, drained by a pool of worker processes.
+
+    Jobs are claimed with an immediate transaction, so any number of worker
+    processes (and the web processes submitting jobs) can share the file
+    without a broker. A running job holds a lease that each progress report
+    renews; jobs whose worker died are picked up again once the lease runs
+    out. Threads of one process share its connection, one at a time. Failed
+    attempts are retried with exponential backoff up to
+    max_attempts. Finished jobs keep their result for result_ttl seconds.
+    Cancelling a queued job takes effect at once; a running job stops at its
+    next progress report. A run whose lease expired (and whose job was
+    requeued or failed meanwhile) no longer owns the job: its progress,
+    retry and outcome are ignored.
+    """
+
+    def __init__(self, path=':memory:', result_ttl=3600, max_attempts=3, retry_delay=5, lease=600):
+        self.path = str(path)
+        self.result_ttl = result_ttl
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.tasks = {}
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._lock_pid = os.getpid()
+
+    @property
+    def conn(self):
+        # One connection per process: forked workers must not share the parent's
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            if self.path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+                self._conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+            self._pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def connection(self):
+        """The process's connection, held by this thread until the block exits"""
+        if self._lock_pid != os.getpid():
+            # A fork copies the lock in whatever state another thread left it
+            self._lock = threading.RLock()
+            self._lock_pid = os.getpid()
+        with self._lock:
+            yield self.conn
+
+    @contextmanager
+    def transaction(self):
+        """Hold the connection for one immediate (write-locked) transaction"""
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def task(self, name):
+        """Register a task function; it is called as func(job, **params)"""
+        def register(func):
+            self.tasks[name] = func
+            return func
+        return register
+
+    def submit(self, task, params=None, max_attempts=None):
+        """Queue a job and return its id"""
+        if task not in self.tasks:
+            raise KeyError(f"Unknown task '{task}'")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, task, params, status, max_attempts, created_at, run_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, task, json.dumps(params or {}, default=_json_default), QUEUED,
+                 max_attempts or self.max_attempts, now, now)
+            )
+        return job_id
+
+    def get(self, job_id):
+        """Job status, progress and (once finished) result or error; None if unknown or expired"""
+        with self.connection() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None or (row['expires_at'] is not None and row['expires_at'] < time.time()):
+            return None
+        return {
+            'job_id': row['id'],
+            'task': row['task'],
+            'status': row['status'],
+            'progress': row['progress'],
+            'message': row['message'],
+            'attempts': row['attempts'],
+            'max_attempts': row['max_attempts'],
+            'cancel_requested': bool(row['cancel_requested']),
+            'result': json.loads(row['result']) if row['result'] is not None else None,
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'expires_at': row['expires_at'],
+        }
+
+    def cancel(self, job_id):
+        """Cancel a job; returns its status afterwards, or None if it does not exist"""
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row['status'] == QUEUED:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ?, expires_at = ? WHERE id = ?',
+                    (CANCELLED, now, now + self.result_ttl, job_id)
+                )
+                return CANCELLED
+            if row['status'] == RUNNING:
+                conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+            return row['status']
+
+    def cancel_requested(self, job_id):
+        with self.connection() as conn:
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def report_progress(self, job_id, attempt, fraction, message=None):
+        """Store progress and renew the lease; returns whether the run should stop
+
+        It should stop when cancellation was requested or when the job is no
+        longer running as this attempt (its lease expired).
+        """
+        with self.connection() as conn:
+            owned = conn.execute(
+                'UPDATE jobs SET progress = ?, message = coalesce(?, message), lease_until = ? '
+                'WHERE id = ? AND status = ? AND attempts = ?',
+                (min(max(float(fraction), 0.0), 1.0), message, time.time() + self.lease, job_id, RUNNING, attempt)
+            ).rowcount
+        return not owned or self.cancel_requested(job_id)
+
+    def claim(self, worker):
+        """Take the oldest runnable job for this worker, or None"""
+        now = time.time()
+        with self.transaction() as conn:
+            self._recover_expired_leases(conn, now)
+            row = conn.execute(
+                'SELECT id, task, params, attempts FROM jobs WHERE status = ? AND run_at <= ? '
+                'ORDER BY run_at LIMIT 1', (QUEUED, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, started_at = ?, '
+                    'lease_until = ?, error = NULL WHERE id = ?',
+                    (RUNNING, worker, now, now + self.lease, row['id'])
+                )
+        if row is None:
+            return None
+        return JobContext(self, row['id'], json.loads(row['params']), row['attempts'] + 1), row['task']
+
+    def _recover_expired_leases(self, conn, now):
+        # Jobs whose worker died mid-run: retry them, or fail them once out of attempts
+        conn.execute(
+            'UPDATE jobs SET status = CASE WHEN attempts < max_attempts AND NOT cancel_requested THEN ? ELSE ? END, '
+            'error = ?, finished_at = CASE WHEN attempts < max_attempts AND NOT cancel_requested THEN NULL ELSE ? END, '
+            'expires_at = CASE WHEN attempts < max_attempts AND NOT cancel_requested THEN NULL ELSE ? END '
+            'WHERE status = ? AND lease_until < ?',
+            (QUEUED, FAILED, 'Worker stopped before the job finished', now, now + self.result_ttl, RUNNING, now)
+        )
+
+    def _finish(self, job, status, result=None, error=None):
+        """Record the outcome of a run and return status; None if the job has moved on to another attempt"""
+        now = time.time()
+        with self.connection() as conn:
+            owned = conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, progress = CASE WHEN ? THEN 1 ELSE progress END, '
+                'finished_at = ?, expires_at = ?, lease_until = NULL WHERE id = ? AND status = ? AND attempts = ?',
+                (status, None if result is None else json.dumps(result, default=_json_default), error,
+                 status == SUCCEEDED, now, now + self.result_ttl, job.id, RUNNING, job.attempt)
+            ).rowcount
+        if not owned:
+            print(f"⚠️ Job {job.id} attempt {job.attempt} lost its lease; ignoring its outcome ({status})")
+            return None
+        return status
+
+    def run(self, job, task):
+        """Run a claimed job and record its outcome; returns the new status, or None if the run lost its lease"""
+        try:
+            func = self.tasks[task]
+        except KeyError:
+            return self._finish(job, FAILED, error=f"Unknown task '{task}'")
+        try:
+            result = func(job, **job.params)
+        except JobCancelled:
+            return self._finish(job, CANCELLED)
+        except JobFailed as e:
+            return self._finish(job, FAILED, error=str(e))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            with self.connection() as conn:
+                row = conn.execute('SELECT max_attempts, cancel_requested FROM jobs WHERE id = ?', (job.id,)).fetchone()
+                retry = job.attempt < row['max_attempts'] and not row['cancel_requested']
+                owned = retry and conn.execute(
+                    'UPDATE jobs SET status = ?, error = ?, run_at = ?, lease_until = NULL '
+                    'WHERE id = ? AND status = ? AND attempts = ?',
+                    (QUEUED, error, time.time() + self.retry_delay * 2 ** (job.attempt - 1), job.id, RUNNING, job.attempt)
+                ).rowcount
+            if retry:
+                if not owned:
+                    print(f"⚠️ Job {job.id} attempt {job.attempt} lost its lease; not retrying it: {error}")
+                    return None
+                print(f"⚠️ Job {job.id} ({task}) attempt {job.attempt} failed, retrying: {error}")
+                return QUEUED
+            return self._finish(job, FAILED, error=error + '\n' + traceback.format_exc(limit=5))
+        return self._finish(job, SUCCEEDED, result=result)
+
+    def purge_expired(self):
+        """Delete finished jobs whose results are past their TTL; returns how many"""
+        with self.connection() as conn:
+            return conn.execute('DELETE FROM jobs WHERE expires_at < ?', (time.time(),)).rowcount
+
+    def stats(self):
+        with self.connection() as conn:
+            counts = dict(conn.execute('SELECT status, count(*) FROM jobs GROUP BY status').fetchall())
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)}
+
+    def work(self, worker, poll_interval=1.0, burst=False, stop=None):
+        """Claim and run jobs until stop is set (or, in burst mode, until the queue is empty)"""
+        processed = 0
+        last_purge = 0
+        while stop is None or not stop.is_set():
+            if time.monotonic() - last_purge > 60:
+                self.purge_expired()
+                last_purge = time.monotonic()
+            claimed = self.claim(worker)
+            if claimed is None:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+            self.run(*claimed)
+            processed += 1
+        return processed
+
+
+def _worker_main(worker, poll_interval, burst):
+    from django.db import connections
+
+    # The parent handles Ctrl-C and stops workers through the shared event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from . import tasks  # noqa: F401 (registers the task functions)
+    try:
+        job_queue.work(worker, poll_interval, burst, _stop)
+    finally:
+        connections.close_all()
+
+
+_stop = None
+
+
+def start_workers(count, poll_interval=1.0, burst=False):
+    """Fork count worker processes draining job_queue; returns (processes, stop event)"""
+    global _stop
+    from django.db import connections
+
+    connections.close_all()  # children open their own database connections
+    context = multiprocessing.get_context('fork')
+    _stop = context.Event()
+    processes = [
+        context.Process(target=_worker_main, args=(f'{os.uname().nodename}:{os.getpid()}:{n}', poll_interval, burst),
+                        name=f'job-worker-{n}', daemon=False)
+        for n in range(count)
+    ]
+    for process in processes:
+        process.start()
+    return processes, _stop
+
+
+queue_config = getattr(settings, 'JOB_QUEUE', {})
+job_queue = JobQueue(
+    path=queue_config.get('PATH', ':memory:'),
+    result_ttl=queue_config.get('RESULT_TTL_SECONDS', 3600),
+    max_attempts=queue_config.get('MAX_ATTEMPTS', 3),
+    retry_delay=queue_config.get('RETRY_DELAY_SECONDS', 5),
+    lease=queue_config.get('LEASE_SECONDS', 600)
+)
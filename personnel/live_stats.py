@@ -0,0 +1,252 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Avg, Count
+
+from .models import AirBase, Aircraft, LeaveRequest, Personnel
+
+RETRY_MS = 3000  # EventSource reconnect delay sent to clients
+
+
+PERFORMANCE_METRICS = {
+    'avg_performance': Avg('performance_score'),
+    'avg_leadership': Avg('leadership_score'),
+    'avg_technical': Avg('technical_score')
+}
+
+
+def _snapshot_queries():
+    """Querysets behind the dashboard snapshot: (queryset, evaluated as a count or as rows)"""
+    return {
+        'status_counts': (Personnel.objects.values_list('status').annotate(count=Count('personnel_id')), 'rows'),
+        'rank_distribution': (Personnel.objects.values('rank').annotate(count=Count('rank')).order_by('rank'), 'rows'),
+        'unit_distribution': (Personnel.objects.values('unit').annotate(count=Count('unit')).order_by('unit'), 'rows'),
+        'base_distribution': (
+            Personnel.objects.values('base_location').annotate(count=Count('personnel_id')).order_by('base_location'),
+            'rows'
+        ),
+        'total_aircraft': (Aircraft.objects.all(), 'count'),
+        'operational_aircraft': (Aircraft.objects.filter(status='Operational'), 'count'),
+        'aircraft_with_pilots': (Aircraft.objects.filter(pilot_assigned__isnull=False), 'count'),
+        'total_bases': (AirBase.objects.all(), 'count'),
+        'operational_bases': (AirBase.objects.filter(status='Operational'), 'count'),
+        'leave_requests': (LeaveRequest.objects.values_list('status').annotate(count=Count('id')), 'rows'),
+    }
+
+
+def _assemble_snapshot(results):
+    status_counts = dict(results['status_counts'])
+    total_personnel = sum(status_counts.values())
+    active_personnel = status_counts.get('Active', 0)
+    total_aircraft, operational_aircraft = results['total_aircraft'], results['operational_aircraft']
+    total_bases, operational_bases = results['total_bases'], results['operational_bases']
+
+    return {
+        'total_personnel': total_personnel,
+        'active_personnel': active_personnel,
+        'on_leave': status_counts.get('On Leave', 0),
+        'in_training': status_counts.get('Training', 0),
+        'deployed': status_counts.get('Deployed', 0),
+        'rank_distribution': results['rank_distribution'],
+        'unit_distribution': results['unit_distribution'],
+        'base_distribution': results['base_distribution'],
+        'aircraft_stats': {
+            'total_aircraft': total_aircraft,
+            'operational_aircraft': operational_aircraft,
+            'aircraft_with_pilots': results['aircraft_with_pilots'],
+            'aircraft_readiness': round((operational_aircraft / total_aircraft) * 100, 1) if total_aircraft > 0 else 0
+        },
+        'base_stats': {
+            'total_bases': total_bases,
+            'operational_bases': operational_bases,
+            'base_readiness': round((operational_bases / total_bases) * 100, 1) if total_bases > 0 else 0
+        },
+        'leave_requests': dict(results['leave_requests']),
+        'performance_metrics': results['performance_metrics'],
+        'readiness_percentage': round((active_personnel / total_personnel) * 100, 1) if total_personnel > 0 else 0
+    }
+
+
+def dashboard_snapshot():
+    """Dashboard statistics, aggregated once and shared by the stats endpoint and the live feed"""
+    results = {
+        name: queryset.count() if kind == 'count' else list(queryset)
+        for name, (queryset, kind) in _snapshot_queries().items()
+    }
+    results['performance_metrics'] = Personnel.objects.aggregate(**PERFORMANCE_METRICS)
+    return _assemble_snapshot(results)
+
+
+async def adashboard_snapshot():
+    """dashboard_snapshot through the async ORM, for async views"""
+    results = {}
+    for name, (queryset, kind) in _snapshot_queries().items():
+        results[name] = await queryset.acount() if kind == 'count' else [row async for row in queryset]
+    results['performance_metrics'] = await Personnel.objects.aaggregate(**PERFORMANCE_METRICS)
+    return _assemble_snapshot(results)
+
+
+def format_event(name, event_id, data):
+    return f"event: {name}\nid: {event_id}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class DashboardFeed:
+    """Fans one server-side dashboard aggregation out to every live subscriber.
+
+    Saves and deletes mark the stats as changed. While anyone is subscribed, a
+    single refresher thread re-aggregates (debounced, and every refresh
+    interval to catch bulk updates that send no signals) and publishes only
+    the keys that changed as a numbered delta event. Subscribers read events
+    after the last id they saw, so a client reconnecting with Last-Event-ID
+    gets the deltas it missed from the history buffer. It gets a full
+    snapshot instead when it fell too far behind or the server restarted.
+    """
+
+    def __init__(self, aggregate=dashboard_snapshot, debounce=0.5, refresh_interval=60, heartbeat=15, history=100):
+        self.aggregate = aggregate
+        self.debounce = debounce
+        self.refresh_interval = refresh_interval
+        self.heartbeat = heartbeat
+        self.epoch = format(int(time.time() * 1000), 'x')  # event ids from another process are never replayed
+        self.version = 0
+        self.snapshot = None
+        self.stale = True
+        self._history = deque(maxlen=history)  # (version, changed keys)
+        self._condition = threading.Condition()
+        self._changed = threading.Event()
+        self._waiters = set()  # (event loop, asyncio.Event) of async subscribers
+        self._subscribers = 0
+        self._refresher = None
+
+    def mark_changed(self):
+        self.stale = True
+        self._changed.set()
+
+    def refresh(self):
+        """Re-aggregate and publish the keys that changed; returns them (empty when nothing did)"""
+        self.stale = False
+        self._changed.clear()
+        stats = self.aggregate()
+        with self._condition:
+            if self.snapshot is None:
+                delta = stats
+            else:
+                delta = {key: value for key, value in stats.items() if self.snapshot.get(key) != value}
+                if not delta:
+                    return {}
+            self.snapshot = stats
+            self.version += 1
+            self._history.append((self.version, delta))
+            self._condition.notify_all()
+            waiters = list(self._waiters)
+
+        for loop, wake in waiters:
+            loop.call_soon_threadsafe(wake.set)
+        return delta
+
+    def event_id(self, version):
+        return f"{self.epoch}-{version}"
+
+    def events_after(self, last_event_id):
+        """Events a subscriber has not seen yet, as (name, id, data) tuples"""
+        with self._condition:
+            if self.snapshot is None:
+                return []
+            last = self._parse(last_event_id)
+            oldest = self._history[0][0] if self._history else self.version + 1
+            if last is None or last > self.version or last < oldest - 1:
+                return [('snapshot', self.event_id(self.version), self.snapshot)]
+            return [('delta', self.event_id(version), delta) for version, delta in self._history if version > last]
+
+    def _parse(self, event_id):
+        epoch, _, version = (event_id or '').partition('-')
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        return int(version)
+
+    def subscribe(self, loop=None, wake=None):
+        with self._condition:
+            self._subscribers += 1
+            if loop is not None:
+                self._waiters.add((loop, wake))
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._run_refresher, daemon=True, name='dashboard-feed')
+                self._refresher.start()
+
+    def unsubscribe(self, loop=None, wake=None):
+        with self._condition:
+            self._subscribers -= 1
+            self._waiters.discard((loop, wake))
+            last = not self._subscribers
+        if last:
+            self._changed.set()  # wake the refresher so it can exit
+
+    def stats(self):
+        with self._condition:
+            return {'subscribers': self._subscribers, 'version': self.version, 'buffered_events': len(self._history)}
+
+    def _run_refresher(self):
+        try:
+            while True:
+                changed = self._changed.wait(self.refresh_interval)
+                with self._condition:
+                    if not self._subscribers:
+                        self._refresher = None
+                        return
+                if changed:
+                    time.sleep(self.debounce)  # coalesce bursts of saves into one aggregation
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Dashboard feed refresh failed: {e}")
+        finally:
+            connections.close_all()
+
+    def stream(self, last_event_id=None):
+        """Blocking SSE generator (one worker thread per client under WSGI)"""
+        self.subscribe()
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                for name, event_id, data in self.events_after(last_event_id):
+                    last_event_id = event_id
+                    yield format_event(name, event_id, data)
+                with self._condition:
+                    seen = self._parse(last_event_id)
+                    if not self._condition.wait_for(lambda: self.version > (seen or 0), self.heartbeat):
+                        yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe()
+
+    async def astream(self, last_event_id=None):
+        """Async SSE generator: under ASGI, idle clients hold no thread"""
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        self.subscribe(loop, wake)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                wake.clear()
+                for name, event_id, data in self.events_after(last_event_id):
+                    last_event_id = event_id
+                    yield format_event(name, event_id, data)
+                try:
+                    await asyncio.wait_for(wake.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe(loop, wake)
+
+
+stream_config = getattr(settings, 'DASHBOARD_STREAM', {})
+dashboard_feed = DashboardFeed(
+    debounce=stream_config.get('DEBOUNCE_SECONDS', 0.5),
+    refresh_interval=stream_config.get('REFRESH_SECONDS', 60),
+    heartbeat=stream_config.get('HEARTBEAT_SECONDS', 15),
+    history=stream_config.get('HISTORY', 100)
+)
@@ -0,0 +1,60 @@
+import json
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from ai_models.nlp_models import StreamingThemeExtractor
+from personnel.models import HRRecord, PerformanceReview
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = 'Extract top feedback themes per unit, rank and feedback type from HR records and reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='records read per chunk')
+        parser.add_argument('--top', type=int, default=10, help='themes per group')
+        parser.add_argument('--output', help='write the themes as JSON to this file')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        extractor = StreamingThemeExtractor()
+        chunk_size = options['chunk_size']
+
+        hr_records = HRRecord.objects.values_list(
+            'description', 'record_type', 'personnel__unit', 'personnel__rank'
+        ).iterator(chunk_size=chunk_size)
+        reviews = PerformanceReview.objects.values_list(
+            'goals_achieved', 'areas_for_improvement', 'personnel__unit', 'personnel__rank'
+        ).iterator(chunk_size=chunk_size)
+
+        for chunk in _chunks(hr_records, chunk_size):
+            texts, feedback_types, units, ranks = zip(*chunk)
+            extractor.partial_fit(texts, {'unit': units, 'rank': ranks, 'feedback_type': feedback_types})
+
+        for chunk in _chunks(reviews, chunk_size):
+            goals, improvements, units, ranks = zip(*chunk)
+            texts = [f'{goal} {improvement}' for goal, improvement in zip(goals, improvements)]
+            extractor.partial_fit(texts, {'unit': units, 'rank': ranks, 'feedback_type': ['performance_review'] * len(texts)})
+
+        themes = extractor.top_themes(options['top'])
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(themes, f, indent=2)
+            self.stdout.write(f"Themes written to {options['output']}")
+        else:
+            self.stdout.write(json.dumps(themes, indent=2))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {extractor.n_documents} feedback records in {time.perf_counter() - started:.1f}s'
+        ))
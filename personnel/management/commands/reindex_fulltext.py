@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from personnel.fulltext import FULLTEXT_TABLE, fulltext_schema_sql, reindex_sql
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 full-text index over HR, medical, review, leave and mission text'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Full-text search requires the SQLite backend')
+
+        self.stdout.write(f'Rebuilding {FULLTEXT_TABLE}...')
+        started = time.perf_counter()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in fulltext_schema_sql() + reindex_sql():
+                cursor.execute(statement)
+            cursor.execute(f'SELECT count(*) FROM {FULLTEXT_TABLE}')
+            indexed = cursor.fetchone()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed} text fields in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,33 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from personnel.jobs import job_queue, start_workers
+
+
+class Command(BaseCommand):
+    help = 'Start the worker processes that run background jobs from the SQLite job queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'JOB_QUEUE', {}).get('WORKERS', 2),
+                            help='worker processes')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='seconds between polls of an empty queue')
+        parser.add_argument('--burst', action='store_true', help='exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Starting {options['workers']} job workers on {job_queue.path} ({job_queue.stats()})")
+        processes, stop = start_workers(options['workers'], options['poll_interval'], options['burst'])
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+        try:
+            while any(process.is_alive() for process in processes):
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping workers after their current jobs...')
+            stop.set()
+        for process in processes:
+            process.join()
+
+        self.stdout.write(self.style.SUCCESS(f'Job workers stopped ({job_queue.stats()})'))
@@ -0,0 +1,33 @@
+import io
+import pstats
+
+from django.core.management.base import BaseCommand
+
+from personnel.profiling import profile_store
+
+
+class Command(BaseCommand):
+    help = 'List the slowest request profiles captured with X-Profile / ?_profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='profiles to list')
+        parser.add_argument('--view', help='only views or paths containing this')
+        parser.add_argument('--top', type=int, default=0,
+                            help='also print the N functions with the most cumulative time of each cProfile profile')
+
+    def handle(self, *args, **options):
+        profiles = profile_store.slowest(options['limit'], options['view'])
+        if not profiles:
+            self.stdout.write(f'No profiles in {profile_store.directory}')
+            return
+
+        self.stdout.write(f"{'ms':>10}{'queries':>9}{'status':>8}  {'method':<7}{'mode':<10}{'captured':<21}{'path'}")
+        for meta in profiles:
+            queries = meta['sql_queries'] if meta.get('sql_queries') is not None else '-'
+            self.stdout.write(f"{meta['duration_ms']:>10.1f}{queries:>9}{meta['status']:>8}  {meta['method']:<7}"
+                              f"{meta['mode']:<10}{meta['created_at']:<21}{meta['path']}")
+            self.stdout.write(f"{'':>29}{profile_store.path(meta)}")
+            if options['top'] and meta['mode'] == 'cprofile':
+                report = io.StringIO()
+                pstats.Stats(str(profile_store.path(meta)), stream=report).sort_stats('cumulative').print_stats(options['top'])
+                self.stdout.write(report.getvalue())
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_models.lazy_imports import CAPABILITIES, preload
+
+
+class Command(BaseCommand):
+    help = 'Preload the AI libraries that are otherwise imported on first use'
+
+    def add_arguments(self, parser):
+        parser.add_argument('capabilities', nargs='*', help=f"capabilities to load ({', '.join(CAPABILITIES)}); default all")
+        parser.add_argument('--strict', action='store_true', help='fail if any library is missing')
+
+    def handle(self, *args, **options):
+        capabilities = options['capabilities']
+        unknown = [name for name in capabilities if name not in CAPABILITIES]
+        if unknown:
+            raise CommandError(f"Unknown capability: {', '.join(unknown)}. Must be one of: {', '.join(CAPABILITIES)}")
+
+        missing = []
+        for capability in capabilities or CAPABILITIES:
+            started = time.perf_counter()
+            results = preload(capability)
+            if capability == 'vision' and not any(results.values()):
+                from ai_models.computer_vision import get_face_cascade
+                get_face_cascade()
+            elapsed = time.perf_counter() - started
+
+            errors = [error for error in results.values() if error]
+            missing += errors
+            if errors:
+                self.stdout.write(self.style.WARNING(f'{capability}: {len(errors)} of {len(results)} libraries unavailable'))
+                for error in errors:
+                    self.stdout.write(f'  {error}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{capability}: loaded {len(results)} libraries in {elapsed:.2f}s'))
+
+        if missing and options['strict']:
+            raise CommandError(f'{len(missing)} libraries could not be loaded')
@@ -0,0 +1,238 @@
+import contextvars
+import heapq
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+metrics_config = getattr(settings, 'REQUEST_METRICS', {})
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+current_request = contextvars.ContextVar('current_request', default=None)
+
+
+class RequestStats:
+    """SQL and serialization time of one request, collected wherever its context runs"""
+
+    __slots__ = ('sql_count', 'sql_time', 'serialization_time', 'slow_queries', 'keep')
+
+    def __init__(self, keep):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+        self.slow_queries = []  # min-heap of (seconds, sql), the keep slowest
+        self.keep = keep
+
+    def add_query(self, sql, elapsed):
+        self.sql_count += 1
+        self.sql_time += elapsed
+        if self.keep:
+            if len(self.slow_queries) < self.keep:
+                heapq.heappush(self.slow_queries, (elapsed, sql))
+            elif elapsed > self.slow_queries[0][0]:
+                heapq.heapreplace(self.slow_queries, (elapsed, sql))
+
+
+def record_serialization(elapsed):
+    stats = current_request.get()
+    if stats is not None:
+        stats.serialization_time += elapsed
+
+
+def _query_timer(execute, sql, params, many, context):
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(sql, time.perf_counter() - started)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    if _query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_timer)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+METRICS = {
+    'request_duration_seconds': ('Wall time per request', DURATION_BUCKETS),
+    'request_sql_seconds': ('Time spent in SQL queries per request', DURATION_BUCKETS),
+    'request_python_seconds': ('Time outside SQL and serialization per request', DURATION_BUCKETS),
+    'request_serialization_seconds': ('Time spent encoding JSON per request', DURATION_BUCKETS),
+    'request_sql_queries': ('SQL queries per request', QUERY_BUCKETS),
+    'response_size_bytes': ('Response body size (after compression)', SIZE_BUCKETS),
+}
+
+
+class MetricsRegistry:
+    """Per-view histograms of request latency, SQL, serialization and response size"""
+
+    def __init__(self, prefix='iaf_hms'):
+        self.prefix = prefix
+        self._histograms = {}  # (metric, view, method) -> Histogram
+        self._requests = {}  # (view, method, status class) -> count
+        self._lock = threading.Lock()
+
+    def observe(self, view, method, status, values):
+        with self._lock:
+            key = (view, method, f'{status // 100}xx')
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for metric, value in values.items():
+                histogram = self._histograms.get((metric, view, method))
+                if histogram is None:
+                    histogram = self._histograms[(metric, view, method)] = Histogram(METRICS[metric][1])
+                histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+    def render(self):
+        """Prometheus text exposition format"""
+        def labels(**values):
+            escaped = {name: str(value).replace('\\', '\\\\').replace('"', '\\"') for name, value in values.items()}
+            return ','.join(f'{name}="{value}"' for name, value in escaped.items())
+
+        with self._lock:
+            lines = [f'# HELP {self.prefix}_requests_total Requests by view, method and status class',
+                     f'# TYPE {self.prefix}_requests_total counter']
+            for (view, method, status), count in sorted(self._requests.items()):
+                lines.append(f'{self.prefix}_requests_total{{{labels(view=view, method=method, status=status)}}} {count}')
+
+            for metric, (description, _) in METRICS.items():
+                name = f'{self.prefix}_{metric}'
+                lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+                for (histogram_metric, view, method), histogram in sorted(self._histograms.items()):
+                    if histogram_metric != metric:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels(view=view, method=method, le=bound)}}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels(view=view, method=method, le="+Inf")}}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{labels(view=view, method=method)}}} {histogram.sum:.6g}')
+                    lines.append(f'{name}_count{{{labels(view=view, method=method)}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetricsMiddleware:
+    """Records SQL count and time, serialization time, Python time and response size per view.
+
+    Queries are timed by a wrapper installed on every database connection,
+    so ORM calls made on other threads (async views) are still attributed
+    to the request through its context. Requests slower than
+    SLOW_REQUEST_MS print a trace with their slowest queries. With
+    REQUEST_METRICS['ENABLED'] off the middleware removes itself and no
+    query wrapper is installed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_config.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = metrics_config.get('SLOW_REQUEST_MS', 500) / 1000
+        self.keep = metrics_config.get('SLOW_QUERY_COUNT', 5)
+        connection_created.connect(instrument_connection, dispatch_uid='request-metrics')
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(None, connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, started = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self._finish(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        stats, token, started = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self._finish(request, response, stats, started)
+        return response
+
+    def _start(self):
+        stats = RequestStats(self.keep)
+        return stats, current_request.set(stats), time.perf_counter()
+
+    def _finish(self, request, response, stats, started):
+        elapsed = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        view = (match.route or match.view_name) if match else 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(view, request.method, response.status_code, {
+            'request_duration_seconds': elapsed,
+            'request_sql_seconds': stats.sql_time,
+            'request_serialization_seconds': stats.serialization_time,
+            'request_python_seconds': max(elapsed - stats.sql_time - stats.serialization_time, 0.0),
+            'request_sql_queries': stats.sql_count,
+            'response_size_bytes': size,
+        })
+
+        if elapsed >= self.slow_seconds and not response.streaming:
+            print(f"⚠️ Slow request {request.method} {request.get_full_path()} ({view}): {elapsed * 1000:.0f} ms, "
+                  f"{stats.sql_count} queries in {stats.sql_time * 1000:.0f} ms, "
+                  f"serialization {stats.serialization_time * 1000:.0f} ms, {size} bytes")
+            for seconds, sql in sorted(stats.slow_queries, reverse=True):
+                print(f"    {seconds * 1000:8.1f} ms  {sql[:300]}")
+
+
+def can_view_metrics(request):
+    """Scrapers from REQUEST_METRICS['ALLOWED_IPS'], superusers, staff (with ALLOW_STAFF) and members of ROLES groups"""
+    if request.META.get('REMOTE_ADDR') in metrics_config.get('ALLOWED_IPS', ()):
+        return True
+    user = getattr(request, 'user', None)
+    if not getattr(user, 'is_authenticated', False):
+        return False
+    if user.is_superuser or (metrics_config.get('ALLOW_STAFF', True) and user.is_staff):
+        return True
+    roles = metrics_config.get('ROLES', [])
+    return bool(roles) and user.groups.filter(name__in=roles).exists()
+
+
+def metrics_view(request):
+    """Request metrics in Prometheus text format"""
+    if not can_view_metrics(request):
+        return HttpResponse('Metrics are restricted\n', status=403, content_type='text/plain; charset=utf-8')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
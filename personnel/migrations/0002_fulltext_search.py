@@ -0,0 +1,142 @@
+from django.db import migrations
+
+# The SQL is written out here rather than built by personnel.fulltext, so later
+# changes to that module cannot change what this migration does.
+# Index rowids are (record_id << 3) | source code, letting the triggers update
+# and delete index rows by rowid.
+CREATE_SQL = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS personnel_fulltext USING fts5('
+    "body, source UNINDEXED, record_id UNINDEXED, personnel_id UNINDEXED, tokenize = 'porter unicode61')",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_hr_description_ai AFTER INSERT ON personnel_hrrecord'
+    ' BEGIN INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 1), new.description, 'hr_description', new.id, new.personnel_id"
+    " WHERE coalesce(new.description, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_hr_description_ad AFTER DELETE ON personnel_hrrecord'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 1); END',
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_hr_description_au AFTER UPDATE ON personnel_hrrecord'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 1);'
+    ' INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 1), new.description, 'hr_description', new.id, new.personnel_id"
+    " WHERE coalesce(new.description, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_medical_notes_ai AFTER INSERT ON personnel_medicalrecord'
+    ' BEGIN INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 2), new.medical_notes, 'medical_notes', new.id, new.personnel_id"
+    " WHERE coalesce(new.medical_notes, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_medical_notes_ad AFTER DELETE ON personnel_medicalrecord'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 2); END',
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_medical_notes_au AFTER UPDATE ON personnel_medicalrecord'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 2);'
+    ' INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 2), new.medical_notes, 'medical_notes', new.id, new.personnel_id"
+    " WHERE coalesce(new.medical_notes, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_review_goals_achieved_ai AFTER INSERT ON personnel_performancereview'
+    ' BEGIN INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 3), new.goals_achieved, 'review_goals_achieved', new.id, new.personnel_id"
+    " WHERE coalesce(new.goals_achieved, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_review_goals_achieved_ad AFTER DELETE ON personnel_performancereview'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 3); END',
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_review_goals_achieved_au AFTER UPDATE ON personnel_performancereview'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 3);'
+    ' INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 3), new.goals_achieved, 'review_goals_achieved', new.id, new.personnel_id"
+    " WHERE coalesce(new.goals_achieved, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_review_areas_for_improvement_ai AFTER INSERT ON personnel_performancereview'
+    ' BEGIN INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 4), new.areas_for_improvement, 'review_areas_for_improvement', new.id, new.personnel_id"
+    " WHERE coalesce(new.areas_for_improvement, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_review_areas_for_improvement_ad AFTER DELETE ON personnel_performancereview'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 4); END',
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_review_areas_for_improvement_au AFTER UPDATE ON personnel_performancereview'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 4);'
+    ' INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 4), new.areas_for_improvement, 'review_areas_for_improvement', new.id, new.personnel_id"
+    " WHERE coalesce(new.areas_for_improvement, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_leave_reason_ai AFTER INSERT ON personnel_leaverequest'
+    ' BEGIN INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 5), new.reason, 'leave_reason', new.id, new.personnel_id"
+    " WHERE coalesce(new.reason, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_leave_reason_ad AFTER DELETE ON personnel_leaverequest'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 5); END',
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_leave_reason_au AFTER UPDATE ON personnel_leaverequest'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 5);'
+    ' INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 5), new.reason, 'leave_reason', new.id, new.personnel_id"
+    " WHERE coalesce(new.reason, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_mission_description_ai AFTER INSERT ON personnel_missionrecord'
+    ' BEGIN INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 6), new.description, 'mission_description', new.id, NULL"
+    " WHERE coalesce(new.description, '') != ''; END",
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_mission_description_ad AFTER DELETE ON personnel_missionrecord'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 6); END',
+    'CREATE TRIGGER IF NOT EXISTS personnel_fulltext_mission_description_au AFTER UPDATE ON personnel_missionrecord'
+    ' BEGIN DELETE FROM personnel_fulltext WHERE rowid = ((old.id << 3) | 6);'
+    ' INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((new.id << 3) | 6), new.description, 'mission_description', new.id, NULL"
+    " WHERE coalesce(new.description, '') != ''; END",
+]
+
+REINDEX_SQL = [
+    'DELETE FROM personnel_fulltext',
+    'INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((id << 3) | 1), description, 'hr_description', id, personnel_id"
+    " FROM personnel_hrrecord WHERE coalesce(description, '') != ''",
+    'INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((id << 3) | 2), medical_notes, 'medical_notes', id, personnel_id"
+    " FROM personnel_medicalrecord WHERE coalesce(medical_notes, '') != ''",
+    'INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((id << 3) | 3), goals_achieved, 'review_goals_achieved', id, personnel_id"
+    " FROM personnel_performancereview WHERE coalesce(goals_achieved, '') != ''",
+    'INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((id << 3) | 4), areas_for_improvement, 'review_areas_for_improvement', id, personnel_id"
+    " FROM personnel_performancereview WHERE coalesce(areas_for_improvement, '') != ''",
+    'INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((id << 3) | 5), reason, 'leave_reason', id, personnel_id FROM personnel_leaverequest"
+    " WHERE coalesce(reason, '') != ''",
+    'INSERT INTO personnel_fulltext (rowid, body, source, record_id, personnel_id)'
+    " SELECT ((id << 3) | 6), description, 'mission_description', id, NULL"
+    " FROM personnel_missionrecord WHERE coalesce(description, '') != ''",
+    "INSERT INTO personnel_fulltext (personnel_fulltext) VALUES ('optimize')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS personnel_fulltext_hr_description_ai',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_hr_description_ad',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_hr_description_au',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_medical_notes_ai',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_medical_notes_ad',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_medical_notes_au',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_review_goals_achieved_ai',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_review_goals_achieved_ad',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_review_goals_achieved_au',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_review_areas_for_improvement_ai',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_review_areas_for_improvement_ad',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_review_areas_for_improvement_au',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_leave_reason_ai',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_leave_reason_ad',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_leave_reason_au',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_mission_description_ai',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_mission_description_ad',
+    'DROP TRIGGER IF EXISTS personnel_fulltext_mission_description_au',
+    'DROP TABLE IF EXISTS personnel_fulltext',
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # FTS5 is SQLite-only; other backends keep using icontains
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personnel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL + REINDEX_SQL), _run(DROP_SQL)),
+    ]
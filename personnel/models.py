@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from datetime import datetime, timedelta
 
+from .change_tracking import ChangeTrackingManager
+
 class Personnel(models.Model):
     RANK_CHOICES = [
         ('Air Chief Marshal', 'Air Chief Marshal'),
@@ -53,6 +55,8 @@ class Personnel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.rank} {self.name} ({self.personnel_id})"
 
@@ -77,7 +81,9 @@ class SignupRequest(models.Model):
     reviewed_by = models.CharField(max_length=100, blank=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
     rejection_reason = models.TextField(blank=True)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.name} ({self.personnel_id}) - {self.status}"
 
@@ -87,7 +93,9 @@ class HRRecord(models.Model):
     description = models.TextField()
     date_created = models.DateTimeField(auto_now_add=True)
     created_by = models.CharField(max_length=100)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - {self.record_type}"
 
@@ -111,7 +119,9 @@ class MedicalRecord(models.Model):
     fitness_level = models.CharField(max_length=20)
     medical_notes = models.TextField(blank=True)
     next_checkup = models.DateField()
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - Medical Record ({self.checkup_date})"
 
@@ -134,7 +144,9 @@ class TrainingRecord(models.Model):
     instructor = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
     certification_earned = models.CharField(max_length=200, blank=True)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - {self.course_name}"
 
@@ -155,7 +167,9 @@ class MissionRecord(models.Model):
     location = models.CharField(max_length=100)
     description = models.TextField()
     personnel = models.ManyToManyField(Personnel, through='MissionAssignment')
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.mission_name} ({self.mission_id})"
 
@@ -172,7 +186,9 @@ class MissionAssignment(models.Model):
     mission = models.ForeignKey(MissionRecord, on_delete=models.CASCADE)
     role = models.CharField(max_length=50, choices=ROLE_CHOICES)
     assigned_date = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - {self.mission.mission_name} ({self.role})"
 
@@ -192,7 +208,9 @@ class Equipment(models.Model):
     assigned_personnel = models.ForeignKey(Personnel, on_delete=models.SET_NULL, null=True, blank=True)
     last_maintenance = models.DateField()
     next_maintenance = models.DateField()
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.name} ({self.equipment_id})"
 
@@ -219,7 +237,9 @@ class MaintenanceRecord(models.Model):
     technician = models.CharField(max_length=100)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
     cost = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.equipment.name} - {self.maintenance_type} ({self.scheduled_date})"
 
@@ -249,7 +269,9 @@ class LeaveRequest(models.Model):
     applied_date = models.DateTimeField(auto_now_add=True)
     approved_by = models.CharField(max_length=100, blank=True)
     approval_date = models.DateTimeField(null=True, blank=True)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - {self.leave_type} ({self.start_date} to {self.end_date})"
 
@@ -268,7 +290,9 @@ class Skill(models.Model):
     years_of_experience = models.IntegerField()
     certified = models.BooleanField(default=False)
     certification_date = models.DateField(null=True, blank=True)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - {self.skill_name} ({self.proficiency_level})"
 
@@ -285,7 +309,9 @@ class PerformanceReview(models.Model):
     areas_for_improvement = models.TextField()
     reviewer_name = models.CharField(max_length=100)
     review_date = models.DateField()
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - Performance Review ({self.review_date})"
 
@@ -304,7 +330,9 @@ class Deployment(models.Model):
     end_date = models.DateField()
     status = models.CharField(max_length=20, choices=DEPLOYMENT_STATUS_CHOICES)
     purpose = models.TextField()
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.personnel.name} - {self.deployment_name}"
 
@@ -335,7 +363,9 @@ class AirBase(models.Model):
     hangar_capacity = models.IntegerField()
     personnel_capacity = models.IntegerField()
     current_personnel = models.IntegerField(default=0)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.name} ({self.base_id})"
 
@@ -369,7 +399,9 @@ class Aircraft(models.Model):
     flight_hours = models.IntegerField(default=0)
     pilot_assigned = models.ForeignKey(Personnel, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_aircraft')
     crew_required = models.IntegerField(default=1)
-    
+
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return f"{self.model} ({self.aircraft_id})"
 
@@ -390,6 +422,18 @@ class Squadron(models.Model):
     aircraft_count = models.IntegerField(default=0)
     personnel_count = models.IntegerField(default=0)
     established_date = models.DateField()
-    
+
+    objects = ChangeTrackingManager()
+
+    def __str__(self):
+        return f"{self.name} ({self.squadron_id})"
+
+
+class TableVersion(models.Model):
+    """Change counter per table, bumped by personnel.change_tracking on every write"""
+    table = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
-        return f"{self.name} ({self.squadron_id})"
\ No newline at end of file
+        return f"{self.table} v{self.version}"
@@ -0,0 +1,250 @@
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse
+from django.urls import reverse
+
+from .encoding import JsonResponse
+from .metrics import current_request
+
+profiling_config = getattr(settings, 'PROFILING', {})
+
+MODES = {'cprofile': '.prof', 'sample': '.folded'}
+PROFILE_ID_RE = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+# Threads parked in these modules are waiting, not working for the request
+IDLE_MODULES = ('threading.py', 'selectors.py', 'queue.py', 'socketserver.py')
+
+
+class SamplingProfiler:
+    """Samples the stack of every busy thread each interval, as folded stacks.
+
+    The output (one "frame;frame;frame count" line per stack) is what
+    flamegraph.pl, inferno and speedscope read. Unlike cProfile it sees the
+    threads async views hand their ORM and model work to, at the cost of
+    also seeing any other request running meanwhile.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or os.path.basename(frame.f_code.co_filename) in IDLE_MODULES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                stack.append(names.get(ident, f'thread-{ident}'))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class ProfileStore:
+    """Captured profiles on disk: <id>.prof or <id>.folded, with <id>.json metadata"""
+
+    def __init__(self, directory, max_profiles=200):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def new_id(self):
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id, profiler, meta):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / (profile_id + MODES[meta['mode']])
+        if isinstance(profiler, cProfile.Profile):
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+        meta = dict(meta, id=profile_id, file=path.name, size=path.stat().st_size)
+        with open(self.directory / f'{profile_id}.json', 'w') as f:
+            json.dump(meta, f)
+        self._prune()
+        return meta
+
+    def get(self, profile_id):
+        if not PROFILE_ID_RE.match(profile_id):
+            return None
+        try:
+            with open(self.directory / f'{profile_id}.json') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def path(self, meta):
+        return self.directory / meta['file']
+
+    def all(self):
+        profiles = []
+        for path in self.directory.glob('*.json'):
+            meta = self.get(path.stem)
+            if meta is not None and self.path(meta).exists():
+                profiles.append(meta)
+        return profiles
+
+    def slowest(self, limit=20, view=None):
+        profiles = [meta for meta in self.all() if not view or view in meta['view'] or view in meta['path']]
+        return sorted(profiles, key=lambda meta: meta['duration_ms'], reverse=True)[:limit]
+
+    def _prune(self):
+        """Delete the oldest profiles past max_profiles (ids sort by capture time)"""
+        with self._lock:
+            ids = sorted(path.stem for path in self.directory.glob('*.json') if PROFILE_ID_RE.match(path.stem))
+            for profile_id in ids[:max(len(ids) - self.max_profiles, 0)]:
+                for suffix in ('.json', *MODES.values()):
+                    (self.directory / (profile_id + suffix)).unlink(missing_ok=True)
+
+
+profile_store = ProfileStore(
+    profiling_config.get('DIRECTORY', Path(settings.BASE_DIR) / 'profiles'),
+    profiling_config.get('MAX_PROFILES', 200),
+)
+
+
+def can_profile(user):
+    """Superusers, staff (with ALLOW_STAFF) and members of the PROFILING['ROLES'] groups"""
+    if not getattr(user, 'is_authenticated', False):
+        return False
+    if user.is_superuser or (profiling_config.get('ALLOW_STAFF', True) and user.is_staff):
+        return True
+    roles = profiling_config.get('ROLES', [])
+    return bool(roles) and user.groups.filter(name__in=roles).exists()
+
+
+def requested_mode(request):
+    """Profiler asked for with X-Profile or ?_profile= (1/true for the default mode), or None"""
+    flag = (request.headers.get('X-Profile') or request.GET.get('_profile') or '').strip().lower()
+    if not flag or flag in ('0', 'false', 'off'):
+        return None
+    return flag if flag in MODES else profiling_config.get('MODE', 'cprofile')
+
+
+class ProfilingMiddleware:
+    """Profiles the requests that ask for it and saves the profile for download.
+
+    A request sending X-Profile: 1 (or ?_profile=1) from a user can_profile()
+    allows runs under cProfile; "sample" picks the sampling profiler, which
+    also covers the worker threads of async views. The response carries
+    X-Profile-Id and X-Profile-Url (the download). Flags from other users
+    are ignored, and profiled requests skip the ETag response cache so the
+    view actually runs. Must come after AuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not profiling_config.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.interval = profiling_config.get('SAMPLE_INTERVAL_MS', 5) / 1000
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = requested_mode(request)
+        if mode is None or not can_profile(request.user):
+            return self.get_response(request)
+
+        profiler, started = self._start(request, mode)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(profiler)
+        return self._finish(request, response, profiler, mode, started)
+
+    async def __acall__(self, request):
+        mode = requested_mode(request)
+        if mode is None or not await sync_to_async(can_profile)(request.user):
+            return await self.get_response(request)
+
+        profiler, started = self._start(request, mode)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(profiler)
+        return await sync_to_async(self._finish)(request, response, profiler, mode, started)
+
+    def _start(self, request, mode):
+        request.profiling = True
+        profiler = cProfile.Profile() if mode == 'cprofile' else SamplingProfiler(self.interval)
+        started = time.perf_counter()
+        if isinstance(profiler, cProfile.Profile):
+            profiler.enable()
+        else:
+            profiler.start()
+        return profiler, started
+
+    def _stop(self, profiler):
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+        else:
+            profiler.stop()
+
+    def _finish(self, request, response, profiler, mode, started):
+        elapsed = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        stats = current_request.get()
+        profile_id = profile_store.new_id()
+        try:
+            profile_store.save(profile_id, profiler, {
+                'mode': mode,
+                'method': request.method,
+                'path': request.get_full_path(),
+                'view': (match.route or match.view_name) if match else 'unmatched',
+                'status': response.status_code,
+                'duration_ms': round(elapsed * 1000, 3),
+                'sql_queries': stats.sql_count if stats is not None else None,
+                'user': request.user.get_username(),
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            })
+        except OSError as e:
+            print(f"⚠️ Could not save profile for {request.get_full_path()}: {e}")
+            return response
+
+        response['X-Profile-Id'] = profile_id
+        response['X-Profile-Url'] = reverse('profile_download', args=[profile_id])
+        return response
+
+
+def profile_download(request, profile_id):
+    """A captured profile as an attachment (.prof for pstats / snakeviz, .folded for flame graphs)"""
+    if not can_profile(request.user):
+        return JsonResponse({'error': 'Profiling is restricted'}, status=403)
+    meta = profile_store.get(profile_id)
+    if meta is None or not profile_store.path(meta).exists():
+        return JsonResponse({'error': 'Profile not found'}, status=404)
+    return FileResponse(open(profile_store.path(meta), 'rb'), as_attachment=True, filename=meta['file'])
@@ -1,4 +1,5 @@
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.db.models import Count, Avg, Q
@@ -6,6 +7,9 @@ import json
 import random
 from datetime import datetime, timedelta
 from .models import Personnel
+from .encoding import JsonResponse
+from .fulltext import search_fulltext, user_roles
+from .live_stats import dashboard_feed
 
 @csrf_exempt
 @require_http_methods(["GET"])
@@ -70,6 +74,21 @@ def dashboard_stats(request):
         'high_attrition_risk': high_attrition_count
     })
 
+@require_http_methods(["GET"])
+def dashboard_stream(request):
+    """Server-sent events: a dashboard snapshot, then deltas as personnel, leave or aircraft rows change"""
+    if dashboard_feed.stale:
+        dashboard_feed.refresh()
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    if isinstance(request, ASGIRequest):
+        events = dashboard_feed.astream(last_event_id)
+    else:
+        events = dashboard_feed.stream(last_event_id)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def what_if_simulation(request):
@@ -182,4 +201,44 @@ def personnel_list(request):
         'page': page,
         'limit': limit,
         'has_next': offset + limit < total_count
-    })
\ No newline at end of file
+    })
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def record_search(request):
+    """Full-text search over HR, medical, review, leave and mission notes
+
+    The role comes from the signed-in user's auth groups, never from the
+    client: ?role= only picks between the user's own roles. The personnel
+    role (own records only) is refused until accounts are linked to a
+    personnel record.
+    """
+    query = request.GET.get('q', '')
+    sources = [source for source in request.GET.get('sources', '').split(',') if source]
+
+    roles = user_roles(request.user)
+    if not roles:
+        return JsonResponse({'error': 'Record search requires a signed-in user with a search role'}, status=403)
+    role = request.GET.get('role', '').lower() or roles[0]
+    if role not in roles:
+        return JsonResponse({'error': f"Role not permitted. Your roles: {', '.join(roles)}"}, status=403)
+    if role == 'personnel':
+        return JsonResponse({'error': 'Searching your own records is not available yet'}, status=403)
+
+    if not query.strip():
+        return JsonResponse({'error': 'Search query (q) required'}, status=400)
+
+    try:
+        results = search_fulltext(
+            query,
+            role,
+            sources=sources or None,
+            personnel_id=request.GET.get('personnel_id'),
+            page=int(request.GET.get('page', 1)),
+            limit=min(int(request.GET.get('limit', 20)), 100)
+        )
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse(results)
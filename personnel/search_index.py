@@ -0,0 +1,258 @@
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+SEARCH_FIELDS = ('name', 'rank', 'unit', 'base_location', 'specialization')
+RESULT_FIELDS = ('personnel_id', 'name', 'rank', 'unit', 'base_location', 'specialization', 'status')
+TOKEN_RE = re.compile(r'\w+')
+MIN_PREFIX = 2
+RESULT_CACHE_SIZE = 256
+COMPACT_FRACTION = 0.25  # renumber once this share of ordinals belongs to removed records
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+SEARCH_POSITIONS = tuple(RESULT_FIELDS.index(field) for field in SEARCH_FIELDS)
+
+
+def _document_tokens(values):
+    """Distinct tokens of a stored result tuple; recomputed on removal instead of kept per document"""
+    return {token for position in SEARCH_POSITIONS for token in tokenize(values[position])}
+
+
+class PersonnelSearchIndex:
+    """In-process inverted index over Personnel name, rank, unit, base and specialization.
+
+    Every token maps to the set of documents containing it. Prefix postings
+    are the union of the postings of all vocabulary tokens sharing the
+    prefix; they are found by bisecting the sorted vocabulary and cached
+    until the next write. A query matches documents where every term is a
+    token or a token prefix; documents matching every term exactly rank
+    first, then build order (rank, name). Terms absent from the index are
+    ignored, and if nothing matches all remaining terms the most common one
+    is dropped and the query retried. A re-indexed record keeps its ordinal,
+    and so its place in build order; removed records leave a gap until
+    gaps make up COMPACT_FRACTION of the ordinals.
+    """
+
+    def __init__(self, queryset_factory=None):
+        self.queryset_factory = queryset_factory
+        self._lock = threading.RLock()
+        self._built = False
+        self._reset()
+
+    def _reset(self):
+        self._doc_ids = {}        # personnel_id -> ordinal
+        self._docs = []           # ordinal -> result tuple (RESULT_FIELDS order), None once removed
+        self._postings = {}       # token -> set of ordinals
+        self._vocabulary = []     # sorted tokens, rebuilt lazily after writes
+        self._vocabulary_dirty = False
+        self._prefix_cache = {}
+        self._result_cache = OrderedDict()
+        self.built_at = None
+
+    @property
+    def is_built(self):
+        return self._built
+
+    def build(self, rows=None):
+        """(Re)build the index from dict-like rows, or from the database"""
+        started = time.perf_counter()
+        if rows is None:
+            rows = self.queryset_factory().values(*RESULT_FIELDS).iterator(chunk_size=5000)
+
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._add_locked(row)
+            self._vocabulary = sorted(self._postings)
+            self._built = True
+            self.built_at = time.time()
+
+        print(f"Built personnel search index: {len(self._doc_ids)} records, "
+              f"{len(self._postings)} tokens in {time.perf_counter() - started:.2f}s")
+
+    def ensure_built(self):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+
+    def invalidate(self):
+        """Drop the index; the next query rebuilds it from the database"""
+        with self._lock:
+            self._built = False
+            self._reset()
+
+    def _add_locked(self, row, ordinal=None):
+        values = tuple(sys.intern(str(row.get(field) or '')) for field in RESULT_FIELDS)
+        self._insert_locked(values, ordinal)
+
+    def _insert_locked(self, values, ordinal=None):
+        if ordinal is None:
+            ordinal = len(self._docs)
+            self._docs.append(values)
+        else:
+            self._docs[ordinal] = values
+        self._doc_ids[values[0]] = ordinal
+        for token in _document_tokens(values):
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {ordinal}
+                self._vocabulary_dirty = True
+            else:
+                postings.add(ordinal)
+
+    def _remove_locked(self, personnel_id):
+        """Unindex a record; returns its freed ordinal, or None if it was not indexed"""
+        ordinal = self._doc_ids.pop(personnel_id, None)
+        if ordinal is None:
+            return None
+        values = self._docs[ordinal]
+        self._docs[ordinal] = None
+        for token in _document_tokens(values):
+            postings = self._postings[token]
+            postings.discard(ordinal)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+        return ordinal
+
+    def _compact_locked(self):
+        # Renumber the remaining records in their current order; rank order is ordinal order
+        if len(self._docs) - len(self._doc_ids) <= len(self._docs) * COMPACT_FRACTION:
+            return
+        docs = [values for values in self._docs if values is not None]
+        built_at = self.built_at
+        self._reset()
+        for values in docs:
+            self._insert_locked(values)
+        self._vocabulary_dirty = True
+        self.built_at = built_at
+
+    def _written_locked(self):
+        self._prefix_cache.clear()
+        self._result_cache.clear()
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+
+    def update(self, row):
+        """Add or re-index one record (a Personnel instance or dict)"""
+        if not self._built:
+            return
+        if not isinstance(row, dict):
+            row = {field: getattr(row, field, '') for field in RESULT_FIELDS}
+        with self._lock:
+            self._add_locked(row, self._remove_locked(row['personnel_id']))
+            self._written_locked()
+
+    def remove(self, personnel_id):
+        if not self._built:
+            return
+        with self._lock:
+            self._remove_locked(personnel_id)
+            self._compact_locked()
+            self._written_locked()
+
+    def _prefix_postings(self, prefix):
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = bisect_left(vocabulary, prefix + '\uffff', start)
+        matched = [self._postings[token] for token in vocabulary[start:end]]
+        if len(matched) == 1:
+            postings = matched[0]
+        else:
+            postings = set().union(*matched)
+        if len(self._prefix_cache) >= RESULT_CACHE_SIZE:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = postings
+        return postings
+
+    def _rank_locked(self, terms):
+        key = tuple(terms)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            return cached
+
+        matching = []
+        for term in terms:
+            exact = self._postings.get(term, set())
+            prefixed = self._prefix_postings(term) if len(term) >= MIN_PREFIX else exact
+            if prefixed:
+                # Terms found nowhere (typos, filler words) cannot narrow the result
+                matching.append((term, exact, prefixed))
+        matching.sort(key=lambda entry: len(entry[2]))
+
+        result = ([], [])
+        while matching:
+            candidates = matching[0][2].intersection(*[entry[2] for entry in matching[1:]])
+            if candidates:
+                exact = candidates.intersection(*[entry[1] for entry in matching])
+                ranked = sorted(exact) + sorted(candidates - exact)
+                matched_terms = {entry[0] for entry in matching}
+                result = (ranked, [term for term in terms if term in matched_terms])
+                break
+            # Relax: drop the most common term and try again
+            matching.pop()
+
+        self._result_cache[key] = result
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return result
+
+    def search(self, query, page=1, limit=20):
+        """Ranked, paginated search; returns a JSON-serializable dict"""
+        self.ensure_built()
+        started = time.perf_counter()
+        terms = list(dict.fromkeys(tokenize(query)))
+        page = max(int(page), 1)
+        limit = max(int(limit), 1)
+        offset = (page - 1) * limit
+
+        with self._lock:
+            if terms:
+                ranked, matched_terms = self._rank_locked(terms)
+            else:
+                ranked, matched_terms = [], []
+            results = [dict(zip(RESULT_FIELDS, self._docs[ordinal])) for ordinal in ranked[offset:offset + limit]]
+
+        return {
+            'query': query,
+            'terms': terms,
+            'matched_terms': matched_terms,
+            'total_count': len(ranked),
+            'page': page,
+            'limit': limit,
+            'has_next': offset + limit < len(ranked),
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                'built': self._built,
+                'documents': len(self._doc_ids),
+                'tokens': len(self._postings),
+                'cached_prefixes': len(self._prefix_cache),
+                'cached_queries': len(self._result_cache)
+            }
+
+
+def _personnel_queryset():
+    from .models import Personnel
+    return Personnel.objects.all()
+
+
+personnel_search_index = PersonnelSearchIndex(_personnel_queryset)
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .change_tracking import is_tracked, table_versions
+from .live_stats import dashboard_feed
+from .models import AirBase, Aircraft, LeaveRequest, Personnel
+from .search_index import RESULT_FIELDS, personnel_search_index
+
+
+@receiver(post_save, sender=Personnel)
+def index_personnel(sender, instance, using, **kwargs):
+    """Keep the in-process search index in step with saved personnel, once the save commits"""
+    row = {field: getattr(instance, field, '') for field in RESULT_FIELDS}
+    transaction.on_commit(lambda: personnel_search_index.update(row), using=using)
+
+
+@receiver(post_delete, sender=Personnel)
+def unindex_personnel(sender, instance, using, **kwargs):
+    personnel_id = instance.personnel_id
+    transaction.on_commit(lambda: personnel_search_index.remove(personnel_id), using=using)
+
+
+@receiver(post_save, sender=Personnel)
+@receiver(post_delete, sender=Personnel)
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_delete, sender=LeaveRequest)
+@receiver(post_save, sender=Aircraft)
+@receiver(post_delete, sender=Aircraft)
+def refresh_dashboard_feed(sender, **kwargs):
+    """Live dashboard subscribers get a delta once the change is aggregated"""
+    dashboard_feed.mark_changed()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_table_version(sender, **kwargs):
+    """Every cache keyed on table versions (ETags, rollups, snapshots) sees the write"""
+    if is_tracked(sender):
+        table_versions.bump(sender, row_change=True)
+
+
+# The receivers above keep these in step row by row; bulk writes and writes
+# made by other processes only show up as a new table version
+table_versions.on_change([Personnel], lambda table: personnel_search_index.invalidate(), row_changes=False)
+table_versions.on_change([Personnel, LeaveRequest, Aircraft, AirBase], lambda table: dashboard_feed.mark_changed(),
+                         row_changes=False)
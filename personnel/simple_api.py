@@ -1,10 +1,10 @@
-from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.db.models import Count, Avg, Q
 import json
 import random
 from datetime import datetime, timedelta
+from .encoding import JsonResponse
 from .models import Personnel
 
 # Mock data for testing
@@ -1,7 +1,7 @@
-from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
 import random
+from .encoding import JsonResponse
 
 @csrf_exempt
 def personnel_list(request):
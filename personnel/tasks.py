@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .jobs import JobFailed, job_queue
+from .models import Personnel
+
+
+def simulate_scenario(scenario_type, parameters):
+    """What-if scenario result, or None for an unknown scenario type"""
+    if scenario_type == 'retirement':
+        # Simulate retirement impact
+        retirement_age = parameters.get('retirement_age', 60)
+        affected_personnel = Personnel.objects.filter(
+            date_of_birth__lte=timezone.now().date() - timedelta(days=retirement_age*365)
+        ).count()
+
+        return {
+            'scenario': 'retirement',
+            'affected_personnel': affected_personnel,
+            'impact': f'{affected_personnel} personnel eligible for retirement',
+            'recommendations': [
+                'Accelerate recruitment',
+                'Implement knowledge transfer programs',
+                'Consider retention incentives'
+            ]
+        }
+
+    elif scenario_type == 'redeployment':
+        # Simulate redeployment scenario
+        from_unit = parameters.get('from_unit')
+        to_unit = parameters.get('to_unit')
+        percentage = parameters.get('percentage', 10)
+
+        if from_unit:
+            available_personnel = Personnel.objects.filter(
+                unit=from_unit, status='Active'
+            ).count()
+            to_redeploy = int(available_personnel * percentage / 100)
+
+            return {
+                'scenario': 'redeployment',
+                'from_unit': from_unit,
+                'to_unit': to_unit,
+                'personnel_to_redeploy': to_redeploy,
+                'impact': f'{to_redeploy} personnel can be redeployed',
+                'timeline': '2-4 weeks for complete transition'
+            }
+
+    return None
+
+
+@job_queue.task('what_if_simulation')
+def what_if_simulation(job, scenario_type=None, parameters=None):
+    result = simulate_scenario(scenario_type, parameters or {})
+    if result is None:
+        raise JobFailed('Invalid scenario type')
+    return result
+
+
+@job_queue.task('predictive_maintenance')
+def predictive_maintenance(job):
+    from ai_models.predictive_maintenance import PredictiveMaintenanceSystem
+
+    pm_system = PredictiveMaintenanceSystem()
+    job.progress(0.1, 'Loading equipment')
+    pm_system.initialize_equipment_database()
+    job.progress(0.5, 'Analysing equipment')
+    analytics = pm_system.get_maintenance_analytics()
+    job.progress(0.8, 'Building maintenance schedule')
+    return {
+        'analytics': analytics,
+        'maintenance_schedule': pm_system.generate_maintenance_schedule()[:20],  # Top 20 items
+        'timestamp': timezone.now().isoformat()
+    }
+
+
+@job_queue.task('predict_failure')
+def predict_failure(job, equipment_id):
+    from ai_models.predictive_maintenance import PredictiveMaintenanceSystem
+
+    pm_system = PredictiveMaintenanceSystem()
+    job.progress(0.1, 'Loading equipment')
+    pm_system.initialize_equipment_database()
+    job.progress(0.3, 'Training failure prediction model')
+    pm_system.train_failure_prediction_model()
+    job.progress(0.9, 'Predicting failure')
+    return pm_system.predict_equipment_failure(equipment_id)
+
+
+ADVANCED_MODEL_STEPS = [
+    'train_advanced_attrition_model',
+    'train_readiness_prediction_model',
+    'train_leadership_assessment_model',
+    'train_career_trajectory_model',
+    'train_mission_optimization_model',
+    'train_wellness_prediction_model',
+    'train_skill_gap_analysis_model',
+]
+
+
+@job_queue.task('train_models')
+def train_models(job):
+    from ai_models.advanced_ml_models import AdvancedIAFMLModels
+
+    ml_models = AdvancedIAFMLModels()
+    if not ml_models.load_data():
+        raise JobFailed('Personnel training data could not be loaded')
+    job.progress(0.05, 'Engineering features')
+    ml_models.advanced_feature_engineering()
+
+    for step, method in enumerate(ADVANCED_MODEL_STEPS):
+        job.progress(0.1 + 0.9 * step / len(ADVANCED_MODEL_STEPS), method.replace('_', ' '))
+        getattr(ml_models, method)()
+    return {'models': sorted(ml_models.models)}
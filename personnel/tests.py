@@ -1,3 +1,345 @@
-from django.test import TestCase
+import datetime
+import decimal
+import contextvars
+import json
+import os
+import sys
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import encoding
+from .async_api import run_ml
+from .change_tracking import table_versions
+from .jobs import CANCELLED, FAILED, JobFailed, JobQueue, QUEUED, RUNNING, SUCCEEDED
+from .models import Personnel, TableVersion
+from .search_index import PersonnelSearchIndex, personnel_search_index
+from .serializers import PersonnelSerializer
+
+
+def make_personnel(personnel_id, **fields):
+    defaults = {
+        'name': f'Officer {personnel_id}', 'rank': 'Flight Lieutenant', 'unit': '17 Squadron',
+        'base_location': 'Ambala', 'date_of_birth': datetime.date(1990, 1, 1),
+        'date_of_joining': datetime.date(2012, 6, 1),
+        'years_of_service': 12, 'specialization': 'Fighter Pilot', 'contact_number': '9800000000',
+        'email': f'{personnel_id.lower()}@iaf.test', 'emergency_contact': 'Next of kin',
+        'blood_group': 'O+', 'marital_status': 'Single',
+    }
+    defaults.update(fields)
+    return Personnel.objects.create(personnel_id=personnel_id, **defaults)
+
+
+def personnel_version():
+    return TableVersion.objects.get(table=Personnel._meta.db_table).version
+
+
+class ChangeTrackingTests(TestCase):
+    def setUp(self):
+        self.people = [make_personnel(f'IAF{i:04d}') for i in range(3)]
+
+    def test_save_bumps_version(self):
+        before = personnel_version()
+        self.people[0].unit = '45 Squadron'
+        self.people[0].save()
+        self.assertEqual(personnel_version(), before + 1)
+
+    def test_bulk_update_bumps_version_once(self):
+        before = personnel_version()
+        for person in self.people:
+            person.unit = '45 Squadron'
+        Personnel.objects.bulk_update(self.people, ['unit'])
+        self.assertEqual(personnel_version(), before + 1)
+
+    def test_queryset_update_bumps_version_when_rows_change(self):
+        before = personnel_version()
+        Personnel.objects.filter(unit='17 Squadron').update(status='Deployed')
+        self.assertEqual(personnel_version(), before + 1)
+        Personnel.objects.filter(unit='No such unit').update(status='Deployed')
+        self.assertEqual(personnel_version(), before + 1)
+
+    def test_queryset_delete_bumps_version_once(self):
+        before = personnel_version()
+        Personnel.objects.all().delete()
+        self.assertEqual(personnel_version(), before + 1)
+
+    def test_rolled_back_write_leaves_version(self):
+        before = personnel_version()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.people[0].save()
+                Personnel.objects.update(status='Training')
+                raise RuntimeError('abort')
+        self.assertEqual(personnel_version(), before)
+
+    def test_commit_refreshes_in_process_versions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.people[0].save()
+        self.assertEqual(table_versions.get(Personnel), personnel_version())
+
+
+class ConditionalCacheTests(TestCase):
+    url = '/api/personnel/dashboard_stats/'
+
+    def setUp(self):
+        cache.clear()
+        self.people = [make_personnel(f'IAF{i:04d}') for i in range(3)]
+
+    def test_unchanged_tables_give_304(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], etag)
+
+    def test_bulk_update_gives_200_with_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        for person in self.people:
+            person.status = 'On Leave'
+        with self.captureOnCommitCallbacks(execute=True):
+            Personnel.objects.bulk_update(self.people, ['status'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class PersonnelListTests(TestCase):
+    url = '/api/personnel/'
+
+    def setUp(self):
+        cache.clear()
+        make_personnel('IAF0001', rank='Wing Commander', name='Zorawar')
+        make_personnel('IAF0002', rank='Flight Lieutenant', name='Bhatia')
+        make_personnel('IAF0003', rank='Flight Lieutenant', name='Arora')
+
+    def test_default_layout_matches_the_viewset(self):
+        response = self.client.get(self.url)
+        expected = json.loads(json.dumps(PersonnelSerializer(Personnel.objects.all(), many=True).data))
+        self.assertEqual(response.json(), expected)
+        self.assertEqual([row['personnel_id'] for row in expected], ['IAF0003', 'IAF0002', 'IAF0001'])
+
+    def test_raw_layouts_are_opt_in(self):
+        rows = self.client.get(self.url, {'layout': 'rows', 'limit': 2}).json()
+        self.assertEqual([row['personnel_id'] for row in rows], ['IAF0003', 'IAF0002'])
+        columns = self.client.get(self.url, {'layout': 'columns', 'offset': 2}).json()
+        self.assertEqual([row[columns['columns'].index('personnel_id')] for row in columns['rows']], ['IAF0001'])
+        self.assertEqual(self.client.get(self.url, {'layout': 'csv'}).status_code, 400)
+
+
+class PersonnelSearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PersonnelSearchIndex()
+        self.index.build([{'personnel_id': f'IAF{i:04d}', 'name': f'Officer {i}', 'unit': '17 Squadron'}
+                          for i in range(8)])
+
+    def ids(self, query):
+        return [row['personnel_id'] for row in self.index.search(query, limit=100)['results']]
+
+    def test_update_keeps_build_order(self):
+        self.index.update({'personnel_id': 'IAF0001', 'name': 'Renamed Officer', 'unit': '17 Squadron'})
+        self.assertEqual(self.ids('squadron'), [f'IAF{i:04d}' for i in range(8)])
+        self.assertEqual(self.ids('renamed'), ['IAF0001'])
+
+    def test_removed_records_are_compacted(self):
+        for personnel_id in ('IAF0002', 'IAF0005'):
+            self.index.remove(personnel_id)
+        self.assertEqual(len(self.index._docs), 8)  # two gaps are a quarter: not yet worth renumbering
+        self.index.remove('IAF0000')
+        self.assertEqual(len(self.index._docs), 5)
+        self.assertEqual(self.ids('squadron'), ['IAF0001', 'IAF0003', 'IAF0004', 'IAF0006', 'IAF0007'])
+        self.index.update({'personnel_id': 'IAF0004', 'name': 'Officer 4', 'unit': '45 Squadron'})
+        self.assertEqual(self.ids('45'), ['IAF0004'])
+
+
+class SearchIndexSignalTests(TestCase):
+    def setUp(self):
+        personnel_search_index.build([])
+        self.addCleanup(personnel_search_index.invalidate)
+
+    def test_only_committed_saves_are_indexed(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                make_personnel('IAF0001', name='Rolled Back')
+                raise RuntimeError('abort')
+        self.assertEqual(personnel_search_index.search('rolled')['total_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_personnel('IAF0002', name='Committed')
+        self.assertEqual(personnel_search_index.search('committed')['total_count'], 1)
+
+
+class MetricsAccessTests(TestCase):
+    url = '/api/_metrics/'
+
+    def test_allowed_ips_and_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)  # the test client connects from 127.0.0.1
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.1.2.3').status_code, 403)
+
+        self.client.force_login(User.objects.create_user('analyst'))
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.1.2.3').status_code, 403)
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.1.2.3').status_code, 200)
+
+
+class RunMLTests(SimpleTestCase):
+    async def test_model_call_sees_the_request_context(self):
+        request_id = contextvars.ContextVar('request_id', default=None)
+        request_id.set('request-1')
+        self.assertEqual(await run_ml(request_id.get), 'request-1')
+
+
+class EncodingTests(SimpleTestCase):
+    values = {
+        'transposed': np.arange(6).reshape(2, 3).T,
+        'objects': np.array(['a', None], dtype=object),
+        'scalar': np.float32(1.5),
+        'timestamp': pd.Timestamp('2024-01-02 03:04:05.123456', tz='UTC'),
+        'series': pd.Series([1, 2]),
+        'set': {1},
+        'timedelta': datetime.timedelta(seconds=90),
+        'decimal': decimal.Decimal('1.50'),
+        'datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        'big_int': 2 ** 70,
+    }
+
+    def test_dumps_matches_drf_encoder(self):
+        expected = json.loads(json.dumps(self.values, cls=JSONEncoder))
+        self.assertEqual(json.loads(encoding.dumps(self.values)), expected)
+        with mock.patch.object(encoding, 'orjson', None):
+            self.assertEqual(json.loads(encoding.dumps(self.values)), expected)
+
+
+class JobQueueTests(SimpleTestCase):
+    def setUp(self):
+        self.queue = JobQueue(max_attempts=2, retry_delay=0)
+        self.calls = []
+
+        @self.queue.task('flaky')
+        def flaky(job):
+            self.calls.append(job.attempt)
+            if job.attempt == 1:
+                raise ConnectionError('database unavailable')
+            return {'attempt': job.attempt}
+
+        @self.queue.task('invalid')
+        def invalid(job):
+            raise JobFailed('bad parameters')
+
+        @self.queue.task('long')
+        def long(job):
+            job.progress(0.5, 'halfway')
+            return 'done'
+
+    def run_next(self, worker='worker-1'):
+        job, task = self.queue.claim(worker)
+        return self.queue.run(job, task)
+
+    def test_failed_attempt_is_retried(self):
+        job_id = self.queue.submit('flaky')
+        self.assertEqual(self.run_next(), QUEUED)
+        self.assertEqual(self.queue.get(job_id)['status'], QUEUED)
+        self.assertIn('database unavailable', self.queue.get(job_id)['error'])
+
+        self.assertEqual(self.run_next(), SUCCEEDED)
+        job = self.queue.get(job_id)
+        self.assertEqual((job['status'], job['attempts'], job['result']), (SUCCEEDED, 2, {'attempt': 2}))
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_retries_stop_at_max_attempts(self):
+        job_id = self.queue.submit('flaky', max_attempts=1)
+        self.assertEqual(self.run_next(), FAILED)
+        self.assertEqual(self.queue.get(job_id)['status'], FAILED)
+        self.assertIsNone(self.queue.claim('worker-1'))
+
+    def test_job_failed_is_not_retried(self):
+        job_id = self.queue.submit('invalid')
+        self.assertEqual(self.run_next(), FAILED)
+        self.assertEqual(self.queue.get(job_id)['error'], 'bad parameters')
+
+    def test_cancel_queued_job(self):
+        job_id = self.queue.submit('long')
+        self.assertEqual(self.queue.cancel(job_id), CANCELLED)
+        self.assertIsNone(self.queue.claim('worker-1'))
+        self.assertEqual(self.queue.get(job_id)['status'], CANCELLED)
+
+    def test_cancel_running_job_stops_at_progress(self):
+        job_id = self.queue.submit('long')
+        job, task = self.queue.claim('worker-1')
+        self.assertEqual(self.queue.cancel(job_id), RUNNING)
+        self.assertEqual(self.queue.run(job, task), CANCELLED)
+        self.assertEqual(self.queue.get(job_id)['status'], CANCELLED)
+
+    def test_expired_lease_is_requeued(self):
+        self.queue.lease = -1  # every lease has run out by the next claim
+        job_id = self.queue.submit('long')
+        first, _ = self.queue.claim('worker-1')
+        second, _ = self.queue.claim('worker-2')
+        self.assertEqual((first.id, second.id), (job_id, job_id))
+        self.assertEqual(second.attempt, 2)
+        self.assertEqual(self.queue.get(job_id)['status'], RUNNING)
+
+    def test_expired_lease_on_last_attempt_fails(self):
+        self.queue.lease = -1
+        job_id = self.queue.submit('long', max_attempts=1)
+        self.queue.claim('worker-1')
+        self.assertIsNone(self.queue.claim('worker-2'))
+        job = self.queue.get(job_id)
+        self.assertEqual((job['status'], job['error']), (FAILED, 'Worker stopped before the job finished'))
+
+    def test_run_that_lost_its_lease_is_ignored(self):
+        self.queue.lease = -1
+        job_id = self.queue.submit('flaky')
+        stale, task = self.queue.claim('worker-1')
+        current, _ = self.queue.claim('worker-2')
+
+        self.assertIsNone(self.queue.run(stale, task))  # its retry would requeue worker-2's run
+        self.assertEqual(self.queue.get(job_id)['status'], RUNNING)
+        self.assertEqual(self.queue.run(current, task), SUCCEEDED)
+        self.assertEqual(self.queue.get(job_id)['result'], {'attempt': 2})
+
+    def test_threads_share_the_process_connection(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        queue = JobQueue(os.path.join(directory.name, 'jobs.sqlite3'), retry_delay=0)
+        queue.tasks = self.queue.tasks
+        errors = []
+        start = threading.Barrier(8)
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)  # interleave the threads inside transactions
+
+        def client(n):
+            start.wait()
+            try:
+                for i in range(25):
+                    job_id = queue.submit('long')
+                    if i % 3 == 0:
+                        queue.cancel(job_id)
+                    claimed = queue.claim(f'worker-{n}')
+                    if claimed is not None:
+                        queue.run(*claimed)
+                    queue.get(job_id)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        stats = queue.stats()
+        self.assertEqual(sum(stats.values()), 200)
+        self.assertEqual(stats[RUNNING], 0)
@@ -1,16 +1,28 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PersonnelViewSet
-from . import simple_api, real_api, strategic_api
+from .views import PersonnelViewSet, EquipmentViewSet
+from . import simple_api, real_api, strategic_api, chatbot_views, async_api, job_views, metrics, profiling
 
 router = DefaultRouter()
 router.register(r'personnel', PersonnelViewSet, basename='personnel')
+router.register(r'equipment', EquipmentViewSet, basename='equipment')
 
 urlpatterns = [
+    # Live dashboard feed (ahead of the router, which would treat 'stream' as a personnel id)
+    path('api/personnel/stream/', real_api.dashboard_stream, name='dashboard_stream'),
+    # Async views for read-heavy and model-backed endpoints (also ahead of the router)
+    path('api/personnel/', async_api.personnel_list, name='personnel_list'),
+    path('api/personnel/dashboard_stats/', async_api.dashboard_stats, name='async_dashboard_stats'),
+    path('api/personnel/advanced_analytics/', async_api.advanced_analytics, name='async_advanced_analytics'),
+    path('api/personnel/predictive_maintenance/', async_api.predictive_maintenance, name='predictive_maintenance'),
+    path('api/personnel/sentiment_analysis/', async_api.sentiment_analysis, name='sentiment_analysis'),
+    path('api/personnel/sentiment_analysis_batch/', async_api.sentiment_analysis_batch,
+         name='sentiment_analysis_batch'),
     path('api/', include(router.urls)),
     # Real API endpoints using database
     path('api/personnel/dashboard_stats/', real_api.dashboard_stats, name='dashboard_stats'),
     path('api/personnel/what_if_simulation/', real_api.what_if_simulation, name='what_if_simulation'),
+    path('api/search/records/', real_api.record_search, name='record_search'),
     # Strategic planning API
     path('api/personnel/', strategic_api.personnel_list, name='strategic_personnel'),
     # Mock API endpoints (fallback)
@@ -18,4 +30,20 @@ urlpatterns = [
     path('api/personnel/advanced_analytics/', simple_api.advanced_analytics, name='advanced_analytics'),
     path('api/personnel/voice_command/', simple_api.voice_command, name='voice_command'),
     path('api/personnel/chatbot_query/', simple_api.chatbot_query, name='chatbot_query'),
+    # Request metrics (Prometheus text format)
+    path('api/_metrics/', metrics.metrics_view, name='metrics'),
+    # Profiles captured with X-Profile / ?_profile (see personnel.profiling)
+    path('api/_profiles/<str:profile_id>/', profiling.profile_download, name='profile_download'),
+    # Background jobs (python manage.py run_job_workers drains the queue)
+    path('api/jobs/', job_views.jobs, name='jobs'),
+    path('api/jobs/<str:job_id>/', job_views.job_detail, name='job_detail'),
+    path('api/jobs/<str:job_id>/cancel/', job_views.cancel_job, name='cancel_job'),
+    # Role-based chatbot sessions
+    path('api/chatbot/initialize/', chatbot_views.initialize_chatbot, name='chatbot_initialize'),
+    path('api/chatbot/message/', chatbot_views.send_message, name='chatbot_message'),
+    path('api/chatbot/history/', chatbot_views.get_conversation_history, name='chatbot_history'),
+    path('api/chatbot/clear/', chatbot_views.clear_conversation, name='chatbot_clear'),
+    path('api/chatbot/help/', chatbot_views.get_chatbot_help, name='chatbot_help'),
+    path('api/chatbot/suggestions/', chatbot_views.get_smart_suggestions, name='chatbot_suggestions'),
+    path('api/chatbot/metrics/', chatbot_views.chatbot_metrics, name='chatbot_metrics'),
 ]
@@ -1,20 +1,27 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Avg, Q
+from django.db.models import Q
+from django.conf import settings
+from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.utils import timezone
 from datetime import datetime, timedelta
 import json
 
 from .models import (
     Personnel, HRRecord, MedicalRecord, TrainingRecord, 
-    MissionRecord, Equipment, MaintenanceRecord, LeaveRequest,
-    AirBase, Aircraft, Squadron, SignupRequest
+    Equipment, MaintenanceRecord, LeaveRequest,
+    Squadron, SignupRequest, PerformanceReview
 )
 from .serializers import (
     PersonnelSerializer, HRRecordSerializer, MedicalRecordSerializer,
     TrainingRecordSerializer, MissionRecordSerializer, EquipmentSerializer
 )
+from .search_index import personnel_search_index
+from .http_cache import conditional_cache
+from .jobs import job_queue
+from .tasks import simulate_scenario
 
 # Create missing serializer
 from rest_framework import serializers
@@ -24,74 +31,25 @@ class SignupRequestSerializer(serializers.ModelSerializer):
         model = SignupRequest
         fields = '__all__'
 
+def enqueue(request, task, params=None, max_attempts=None):
+    """202 response for a job queued on the background job queue"""
+    job_id = job_queue.submit(task, params, max_attempts=max_attempts)
+    return Response({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': request.build_absolute_uri(reverse('job_detail', args=[job_id]))
+    }, status=status.HTTP_202_ACCEPTED)
+
 class PersonnelViewSet(viewsets.ModelViewSet):
     queryset = Personnel.objects.all()
     serializer_class = PersonnelSerializer
 
-    @action(detail=False, methods=['get'])
-    def dashboard_stats(self, request):
-        """Get dashboard statistics"""
-        total_personnel = Personnel.objects.count()
-        active_personnel = Personnel.objects.filter(status='Active').count()
-        on_leave = Personnel.objects.filter(status='On Leave').count()
-        in_training = Personnel.objects.filter(status='Training').count()
-        deployed = Personnel.objects.filter(status='Deployed').count()
-        
-        # Rank distribution
-        rank_distribution = Personnel.objects.values('rank').annotate(count=Count('rank'))
-        
-        # Unit distribution
-        unit_distribution = Personnel.objects.values('unit').annotate(count=Count('unit'))
-        
-        # Base distribution
-        base_distribution = Personnel.objects.values('base_location').annotate(count=Count('personnel_id'))
-        
-        # Aircraft statistics
-        total_aircraft = Aircraft.objects.count()
-        operational_aircraft = Aircraft.objects.filter(status='Operational').count()
-        aircraft_with_pilots = Aircraft.objects.filter(pilot_assigned__isnull=False).count()
-        
-        # Air base statistics
-        total_bases = AirBase.objects.count()
-        operational_bases = AirBase.objects.filter(status='Operational').count()
-        
-        # Performance metrics
-        avg_performance = Personnel.objects.aggregate(
-            avg_performance=Avg('performance_score'),
-            avg_leadership=Avg('leadership_score'),
-            avg_technical=Avg('technical_score')
-        )
-        
-        return Response({
-            'total_personnel': total_personnel,
-            'active_personnel': active_personnel,
-            'on_leave': on_leave,
-            'in_training': in_training,
-            'deployed': deployed,
-            'rank_distribution': list(rank_distribution),
-            'unit_distribution': list(unit_distribution),
-            'base_distribution': list(base_distribution),
-            'aircraft_stats': {
-                'total_aircraft': total_aircraft,
-                'operational_aircraft': operational_aircraft,
-                'aircraft_with_pilots': aircraft_with_pilots,
-                'aircraft_readiness': round((operational_aircraft / total_aircraft) * 100, 1) if total_aircraft > 0 else 0
-            },
-            'base_stats': {
-                'total_bases': total_bases,
-                'operational_bases': operational_bases,
-                'base_readiness': round((operational_bases / total_bases) * 100, 1) if total_bases > 0 else 0
-            },
-            'performance_metrics': avg_performance,
-            'readiness_percentage': round((active_personnel / total_personnel) * 100, 1) if total_personnel > 0 else 0
-        })
-
     @action(detail=False, methods=['post'])
     def predict_attrition(self, request):
         """Predict attrition risk for personnel"""
         try:
-            from ai_models.advanced_ml_models import AdvancedMLModels
-            ml_models = AdvancedMLModels()
+            from ai_models.advanced_ml_models import AdvancedIAFMLModels
+            ml_models = AdvancedIAFMLModels()
             
             personnel_id = request.data.get('personnel_id')
             if not personnel_id:
@@ -118,96 +76,30 @@ class PersonnelViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def what_if_simulation(self, request):
         """Run what-if scenarios"""
-        scenario_type = request.data.get('scenario_type')
-        parameters = request.data.get('parameters', {})
-        
-        if scenario_type == 'retirement':
-            # Simulate retirement impact
-            retirement_age = parameters.get('retirement_age', 60)
-            affected_personnel = Personnel.objects.filter(
-                date_of_birth__lte=timezone.now().date() - timedelta(days=retirement_age*365)
-            ).count()
-            
-            return Response({
-                'scenario': 'retirement',
-                'affected_personnel': affected_personnel,
-                'impact': f'{affected_personnel} personnel eligible for retirement',
-                'recommendations': [
-                    'Accelerate recruitment',
-                    'Implement knowledge transfer programs',
-                    'Consider retention incentives'
-                ]
-            })
-        
-        elif scenario_type == 'redeployment':
-            # Simulate redeployment scenario
-            from_unit = parameters.get('from_unit')
-            to_unit = parameters.get('to_unit')
-            percentage = parameters.get('percentage', 10)
-            
-            if from_unit:
-                available_personnel = Personnel.objects.filter(
-                    unit=from_unit, status='Active'
-                ).count()
-                to_redeploy = int(available_personnel * percentage / 100)
-                
-                return Response({
-                    'scenario': 'redeployment',
-                    'from_unit': from_unit,
-                    'to_unit': to_unit,
-                    'personnel_to_redeploy': to_redeploy,
-                    'impact': f'{to_redeploy} personnel can be redeployed',
-                    'timeline': '2-4 weeks for complete transition'
-                })
-        
-        return Response({'error': 'Invalid scenario type'}, status=400)
+        result = simulate_scenario(request.data.get('scenario_type'), request.data.get('parameters', {}))
+        if result is None:
+            return Response({'error': 'Invalid scenario type'}, status=400)
+        return Response(result)
 
-    @action(detail=False, methods=['get'])
-    def advanced_analytics(self, request):
-        """Get advanced analytics data"""
-        try:
-            # Real-time metrics
-            current_time = timezone.now()
-            
-            # Personnel distribution by base
-            base_distribution = Personnel.objects.values('base_location').annotate(
-                count=Count('personnel_id')
-            ).order_by('-count')
-            
-            # Training completion rates
-            training_stats = TrainingRecord.objects.filter(
-                end_date__gte=current_time - timedelta(days=90)
-            ).values('status').annotate(count=Count('id'))
-            
-            # Medical fitness levels
-            medical_stats = MedicalRecord.objects.filter(
-                checkup_date__gte=current_time - timedelta(days=180)
-            ).values('medical_status').annotate(count=Count('id'))
-            
-            # Equipment status
-            equipment_stats = Equipment.objects.values('status').annotate(
-                count=Count('equipment_id')
-            )
-            
-            # Mission readiness
-            active_missions = MissionRecord.objects.filter(status='Active').count()
-            planned_missions = MissionRecord.objects.filter(status='Planned').count()
-            
-            return Response({
-                'base_distribution': list(base_distribution),
-                'training_completion': list(training_stats),
-                'medical_fitness': list(medical_stats),
-                'equipment_status': list(equipment_stats),
-                'mission_readiness': {
-                    'active_missions': active_missions,
-                    'planned_missions': planned_missions,
-                    'readiness_score': 94.2  # Calculated metric
-                },
-                'timestamp': current_time.isoformat()
-            })
-            
-        except Exception as e:
-            return Response({'error': str(e)}, status=500)
+    @action(detail=False, methods=['post'])
+    def what_if_simulation_async(self, request):
+        """Queue a what-if scenario as a background job"""
+        if request.data.get('scenario_type') not in ('retirement', 'redeployment'):
+            return Response({'error': 'Invalid scenario type'}, status=400)
+        return enqueue(request, 'what_if_simulation', {
+            'scenario_type': request.data.get('scenario_type'),
+            'parameters': request.data.get('parameters', {})
+        })
+
+    @action(detail=False, methods=['post'])
+    def predictive_maintenance_async(self, request):
+        """Queue the predictive maintenance analysis as a background job"""
+        return enqueue(request, 'predictive_maintenance')
+
+    @action(detail=False, methods=['post'])
+    def train_models_async(self, request):
+        """Queue training of the advanced ML models as a background job"""
+        return enqueue(request, 'train_models', max_attempts=1)
 
     @action(detail=False, methods=['post'])
     def voice_command(self, request):
@@ -235,10 +127,11 @@ class PersonnelViewSet(viewsets.ModelViewSet):
         """Process facial recognition for attendance"""
         try:
             from ai_models.computer_vision import ComputerVisionSystem
+            from ai_models.event_store import get_event_store
             
-            cv_system = ComputerVisionSystem()
+            cv_system = ComputerVisionSystem(event_store=get_event_store(settings.CV_EVENTS_PATH))
             
-            # Simulate face recognition (in production, process actual image)
+            # No image is uploaded to this endpoint yet, so this reports "not recognized" rather than a guess
             recognition_result = cv_system.recognize_personnel(None)
             
             if recognition_result:
@@ -258,49 +151,6 @@ class PersonnelViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=500)
 
-    @action(detail=False, methods=['get'])
-    def predictive_maintenance(self, request):
-        """Get predictive maintenance data"""
-        try:
-            from ai_models.predictive_maintenance import PredictiveMaintenanceSystem
-            
-            pm_system = PredictiveMaintenanceSystem()
-            pm_system.initialize_equipment_database()
-            
-            # Get maintenance analytics
-            analytics = pm_system.get_maintenance_analytics()
-            
-            # Get maintenance schedule
-            schedule = pm_system.generate_maintenance_schedule()
-            
-            return Response({
-                'analytics': analytics,
-                'maintenance_schedule': schedule[:20],  # Top 20 items
-                'timestamp': timezone.now().isoformat()
-            })
-            
-        except Exception as e:
-            return Response({'error': str(e)}, status=500)
-
-    @action(detail=False, methods=['post'])
-    def sentiment_analysis(self, request):
-        """Analyze sentiment of personnel communications"""
-        try:
-            from ai_models.nlp_voice_system import VoiceNLPSystem
-            
-            voice_system = VoiceNLPSystem()
-            text = request.data.get('text')
-            
-            if not text:
-                return Response({'error': 'Text required for analysis'}, status=400)
-            
-            sentiment_result = voice_system.sentiment_analysis(text)
-            
-            return Response(sentiment_result)
-            
-        except Exception as e:
-            return Response({'error': str(e)}, status=500)
-
     @action(detail=False, methods=['post'])
     def signup_request(self, request):
         """Submit signup request for HR approval"""
@@ -333,13 +183,31 @@ class PersonnelViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=500)
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Ranked personnel search over name, rank, unit, base and specialization"""
+        try:
+            query = request.query_params.get('q', '')
+            page = int(request.query_params.get('page', 1))
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+
+            if not query.strip():
+                return Response({'error': 'Search query (q) required'}, status=400)
+
+            return Response(personnel_search_index.search(query, page=page, limit=limit))
+
+        except ValueError:
+            return Response({'error': 'page and limit must be integers'}, status=400)
+        except Exception as e:
+            return Response({'error': str(e)}, status=500)
+
     @action(detail=False, methods=['post'])
     def chatbot_query(self, request):
         """Process chatbot queries with real-time data"""
         try:
             from ai_models.intelligent_chatbot import IntelligentChatbot
             
-            chatbot = IntelligentChatbot()
+            chatbot = IntelligentChatbot(search_index=personnel_search_index)
             query = request.data.get('query')
             user_role = request.data.get('user_role')
             personnel_data = request.data.get('personnel_data', [])
@@ -400,7 +268,9 @@ class PersonnelViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=500)
 
+    # No table behind the course list: roll the ETag over hourly so a deploy that changes it reaches clients
     @action(detail=False, methods=['get'])
+    @method_decorator(conditional_cache(max_age=3600, period=3600))
     def training_courses(self, request):
         """Get available training courses"""
         try:
@@ -626,4 +496,10 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             return Response(prediction)
             
         except Exception as e:
-            return Response({'error': str(e)}, status=500)
\ No newline at end of file
+            return Response({'error': str(e)}, status=500)
+
+    @action(detail=True, methods=['post'])
+    def predict_failure_async(self, request, pk=None):
+        """Queue an equipment failure prediction as a background job"""
+        equipment = self.get_object()
+        return enqueue(request, 'predict_failure', {'equipment_id': equipment.equipment_id})
@@ -34,20 +34,28 @@ def setup_deep_learning_models():
     print("\n🧠 Setting up Deep Learning Models...")
     try:
         from ai_models.deep_learning_models import DeepLearningModels
+        from ai_models.training_data import find_shards
+        
+        # Shards written by training_data.write_shards; the face shards carry their labels.json
+        data_dir = str(project_dir / 'ai_models' / 'training_data')
+        names = None
+        if not find_shards(data_dir, 'facial_recognition'):
+            # A face CNN trained on noise would name real personnel at random
+            names = ['behavior', 'mission_lstm']
+            print("  ⚠️ No face crops under ai_models/training_data; skipping the facial recognition model")
         
         dl_models = DeepLearningModels()
-        trained_models = dl_models.train_models()
+        dl_models.train_models(data_dir=data_dir, names=names)
         
-        # Create models directory if it doesn't exist
+        # Save models, with the face class labels
         models_dir = project_dir / 'ai_models' / 'trained_models'
-        models_dir.mkdir(exist_ok=True)
-        
-        # Save models
-        for name, model in trained_models.items():
-            model_path = models_dir / f'{name}_model.h5'
-            model.save(str(model_path))
+        for name in dl_models.save_models(str(models_dir)):
             print(f"  ✅ Saved {name} model")
         
+        # Quantized .tflite copies for CPU inference (load_serving_models)
+        serving_dir = project_dir / 'ai_models' / 'serving'
+        dl_models.export_for_serving(str(serving_dir), quantization='dynamic', data_dir=data_dir)
+        
         print("✅ Deep Learning models setup complete")
         
     except Exception as e: